@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# 저장소 루트에서 실행해도, bench/ 에서 실행해도 realestate 패키지를 찾도록 설정
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from realestate import aggregates, analytics, anomaly, charts, comovement, forecast, geo, metadata, molit, rentals, rolling, similar, storage, units
+from realestate.changes import price_changes
+from realestate.cube import PriceCube
+
+# 기본 데이터 크기 (행 수), --rows 로 10,000,000 까지 지정 가능
+DEFAULT_ROWS = [1_000, 10_000, 100_000, 1_000_000]
+
+# 합성 데이터: 아파트 × 평형대 × 월 격자에서 rows 개 칸을 무작위로 선택
+SYNTHETIC_MONTHS = 120
+SYNTHETIC_START = 2015 * 12
+
+
+# 합성 거래 데이터 생성 (아파트 수는 행 수에 맞춰 증가)
+def synthetic_data(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    n_sizes = len(units.SIZE_BANDS)
+    n_apts = max(4, -(-rows // (n_sizes * SYNTHETIC_MONTHS)))
+
+    # 시계열별 랜덤 워크 가격 (억)
+    base = rng.uniform(3, 60, size=(n_apts, n_sizes, 1))
+    steps = rng.normal(0.003, 0.02, size=(n_apts, n_sizes, SYNTHETIC_MONTHS))
+    mid = (base * np.exp(np.cumsum(steps, axis=-1))).ravel()
+
+    cells = np.sort(rng.choice(mid.size, size=min(rows, mid.size), replace=False))
+    apt_codes, size_codes, month_pos = np.unravel_index(cells, (n_apts, n_sizes, SYNTHETIC_MONTHS))
+    spread = rng.uniform(0.02, 0.15, size=len(cells))
+
+    apartments = pd.Categorical.from_codes(apt_codes, [f"아파트{i:05d}" for i in range(n_apts)])
+    sizes = pd.Categorical.from_codes(size_codes, units.SIZE_BANDS)
+    return storage.normalize_frame(pd.DataFrame({
+        "날짜": (SYNTHETIC_START + month_pos).astype(np.int32),
+        "아파트": apartments,
+        "평형대": sizes,
+        "최저가(억)": mid[cells] * (1 - spread),
+        "최고가(억)": mid[cells] * (1 + spread),
+        "거래 건수": rng.integers(1, 6, size=len(cells)),
+    }))
+
+
+# 단계 실행 시간(최솟값)과 최대 메모리 측정
+# - tracemalloc은 할당마다 비용이 들어 시간 측정과 분리하여 한 번 더 실행
+# - setup: 실행마다 새 입력을 만드는 함수 (제자리 갱신 단계용, 준비 시간은 측정에서 제외)
+def measure(func, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+
+    args = (setup(),) if setup else ()
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, min(times), peak
+
+
+# 페이지별 계산 단계 (Streamlit 없이 각 페이지와 같은 데이터 경로 실행)
+# - 입력: 집계 테이블, 큐브, 선택된 아파트/평형대
+def page_stages(tables, cube, apartments, sizes):
+    latest_date = int(cube.months[-1])
+    first_date = int(cube.months[0])
+    size = sizes[0]
+
+    def filter_rows():
+        return analytics.filter_rows(cube, apartments, sizes)
+
+    def overview():
+        return aggregates.select(tables["summary"], apartments, sizes)
+
+    def trend_traces():
+        fig = charts.line_figure(
+            cube.select(apartments, [size]),
+            y="평균가(억)",
+            color="아파트",
+            hovertemplate='%{y:.1f}억원'
+        )
+        return charts.add_volume(fig, cube.months, cube.rolling_volume(1, apartments, [size]).sum(axis=(0, 1)))
+
+    def trend_ranges():
+        cells = cube.cross_section(apartments, [size], latest_date)
+        return charts.range_figure(cells["아파트"], cells["최저가(억)"], cells["최고가(억)"])
+
+    def trend_changes():
+        return price_changes(cube, apartments, [size], start=first_date, end=latest_date)
+
+    # 합성 단지는 면적 정보가 없으므로 평형대 대표 평수로 계산
+    info = metadata.info_table({})
+
+    def price_per_pyeong():
+        return analytics.price_per_pyeong(analytics.unit_prices(tables, info), apartments[0], sizes)
+
+    def market():
+        changes = price_changes(cube, apartments, sizes, start=first_date, end=latest_date)
+        return changes.groupby("평형대", observed=True)["변동률(%)"].mean()
+
+    return [
+        ("filter", filter_rows),
+        ("overview", overview),
+        ("trend_traces", trend_traces),
+        ("trend_ranges", trend_ranges),
+        ("trend_changes", trend_changes),
+        ("price_per_pyeong", price_per_pyeong),
+        ("market", market),
+    ]
+
+
+# 데이터 크기 하나에 대해 모든 단계 측정
+def run_size(rows, repeat, select):
+    data = synthetic_data(rows)
+    results = []
+
+    # payload: 차트 단계의 figure JSON 크기 (브라우저 전송량)
+    def record(stage, seconds, peak, payload=None):
+        results.append({"rows": rows, "stage": stage, "seconds": seconds, "peak_bytes": peak, "payload_bytes": payload})
+        size = "-" if payload is None else f"{payload / 1024:,.1f}KB"
+        print(f"{rows:>12,}  {stage:<18} {seconds * 1000:>10.2f}ms  {peak / 1024 / 1024:>9.1f}MB  {size:>11}")
+
+    tables, seconds, peak = measure(lambda: aggregates.build_tables(data), 1)
+    record("aggregates", seconds, peak)
+
+    # 새 월 하나가 들어왔을 때 이동 통계 증분 갱신 (마지막 월부터 다시 계산)
+    since = int(tables["monthly"]["날짜"].max())
+    _, seconds, peak = measure(lambda: rolling.add_rolling(tables["monthly"], aggregates.AVG_COLUMN, since), repeat)
+    record("rolling_update", seconds, peak)
+
+    cube, seconds, peak = measure(lambda: PriceCube(tables["monthly"]), 1)
+    record("cube", seconds, peak)
+
+    params, seconds, peak = measure(lambda: forecast.fit(cube), 1)
+    record("forecast_fit", seconds, peak)
+
+    _, seconds, peak = measure(lambda: forecast.predict(params), repeat)
+    record("forecast_predict", seconds, peak)
+
+    # 비교 단지: 전체 인덱스 생성, 아파트 1% 특성이 바뀌었을 때 증분 갱신, 조회
+    info = metadata.info_table({})
+    index, seconds, peak = measure(lambda: similar.SimilarityIndex(similar.build_features(tables, info)), 1)
+    record("similar_build", seconds, peak)
+
+    changed = index.features.copy()
+    changed.iloc[::100, 0] += 0.1
+    _, seconds, peak = measure(lambda: index.update(changed), repeat)
+    record("similar_update", seconds, peak)
+
+    _, seconds, peak = measure(lambda: index.similar(index.names[0]), repeat)
+    record("similar_query", seconds, peak)
+
+    # 전세가율: 매매 월별 행마다 전세 요약 한 행 (일부 월 누락), 시계열별 as-of 조인
+    monthly = tables["monthly"]
+    rng = np.random.default_rng(0)
+    rental_rows = monthly[rng.random(len(monthly)) < 0.7][["날짜", "아파트", "평형대", aggregates.AVG_COLUMN]].rename(columns={aggregates.AVG_COLUMN: rentals.JEONSE_COLUMN})
+    rental_rows = rental_rows.assign(**{rentals.JEONSE_COLUMN: rental_rows[rentals.JEONSE_COLUMN] * 0.6, "전세 건수": 1})
+    _, seconds, peak = measure(lambda: rentals.jeonse_ratios(monthly, rental_rows), repeat)
+    record("jeonse_asof", seconds, peak)
+
+    # 위치 검색: 부산 범위에 흩어진 단지 좌표로 격자 인덱스 생성, 반경 1km/구·동 조회
+    located = pd.DataFrame({
+        "구": pd.Categorical(rng.choice(["해운대구", "수영구", "남구"], len(cube.apartments))),
+        "동": pd.Categorical(rng.choice(["우동", "중동", "좌동"], len(cube.apartments))),
+        "위도": rng.uniform(35.05, 35.30, len(cube.apartments)),
+        "경도": rng.uniform(128.90, 129.20, len(cube.apartments)),
+    }, index=pd.Index(cube.apartments.astype(str), name="아파트"))
+    geo_index, seconds, peak = measure(lambda: geo.GeoIndex(located), 1)
+    record("geo_build", seconds, peak)
+
+    _, seconds, peak = measure(lambda: geo_index.within(35.16, 129.14, 1.0), repeat)
+    record("geo_radius", seconds, peak)
+
+    _, seconds, peak = measure(lambda: geo_index.in_district("해운대구", "우동"), repeat)
+    record("geo_district", seconds, peak)
+
+    # 동조화: 전체 누적 합 생성, 마지막 월이 새로 들어왔을 때 증분 반영, 선택 시계열 행렬 + 군집 순서
+    sums, seconds, peak = measure(lambda: comovement.build(cube), 1)
+    record("comovement_build", seconds, peak)
+
+    previous_cube = PriceCube(monthly[monthly["날짜"] < int(cube.months[-1])])
+    _, seconds, peak = measure(lambda previous: previous.update(cube), repeat, setup=lambda: comovement.build(previous_cube))
+    record("comovement_update", seconds, peak)
+
+    def comovement_matrix():
+        corr, beta = comovement.matrices(sums, comovement.select(sums))
+        return comovement.cluster_order(corr)
+
+    _, seconds, peak = measure(comovement_matrix, repeat)
+    record("comovement_matrix", seconds, peak)
+
+    # 이상 거래 검출: 월별 행마다 개별 거래 하나 (평형대 대표 면적, 0.1%는 5배/0.2배 가격), 10만 행 청크로 스트리밍
+    deals = pd.DataFrame({
+        "날짜": monthly["날짜"].to_numpy(),
+        "아파트": monthly["아파트"].to_numpy(),
+        "평형대": monthly["평형대"].to_numpy(),
+        "전용면적(㎡)": (monthly["평형대"].map(units.BAND_PYEONG).astype(np.float64) * units.PYEONG_M2).to_numpy(),
+        "거래금액(억)": (monthly[aggregates.AVG_COLUMN].to_numpy() * np.where(rng.random(len(monthly)) < 0.001, rng.choice([0.2, 5.0], len(monthly)), 1)).astype(np.float32),
+    })
+
+    def anomaly_stream():
+        detector = anomaly.DealDetector()
+        return [detector.check(deals.iloc[i:i + molit.CHUNK_ROWS]) for i in range(0, len(deals), molit.CHUNK_ROWS)]
+
+    _, seconds, peak = measure(anomaly_stream, repeat)
+    record("anomaly_stream", seconds, peak)
+
+    # 기간 비교: 임의 시작/끝 월의 시계열별 변동률과 기간 요약 (누적 배열 조회, 구간 길이와 무관)
+    start_month, end_month = int(cube.months[12]), int(cube.months[-1])
+    _, seconds, peak = measure(lambda: price_changes(cube, start=start_month, end=end_month, per_series=True), repeat)
+    record("range_changes", seconds, peak)
+
+    _, seconds, peak = measure(lambda: analytics.range_summary(cube, start=start_month, end=end_month), repeat)
+    record("range_summary", seconds, peak)
+
+    # 회전율: 최근 12개월 거래 건수 (누적 건수 뺄셈), 월별 12개월 누적 추이
+    households = pd.DataFrame({"세대수": rng.integers(100, 3000, len(cube.apartments)).astype(np.float64)}, index=located.index)
+    _, seconds, peak = measure(lambda: analytics.turnover(cube, households, window=12), repeat)
+    record("turnover", seconds, peak)
+
+    _, seconds, peak = measure(lambda: analytics.turnover_trend(cube, households, window=12), repeat)
+    record("turnover_trend", seconds, peak)
+
+    apartments = cube.apartments.tolist()
+    if select:
+        apartments = apartments[:select]
+    sizes = cube.sizes.tolist()
+
+    for stage, func in page_stages(tables, cube, apartments, sizes):
+        result, seconds, peak = measure(func, repeat)
+        record(stage, seconds, peak, charts.payload_bytes(result) if isinstance(result, go.Figure) else None)
+
+    return results
+
+
+# 기준 결과 대비 느려진 단계 (같은 rows/stage 기준, threshold 배 이상)
+def regressions(results, baseline, threshold):
+    previous = {(r["rows"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    slower = []
+    for r in results:
+        before = previous.get((r["rows"], r["stage"]))
+        if before and r["seconds"] > before * threshold:
+            slower.append((r["rows"], r["stage"], before, r["seconds"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="데이터 크기별 페이지 계산 지연 시간/최대 메모리 측정")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="합성 데이터 행 수 (예: 1000 10000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수 (최솟값 기록)")
+    parser.add_argument("--select", type=int, default=None, help="선택할 아파트 수 (기본: 전체, 앱 기본값과 동일)")
+    parser.add_argument("--output", default="bench_pages.json", help="결과 JSON 파일")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=1.5, help="회귀로 판단할 지연 시간 배수")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>12}  {'stage':<18} {'latency':>12}  {'peak':>11}  {'payload':>11}")
+    results = []
+    for rows in args.rows:
+        results.extend(run_size(rows, args.repeat, args.select))
+
+    report = {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "repeat": args.repeat,
+        "select": args.select,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            slower = regressions(results, json.load(f), args.threshold)
+        for rows, stage, before, after in slower:
+            print(f"회귀: {rows:,}행 {stage} {before * 1000:.2f}ms → {after * 1000:.2f}ms")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
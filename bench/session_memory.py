@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+
+# 저장소 루트에서 실행해도, bench/ 에서 실행해도 realestate 패키지를 찾도록 설정
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from realestate import memory
+
+
+# 한 프로세스에서 세션 N개를 열어 세션당 메모리 증가량 측정
+# - 데이터 큐브는 st.cache_resource로 공유되므로 세션 수에 비례해 늘어나지 않아야 함
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="세션 수에 따른 프로세스 메모리(RSS) 측정")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--menu", default="가격 추이")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    sessions = []
+
+    baseline = memory.process_rss_bytes()
+    for i in range(args.sessions):
+        at = AppTest.from_file("streamlit_app.py", default_timeout=120)
+        at.run()
+        at.sidebar.radio[0].set_value(args.menu).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        sessions.append(at)
+
+        rss = memory.process_rss_bytes()
+        if i == 0:
+            first = rss
+        print(f"세션 {i + 1:>3}개: RSS {memory.format_bytes(rss)}")
+
+    if len(sessions) > 1:
+        per_session = (rss - first) / (len(sessions) - 1)
+        print(f"첫 세션 (데이터 로드 포함): {memory.format_bytes(first - baseline)}")
+        print(f"추가 세션당 증가량: {memory.format_bytes(per_session)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# 부산 해운대구 우동 아파트 실거래가 분석 - 데이터/분석 코어 (Streamlit 비의존)
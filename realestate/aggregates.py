@@ -0,0 +1,147 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from realestate import rolling, storage
+
+# 미리 계산한 집계 테이블 저장 위치 (data/aggregates/<테이블>.parquet + _version.json)
+AGGREGATE_DIR = os.path.join(storage.DATA_DIR, "aggregates")
+VERSION_NAME = "_version.json"
+
+# 집계 테이블 구성 버전 (컬럼이나 계산 방식이 바뀌면 올려서 이전 형식의 저장 테이블을 다시 계산)
+SCHEMA_VERSION = 5
+
+# 집계 테이블
+# - monthly: (아파트, 평형대, 날짜) 별 가격 + 거래 건수 + 평균가 + 이동 통계, (아파트, 평형대, 날짜) 순 정렬
+# - summary: (아파트, 평형대) 별 전체 기간 평균 가격, 최대 낙폭, 총 거래 건수
+# - latest: (아파트, 평형대) 별 마지막 거래월 시세
+# - deltas: (아파트, 평형대) 별 마지막 거래월 기준 기간별 평균가 변동률
+TABLES = ["monthly", "summary", "latest", "deltas"]
+
+SERIES_KEYS = ["아파트", "평형대"]
+AVG_COLUMN = "평균가(억)"
+# 평당 가격은 아파트 정보(단지 면적)가 필요하므로 집계 테이블이 아니라 analytics.unit_prices에서 계산
+PYEONG_PRICE_COLUMN = "평당 가격(만원)"
+
+# 기간별 변동률 비교 간격 (개월)
+DELTA_MONTHS = (1, 3, 6, 12)
+
+
+def delta_column(months):
+    return f"{months}개월 변동률(%)"
+
+
+# 거래 데이터에 평균가 컬럼 추가
+def add_derived(data):
+    low = data["최저가(억)"].to_numpy(dtype=np.float32)
+    high = data["최고가(억)"].to_numpy(dtype=np.float32)
+
+    derived = data.copy(deep=False)
+    derived[AVG_COLUMN] = (low + high) / 2
+    return derived
+
+
+# 마지막 거래월 기준 k개월 전 평균가 대비 변동률 (k개월 전 거래가 없으면 NaN)
+def _deltas(monthly, latest):
+    indexed = monthly.set_index(SERIES_KEYS + [storage.DATE_COLUMN])[AVG_COLUMN]
+    latest_avg = latest[AVG_COLUMN].to_numpy(dtype=np.float64)
+
+    deltas = latest[SERIES_KEYS + [storage.DATE_COLUMN]].copy()
+    for months in DELTA_MONTHS:
+        previous_keys = pd.MultiIndex.from_arrays([
+            latest["아파트"],
+            latest["평형대"],
+            latest[storage.DATE_COLUMN] - months,
+        ])
+        previous = indexed.reindex(previous_keys).to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = (latest_avg - previous) / previous * 100
+        deltas[delta_column(months)] = np.where(previous > 0, change, np.nan)
+    return deltas.reset_index(drop=True)
+
+
+# 거래 데이터로 모든 집계 테이블 계산
+# - since: 이동 통계를 이 월 이후만 다시 계산 (data에 이전 행의 이동 통계 컬럼이 있을 때, 증분 갱신용)
+def build_tables(data, since=None):
+    carried = [col for col in rolling.COLUMNS if col in data.columns] if since is not None else []
+    if storage.VOLUME_COLUMN not in data.columns:
+        # 거래 건수가 없는 원본 (CSV 등) 은 건수를 모르는 것으로 표시
+        data = data.assign(**{storage.VOLUME_COLUMN: np.nan})
+    monthly = (
+        add_derived(storage.normalize_frame(data[storage.STORE_COLUMNS + carried]))
+        .dropna(subset=SERIES_KEYS)
+        .sort_values(SERIES_KEYS + [storage.DATE_COLUMN], kind="stable")
+        .reset_index(drop=True)
+    )
+    for col in storage.CATEGORY_COLUMNS:
+        monthly[col] = monthly[col].cat.remove_unused_categories()
+    monthly = rolling.add_rolling(monthly, AVG_COLUMN, since)
+
+    grouped = monthly.groupby(SERIES_KEYS, observed=True, sort=True)
+    summary = grouped.agg(**{
+        "최저가(억)": ("최저가(억)", "mean"),
+        "최고가(억)": ("최고가(억)", "mean"),
+        "첫 거래월": (storage.DATE_COLUMN, "min"),
+        "최신 거래월": (storage.DATE_COLUMN, "max"),
+        "거래월 수": (storage.DATE_COLUMN, "size"),
+    }).reset_index()
+    summary[AVG_COLUMN] = (summary["최저가(억)"] + summary["최고가(억)"]) / 2
+    summary[rolling.MAX_DRAWDOWN_COLUMN] = grouped[rolling.DRAWDOWN_COLUMN].min().to_numpy()
+    summary["총 거래 건수"] = grouped[storage.VOLUME_COLUMN].sum(min_count=1).to_numpy()
+
+    latest = grouped.tail(1).reset_index(drop=True)
+
+    return {
+        "monthly": monthly,
+        "summary": summary,
+        "latest": latest,
+        "deltas": _deltas(monthly, latest),
+    }
+
+
+# 집계 테이블 저장 (버전 파일은 마지막에 교체하여 테이블과 버전이 어긋나지 않도록 함)
+def save_tables(tables, version, aggregate_dir=AGGREGATE_DIR):
+    if not os.path.exists(aggregate_dir):
+        os.makedirs(aggregate_dir)
+
+    for name in TABLES:
+        tables[name].to_parquet(os.path.join(aggregate_dir, f"{name}.parquet"), index=False)
+
+    path = os.path.join(aggregate_dir, VERSION_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": version, "schema": SCHEMA_VERSION}, f)
+    os.replace(path + ".tmp", path)
+
+
+# 저장된 집계 테이블의 데이터 버전 (없거나 이전 구성 형식이면 None)
+def saved_version(aggregate_dir=AGGREGATE_DIR):
+    path = os.path.join(aggregate_dir, VERSION_NAME)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    if saved.get("schema") != SCHEMA_VERSION:
+        return None
+    return saved.get("version")
+
+
+# 집계 테이블 로드 (version이 주어지면 저장된 버전과 같을 때만, 아니면 None)
+def load_tables(version=None, aggregate_dir=AGGREGATE_DIR):
+    stored = saved_version(aggregate_dir)
+    if stored is None or (version is not None and stored != version):
+        return None
+
+    return {name: pd.read_parquet(os.path.join(aggregate_dir, f"{name}.parquet")) for name in TABLES}
+
+
+# 선택된 아파트/평형대 행만 추출 (None이면 전체)
+def select(table, apartments=None, sizes=None):
+    mask = np.ones(len(table), dtype=bool)
+    if apartments is not None:
+        mask &= table["아파트"].isin(apartments).to_numpy()
+    if sizes is not None:
+        mask &= table["평형대"].isin(sizes).to_numpy()
+    return table[mask]
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from realestate import aggregates, ingest, metadata, rolling, storage, units
+from realestate.changes import price_changes
+from realestate.cube import PriceCube
+
+# 대시보드/배치 리포트가 함께 쓰는 분석 계산 (Streamlit 비의존)
+
+SERIES_KEYS = aggregates.SERIES_KEYS
+
+# 회전율 추이 구간 (개월)
+TURNOVER_WINDOW = 12
+
+
+# 집계 테이블로 큐브 생성 (월별 테이블은 큐브의 정렬된 데이터를 함께 사용)
+def dataset(tables):
+    cube = PriceCube(tables["monthly"])
+    return cube, dict(tables, monthly=cube.data)
+
+
+# 저장소의 현재 버전 데이터셋 로드 (저장된 집계 테이블이 없거나 오래되었으면 다시 계산)
+def load(store_dir=ingest.STORE_DIR, aggregate_dir=aggregates.AGGREGATE_DIR):
+    version = ingest.load_manifest(store_dir)["version"]
+    tables = aggregates.load_tables(version, aggregate_dir)
+    if tables is None:
+        tables = ingest.refresh_aggregates(store_dir, aggregate_dir=aggregate_dir)
+    return dataset(tables)
+
+
+# 선택된 아파트/평형대 행 (거래 컬럼과 평균가만, 이동 통계 등 파생 컬럼은 제외)
+def filter_rows(cube, apartments=None, sizes=None):
+    return cube.select(apartments, sizes, storage.REQUIRED_COLUMNS + [aggregates.AVG_COLUMN])
+
+
+# 아파트의 평형대별 최신 시세 (선택 범위의 가장 최근 거래월 기준)
+def latest_prices(tables, apartment, sizes=None):
+    latest = aggregates.select(tables["latest"], [apartment], sizes)
+    return latest[latest["날짜"] == latest["날짜"].max()]
+
+
+# 모든 단지×평형대의 최신 시세 기준 평당/㎡당 가격 (한 번에 계산)
+# - 대표 평수는 단지 면적 범위와 평형대 구간으로 계산 (metadata.representative_pyeong)
+def unit_prices(tables, info):
+    latest = tables["latest"][SERIES_KEYS + ["날짜", aggregates.AVG_COLUMN]]
+    pyeong = metadata.representative_pyeong(info, latest["아파트"], latest["평형대"])
+    per_pyeong = latest[aggregates.AVG_COLUMN].to_numpy(dtype=np.float64) * 10000 / pyeong
+
+    return latest.assign(**{
+        "대표 평수": pyeong,
+        aggregates.PYEONG_PRICE_COLUMN: per_pyeong,
+        "㎡당 가격(만원)": per_pyeong / units.PYEONG_M2,
+    })
+
+
+# 아파트의 평형대별 평당 가격 (선택 범위의 가장 최근 거래월 기준, 대표 평수를 모르는 평형대 제외)
+# - prices: unit_prices 결과
+def price_per_pyeong(prices, apartment, sizes=None):
+    latest = aggregates.select(prices, [apartment], sizes)
+    latest = latest[(latest["날짜"] == latest["날짜"].max()) & latest[aggregates.PYEONG_PRICE_COLUMN].notna()]
+    return latest[["평형대", "대표 평수", aggregates.PYEONG_PRICE_COLUMN, "㎡당 가격(만원)"]].reset_index(drop=True)
+
+
+# 단지 반경 안의 다른 단지와 단지별 평균 평당 가격 (가까운 순)
+# - index: geo.GeoIndex, prices: unit_prices 결과
+def nearby_prices(index, prices, apartment, radius_km):
+    nearby = index.near(apartment, radius_km)
+    per_pyeong = prices.groupby(prices["아파트"].astype(str))[aggregates.PYEONG_PRICE_COLUMN].mean()
+    return nearby.assign(**{aggregates.PYEONG_PRICE_COLUMN: per_pyeong.reindex(nearby["아파트"]).to_numpy()})
+
+
+# 아파트별 기간 거래 건수와 회전율 (end 월까지 window개월, 거래 건수 / 세대수 × 100)
+# - 누적 거래 건수에서 시계열당 뺄셈 한 번 (기간 길이와 관계없음), 세대수를 모르는 아파트는 회전율 NaN
+def turnover(cube, info, window=1, end=None, apartments=None, sizes=None):
+    end = int(cube.months[-1]) if end is None and len(cube.months) else end
+    names = cube.apartments[cube.apartment_codes(apartments)]
+    volume = cube.volume_window(end - window + 1, end, apartments, sizes).sum(axis=1) if end is not None else np.zeros(len(names))
+    households = info["세대수"].reindex(names).to_numpy(dtype=np.float64, na_value=np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(households > 0, volume / households * 100, np.nan)
+    return pd.DataFrame({"아파트": names, "세대수": households, "거래 건수": volume, "회전율(%)": rate})
+
+
+# 월별 직전 window개월 거래 건수와 회전율 추이 (세대수를 아는 아파트 합계 기준)
+def turnover_trend(cube, info, window=TURNOVER_WINDOW, apartments=None, sizes=None):
+    names = cube.apartments[cube.apartment_codes(apartments)]
+    households = info["세대수"].reindex(names).to_numpy(dtype=np.float64, na_value=np.nan)
+    known = households > 0
+
+    volume = cube.rolling_volume(window, apartments, sizes).sum(axis=1)
+    known_volume = volume[known].sum(axis=0)
+    total = households[known].sum()
+    return pd.DataFrame({
+        storage.DATE_COLUMN: cube.months,
+        "거래 건수": volume.sum(axis=0),
+        "회전율(%)": known_volume / total * 100 if total > 0 else np.nan,
+    })
+
+
+# start~end 월(포함) 시계열별 기간 요약 (평균가 평균, 거래월 수, 거래 건수, 구간 안 첫 거래월 → 마지막 거래월 변동률)
+# - 모두 큐브의 누적 배열/직전·다음 거래월 배열에서 시계열당 상수 번 조회 (구간 길이와 무관), 구간에 거래가 없는 시계열 제외
+# - exact=True이면 변동률은 start 월과 end 월을 그대로 비교 (두 월 모두 거래가 있는 시계열만)
+def range_summary(cube, apartments=None, sizes=None, start=None, end=None, exact=False):
+    apt_codes = cube.apartment_codes(apartments)
+    size_codes = cube.size_codes(sizes)
+    mean, months = cube.range_mean(start, end, apartments, sizes)
+    a, s = (codes.ravel() for codes in np.meshgrid(apt_codes, size_codes, indexing="ij"))
+    found = months.ravel() > 0
+
+    summary = pd.DataFrame({
+        "아파트": cube.apartments[a[found]],
+        "평형대": cube.sizes[s[found]],
+        "기간 평균가(억)": mean.ravel()[found],
+        "거래월 수": months.ravel()[found],
+    })
+    if cube.has_volume:
+        summary["거래 건수"] = cube.volume_window(start, end, apartments, sizes).ravel()[found]
+
+    changes = price_changes(cube, apartments, sizes, start, end, per_series=not exact)
+    return summary.merge(changes[SERIES_KEYS + ["변동률(%)"]], on=SERIES_KEYS, how="left")
+
+
+# 시계열별 위험 지표 (최신 거래월 기준 변동성/낙폭, 전체 기간 최대 낙폭)
+def risk_metrics(tables, apartments=None, sizes=None):
+    latest = aggregates.select(tables["latest"], apartments, sizes)
+    summary = aggregates.select(tables["summary"], apartments, sizes)
+    return latest[SERIES_KEYS + ["날짜", rolling.VOLATILITY_COLUMN, rolling.DRAWDOWN_COLUMN]].merge(
+        summary[SERIES_KEYS + [rolling.MAX_DRAWDOWN_COLUMN]], on=SERIES_KEYS, how="left"
+    )
+
+
+# 아파트×평형대 시계열별 리포트 (한 행 = 한 시계열)
+# - 거래 기간, 최신 시세/평당 가격, 기간별 변동률, 전체 기간 변동률 (첫 거래월 → 최신 거래월), 변동성/최대 낙폭
+# - prices: unit_prices 결과 (대시보드와 같은 단지 면적 기준 평당 가격)
+def series_reports(cube, tables, prices, apartments=None, sizes=None):
+    summary = aggregates.select(tables["summary"], apartments, sizes)
+    latest = aggregates.select(tables["latest"], apartments, sizes).merge(
+        prices[SERIES_KEYS + [aggregates.PYEONG_PRICE_COLUMN]], on=SERIES_KEYS, how="left"
+    )
+    deltas = aggregates.select(tables["deltas"], apartments, sizes)
+    changes = price_changes(cube, apartments, sizes, per_series=True)
+
+    report = (
+        summary[SERIES_KEYS + ["첫 거래월", "최신 거래월", "거래월 수", rolling.MAX_DRAWDOWN_COLUMN]]
+        .merge(
+            latest[SERIES_KEYS + ["최저가(억)", "최고가(억)", aggregates.AVG_COLUMN, aggregates.PYEONG_PRICE_COLUMN, rolling.VOLATILITY_COLUMN]],
+            on=SERIES_KEYS,
+            how="left",
+        )
+        .merge(deltas.drop(columns="날짜"), on=SERIES_KEYS, how="left")
+        .merge(changes[SERIES_KEYS + ["변동률(%)"]].rename(columns={"변동률(%)": "전체 기간 변동률(%)"}), on=SERIES_KEYS, how="left")
+    )
+    return report.sort_values(SERIES_KEYS, kind="stable").reset_index(drop=True)
@@ -0,0 +1,184 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from realestate import ingest, storage
+
+# 개별 거래 이상값 검출 (가져오기 중 스트리밍)
+# - 기준 값: (아파트, 평형대)별 로그 ㎡당 가격 (같은 평형대 안의 면적 차이 보정)
+# - 그룹별 상태는 (건수, 평균, 분산) 세 값뿐이며 청크마다 병렬 Welford 병합으로 갱신 (행 수와 무관한 메모리)
+# - 건수가 MAX_WEIGHT를 넘으면 건수를 고정하여 오래된 거래의 비중을 줄임 (가격 추세 반영)
+# - 이력이 부족한 그룹은 같은 청크 안의 중앙값/MAD로 판단, 그것도 부족하면 판단하지 않음
+# - 이상 거래는 요약/개별 거래 저장소에 넣지 않고 검토 대기 저장소(월별 파티션)에 기록
+
+QUARANTINE_DIR = os.path.join(storage.DATA_DIR, "quarantine")
+STATE_NAME = "_detector.parquet"
+
+GROUP_COLUMNS = ["아파트", "평형대"]
+
+# 판단에 필요한 최소 거래 수, 이상값 기준 (표준 점수 절댓값)
+MIN_COUNT = 10
+Z_THRESHOLD = 4.0
+
+# 로그 가격 표준편차 하한 (가격이 거의 같은 그룹에서 작은 차이를 이상값으로 보지 않도록)
+MIN_SIGMA = 0.05
+
+# 그룹 상태의 최대 건수 (지수 가중 망각)
+MAX_WEIGHT = 500
+
+# 정규분포 기준 MAD → 표준편차 환산
+MAD_SCALE = 1.4826
+
+EXPECTED_COLUMN = "예상 거래금액(억)"
+SCORE_COLUMN = "이탈 점수"
+STATE_COLUMNS = ["count", "mean", "var"]
+QUARANTINE_COLUMNS = ["계약일", storage.DATE_COLUMN, "아파트", "법정동", "전용면적(㎡)", "층", "평형대", "거래금액(억)", EXPECTED_COLUMN, SCORE_COLUMN]
+
+
+# 거래별 로그 ㎡당 가격 (면적/금액이 없거나 0 이하이면 NaN)
+def log_unit_price(deals):
+    price = deals["거래금액(억)"].to_numpy(dtype=np.float64)
+    area = deals["전용면적(㎡)"].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.log(price / area)
+    values[~np.isfinite(values)] = np.nan
+    return values
+
+
+def _empty_state():
+    index = pd.MultiIndex.from_arrays([pd.Index([], dtype=object)] * 2, names=GROUP_COLUMNS)
+    return pd.DataFrame({col: pd.Series(dtype=np.float64) for col in STATE_COLUMNS}, index=index)
+
+
+# (아파트, 평형대)별 스트리밍 이상값 검출기
+# - state: 그룹별 건수/평균/분산 (모분산) 표
+class DealDetector:
+    def __init__(self, state=None):
+        self.state = _empty_state() if state is None else state
+
+    # 청크 하나 검사 → (정상 거래, 이상 거래)
+    # - 청크 안의 거래는 청크 시작 시점의 그룹 상태로 판단한 뒤, 정상 거래만 상태에 병합
+    # - 이상 거래에는 예상 거래금액(억), 이탈 점수 컬럼 추가
+    def check(self, deals):
+        if deals.empty:
+            return deals, deals.assign(**{EXPECTED_COLUMN: np.float32(0), SCORE_COLUMN: np.float32(0)})
+
+        values = log_unit_price(deals)
+        groups = deals.groupby(GROUP_COLUMNS, observed=True, sort=False)
+        codes = groups.ngroup().to_numpy()
+        keys = groups.size().index
+        keys = pd.MultiIndex.from_arrays([keys.get_level_values(i).astype(str) for i in range(2)], names=GROUP_COLUMNS)
+
+        # 그룹별 이전 상태 (없으면 0)
+        previous = self.state.reindex(keys).fillna(0.0)
+        count = previous["count"].to_numpy()
+        mean = previous["mean"].to_numpy()
+        var = previous["var"].to_numpy()
+
+        # 청크 안의 중앙값/MAD (이력이 부족한 그룹용)
+        series = pd.Series(values)
+        batch_count = series.groupby(codes).count().reindex(range(len(keys)), fill_value=0).to_numpy()
+        median = series.groupby(codes).median().reindex(range(len(keys))).to_numpy()
+        mad = (series - median[codes]).abs().groupby(codes).median().reindex(range(len(keys))).to_numpy()
+
+        warm = count >= MIN_COUNT
+        center = np.where(warm, mean, median)
+        scale = np.maximum(np.where(warm, np.sqrt(var), MAD_SCALE * mad), MIN_SIGMA)
+        judged = warm | (batch_count >= MIN_COUNT)
+
+        score = (values - center[codes]) / scale[codes]
+        flagged = judged[codes] & (np.abs(score) > Z_THRESHOLD)
+
+        self._merge(keys, codes[~flagged], values[~flagged], count, mean, var)
+
+        area = deals["전용면적(㎡)"].to_numpy(dtype=np.float64)
+        quarantined = deals[flagged].assign(**{
+            EXPECTED_COLUMN: (np.exp(center[codes[flagged]]) * area[flagged]).astype(np.float32),
+            SCORE_COLUMN: score[flagged].astype(np.float32),
+        })
+        return deals[~flagged], quarantined
+
+    # 정상 거래를 그룹 상태에 병합 (병렬 Welford: 두 묶음의 건수/평균/분산 결합)
+    def _merge(self, keys, codes, values, count, mean, var):
+        valid = ~np.isnan(values)
+        codes, values = codes[valid], values[valid]
+        n = np.bincount(codes, minlength=len(keys)).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            batch_mean = np.bincount(codes, weights=values, minlength=len(keys)) / n
+            batch_var = np.bincount(codes, weights=(values - batch_mean[codes]) ** 2, minlength=len(keys)) / n
+
+        total = count + n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = np.nan_to_num(batch_mean) - mean
+            merged_mean = np.where(n > 0, mean + delta * n / total, mean)
+            merged_var = np.where(
+                n > 0,
+                (count * var + n * np.nan_to_num(batch_var) + delta ** 2 * count * n / total) / total,
+                var,
+            )
+
+        updated = pd.DataFrame({
+            "count": np.minimum(total, MAX_WEIGHT),
+            "mean": merged_mean,
+            "var": merged_var,
+        }, index=keys)[n > 0]
+        if len(updated):
+            self.state = pd.concat([self.state[~self.state.index.isin(updated.index)], updated])
+
+
+# 검출기 상태 저장/로드 (없으면 빈 상태)
+def save_detector(detector, quarantine_dir=QUARANTINE_DIR):
+    if not os.path.exists(quarantine_dir):
+        os.makedirs(quarantine_dir)
+
+    path = os.path.join(quarantine_dir, STATE_NAME)
+    detector.state.reset_index().to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+def load_detector(quarantine_dir=QUARANTINE_DIR):
+    path = os.path.join(quarantine_dir, STATE_NAME)
+    if not os.path.exists(path):
+        return DealDetector()
+    return DealDetector(pd.read_parquet(path).set_index(GROUP_COLUMNS)[STATE_COLUMNS])
+
+
+# 이상 거래를 월별 파티션에 추가 (완전히 같은 행은 한 번만 저장)
+def append_quarantine(rows, quarantine_dir=QUARANTINE_DIR):
+    if not os.path.exists(quarantine_dir):
+        os.makedirs(quarantine_dir)
+
+    manifest = ingest.load_manifest(quarantine_dir)
+    changed = []
+
+    for month, group in rows.groupby(storage.DATE_COLUMN, sort=True):
+        name = ingest.partition_name(month)
+        path = ingest.partition_path(quarantine_dir, name)
+
+        if name in manifest["partitions"] and os.path.exists(path):
+            group = storage.concat_frames([pd.read_parquet(path), group])
+
+        merged = group.drop_duplicates().reset_index(drop=True)
+        for col in storage.CATEGORY_COLUMNS:
+            merged[col] = merged[col].astype("category").cat.remove_unused_categories()
+
+        if manifest["partitions"].get(name, {}).get("rows") == len(merged):
+            continue
+
+        merged.to_parquet(path, index=False)
+        manifest["partitions"][name] = {"month": int(month), "hash": ingest.frame_hash(merged), "rows": len(merged)}
+        changed.append(name)
+
+    manifest["version"] = ingest.store_version(manifest["partitions"])
+    ingest.save_manifest(quarantine_dir, manifest)
+    return changed
+
+
+# 이상 거래 로드 (계약일 최신순)
+def read_quarantine(quarantine_dir=QUARANTINE_DIR):
+    manifest = ingest.load_manifest(quarantine_dir)
+    frames = [pd.read_parquet(ingest.partition_path(quarantine_dir, name)) for name in sorted(manifest["partitions"])]
+    if not frames:
+        return pd.DataFrame(columns=QUARANTINE_COLUMNS)
+    return storage.concat_frames(frames).sort_values("계약일", ascending=False, kind="stable").reset_index(drop=True)
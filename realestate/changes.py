@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+CHANGE_COLUMNS = ["아파트", "평형대", "변동률(%)", "첫 평균가(억)", "최신 평균가(억)"]
+
+
+# 선택 영역의 평균가 큐브 (아파트' × 평형대' × 월)
+def _selection(cube, apartments, sizes):
+    apt_codes = cube.apartment_codes(apartments)
+    size_codes = cube.size_codes(sizes)
+    return apt_codes, size_codes, cube.mid[np.ix_(apt_codes, size_codes)]
+
+
+# 선택 영역에서 거래가 있는 첫 월/마지막 월 위치
+def _observed_bounds(mid):
+    observed = ~np.isnan(mid).all(axis=(0, 1))
+    if not observed.any():
+        return None, None
+    positions = np.flatnonzero(observed)
+    return int(positions[0]), int(positions[-1])
+
+
+# 모든 아파트×평형대 시계열의 가격 변동률을 한 번에 계산
+# - start/end: 비교할 월 키 (None이면 선택 영역의 첫 월/마지막 월)
+# - per_series=False: 모든 시계열을 같은 start/end 월로 비교 (두 월 모두 거래가 있어야 포함)
+# - per_series=True: 시계열별로 [start, end] 구간 안의 첫 거래월/마지막 거래월을 비교
+#   (큐브의 직전/다음 거래월 배열에서 위치를 바로 조회하므로 구간 길이와 무관)
+def price_changes(cube, apartments=None, sizes=None, start=None, end=None, per_series=False):
+    empty = pd.DataFrame(columns=CHANGE_COLUMNS)
+
+    if per_series:
+        apt_codes = cube.apartment_codes(apartments)
+        size_codes = cube.size_codes(sizes)
+        if not len(apt_codes) or not len(size_codes) or not len(cube.months):
+            return empty
+
+        first_idx, last_idx = cube.range_endpoints(start, end, apartments, sizes)
+        a, s = apt_codes[:, None], size_codes[None, :]
+        first = cube.mid[a, s, np.maximum(first_idx, 0)]
+        last = cube.mid[a, s, np.maximum(last_idx, 0)]
+        # 구간에 거래가 없거나 한 건뿐인 시계열은 비교 대상에서 제외
+        first = np.where((first_idx >= 0) & (first_idx < last_idx), first, np.nan)
+    else:
+        apt_codes, size_codes, mid = _selection(cube, apartments, sizes)
+        if mid.size == 0:
+            return empty
+
+        first_observed, last_observed = _observed_bounds(mid)
+        if first_observed is None:
+            return empty
+
+        start_pos = first_observed if start is None else cube.month_position(start)
+        end_pos = last_observed if end is None else cube.month_position(end)
+        if start_pos is None or end_pos is None:
+            return empty
+        first = mid[..., start_pos]
+        last = mid[..., end_pos]
+
+    found = ~np.isnan(first) & ~np.isnan(last) & (first != 0)
+    a_idx, s_idx = np.nonzero(found)
+    first = first[found].astype(np.float64)
+    last = last[found].astype(np.float64)
+
+    changes = pd.DataFrame({
+        "아파트": cube.apartments[apt_codes[a_idx]],
+        "평형대": cube.sizes[size_codes[s_idx]],
+        "변동률(%)": (last - first) / first * 100,
+        "첫 평균가(억)": first,
+        "최신 평균가(억)": last,
+    })
+    return changes.sort_values("변동률(%)", ascending=False, kind="stable").reset_index(drop=True)
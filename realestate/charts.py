@@ -0,0 +1,222 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from realestate.storage import DATE_COLUMN, month_key_to_datetime
+
+# 차트 생성 (Streamlit 비의존, 페이지/배치 리포트 공용)
+# - 긴 형식(long-format) 데이터에서 한 번에 figure 생성 (시계열마다 필터/add_trace 하지 않음)
+# - 시계열이 MAX_POINTS보다 길면 LTTB로 줄여서 전송
+# - 전체 점 수가 WEBGL_POINTS보다 많으면 WebGL(Scattergl)로 그림
+# - 월 키는 'YYYY-MM' 문자열로 전송 (ISO 날짜-시각 문자열의 절반 이하 크기)
+
+# 시계열 하나당 최대 점 수
+MAX_POINTS = 500
+
+# SVG 대신 WebGL로 그리는 전체 점 수 기준
+WEBGL_POINTS = 2000
+
+COLORS = px.colors.qualitative.Plotly
+
+
+# 날짜/숫자 컬럼 → float 배열 (LTTB 면적 계산용)
+def _numeric(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[ns]").astype(np.int64)
+    return values.astype(np.float64)
+
+
+# Largest-Triangle-Three-Buckets: 모양을 유지하며 points개 점의 위치 선택
+# - 첫/마지막 점은 항상 포함, 가운데는 구간마다 앞 선택점/다음 구간 평균과 만드는 삼각형이 가장 큰 점
+def lttb(x, y, points):
+    x = _numeric(x)
+    y = _numeric(y)
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+# 긴 형식 데이터의 그룹(시계열)별 LTTB (x 순으로 정렬된 데이터, 짧은 시계열은 그대로)
+def downsample(frame, x, y, by, points=MAX_POINTS):
+    if len(frame) <= points:
+        return frame
+
+    groups = frame.groupby(by, observed=True, sort=False).indices
+    if max(len(rows) for rows in groups.values()) <= points:
+        return frame
+
+    keep = []
+    for rows in groups.values():
+        if len(rows) > points:
+            rows = rows[lttb(frame[x].to_numpy()[rows], frame[y].to_numpy()[rows], points)]
+        keep.append(rows)
+    return frame.iloc[np.sort(np.concatenate(keep))]
+
+
+# 월 키 배열 → 'YYYY-MM' 문자열 배열 (Plotly 날짜 축에서 그대로 인식)
+def month_labels(keys):
+    return np.datetime_as_string(month_key_to_datetime(keys).astype("datetime64[M]"), unit="M")
+
+
+# 긴 형식 월별 데이터 → 그룹별 선 차트 (color 그룹 하나가 trace 하나)
+# - frame: x(월 키) 순으로 정렬된 데이터 (PriceCube.select 결과 등)
+# - overlays: 같은 그룹에 점선으로 겹쳐 그릴 (컬럼, 이름) 목록 (이동평균 등, 범례에서 그룹과 함께 켜고 끔)
+def line_figure(frame, y, color, x=DATE_COLUMN, overlays=(), hovertemplate=None, max_points=MAX_POINTS, webgl_points=WEBGL_POINTS, **layout):
+    frame = downsample(frame, x, y, color, max_points)
+    trace_type = "scattergl" if len(frame) * (1 + len(overlays)) > webgl_points else "scatter"
+    xs = month_labels(frame[x])
+    ys = frame[y].to_numpy()
+    overlay_values = [(frame[col].to_numpy(), label) for col, label in overlays]
+
+    traces = []
+    for i, (name, rows) in enumerate(frame.groupby(color, observed=True, sort=False).indices.items()):
+        line_color = COLORS[i % len(COLORS)]
+        traces.append(dict(
+            type=trace_type,
+            x=xs[rows],
+            y=ys[rows],
+            mode="lines+markers",
+            name=str(name),
+            legendgroup=str(name),
+            line=dict(color=line_color),
+            hovertemplate=hovertemplate
+        ))
+        for values, label in overlay_values:
+            traces.append(dict(
+                type=trace_type,
+                x=xs[rows],
+                y=values[rows],
+                mode="lines",
+                name=f"{name} {label}",
+                legendgroup=str(name),
+                line=dict(color=line_color, dash="dot", width=1),
+                hovertemplate=hovertemplate
+            ))
+    fig = go.Figure(dict(data=traces))
+    fig.update_layout(xaxis_type="date", **layout)
+    return fig
+
+
+# 선 차트에 예측선(점선)과 예측 구간(음영) 추가 (같은 그룹의 실제 선과 같은 색)
+# - forecast: color, x(월 키), y/lower/upper 컬럼을 가진 긴 형식 데이터
+def add_forecast(fig, forecast, color, y, lower, upper, x=DATE_COLUMN, label="예측"):
+    colors = {trace.name: trace.line.color for trace in fig.data}
+    trace_type = fig.data[0].type if fig.data else "scatter"
+    xs = month_labels(forecast[x])
+
+    traces = []
+    for name, rows in forecast.groupby(color, observed=True, sort=False).indices.items():
+        name = str(name)
+        if name not in colors:
+            continue
+        band_x = np.concatenate([xs[rows], xs[rows][::-1]])
+        band_y = np.concatenate([forecast[upper].to_numpy()[rows], forecast[lower].to_numpy()[rows][::-1]])
+        traces.append(dict(
+            type="scatter",
+            x=band_x,
+            y=band_y,
+            fill="toself",
+            fillcolor=colors[name],
+            opacity=0.15,
+            line=dict(width=0),
+            name=f"{name} {label} 구간",
+            legendgroup=name,
+            showlegend=False,
+            hoverinfo="skip"
+        ))
+        traces.append(dict(
+            type=trace_type,
+            x=xs[rows],
+            y=forecast[y].to_numpy()[rows],
+            mode="lines",
+            name=f"{name} {label}",
+            legendgroup=name,
+            line=dict(color=colors[name], dash="dash"),
+            hovertemplate='%{y:.1f}억원'
+        ))
+    fig.add_traces(traces)
+    return fig
+
+
+# 선 차트 아래에 월별 거래 건수 막대 추가 (아래쪽 별도 y축, 같은 x축 공유)
+# - months: 월 키 배열, counts: 월별 거래 건수 (거래가 없는 달은 막대 생략)
+def add_volume(fig, months, counts, label="거래 건수", share=0.2):
+    counts = np.asarray(counts)
+    shown = counts > 0
+    if not shown.any():
+        return fig
+
+    fig.add_trace(dict(
+        type="bar",
+        x=month_labels(np.asarray(months)[shown]),
+        y=counts[shown],
+        name=label,
+        yaxis="y2",
+        marker=dict(color="rgba(128, 128, 128, 0.5)"),
+        hovertemplate='%{y:,}건'
+    ))
+    fig.update_layout(
+        yaxis=dict(domain=[share + 0.08, 1]),
+        yaxis2=dict(domain=[0, share], anchor="x", title=dict(text=label), rangemode="tozero")
+    )
+    return fig
+
+
+# 범주별 가격 범위 (최저가~최고가) 막대 차트, 범주 수와 관계없이 trace 하나
+def range_figure(labels, low, high, **layout):
+    labels = np.asarray(labels, dtype=object).astype(str)
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+
+    fig = go.Figure(go.Bar(
+        x=labels,
+        y=high - low,
+        base=low,
+        marker_color=[COLORS[i % len(COLORS)] for i in range(len(labels))],
+        text=[f"{l:.1f}억 ~ {h:.1f}억" for l, h in zip(low, high)],
+        hoverinfo="text"
+    ))
+    fig.update_layout(showlegend=False, **layout)
+    return fig
+
+
+# 정사각 행렬 히트맵 (labels: 행/열 이름, 값이 없는 칸은 빈 칸)
+def heatmap_figure(matrix, labels, zmin=None, zmax=None, colorscale="RdBu", hovertemplate=None, **layout):
+    labels = np.asarray(labels, dtype=object).astype(str)
+    fig = go.Figure(go.Heatmap(
+        z=np.round(np.asarray(matrix, dtype=np.float64), 3),
+        x=labels,
+        y=labels,
+        zmin=zmin,
+        zmax=zmax,
+        zmid=0 if zmin is not None and zmax is not None and zmin < 0 < zmax else None,
+        colorscale=colorscale,
+        hovertemplate=hovertemplate
+    ))
+    fig.update_layout(yaxis_autorange="reversed", **layout)
+    return fig
+
+
+# 브라우저로 전송되는 figure JSON 크기 (바이트, st.plotly_chart와 같은 직렬화)
+def payload_bytes(fig):
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
@@ -0,0 +1,282 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from realestate import storage
+
+# 아파트×평형대 시계열 간 동조화 (월간 로그 수익률의 상관계수/베타 행렬)
+# - 수익률: 연속한 두 달 모두 거래가 있는 월의 평균가 로그 차이 (거래 없는 달은 빈 값)
+# - 시계열 쌍마다 겹치는 월의 합(건수, Σx, Σx², Σxy)을 행렬 곱 한 번씩으로 계산해 두고 상관계수/베타는 합에서 바로 계산
+# - 새 월이 들어오면 그 월의 수익률 벡터 외적만 더함 (시계열² × 새 월 수, 전체 재계산 없음)
+# - 이전 월 데이터가 바뀌었으면 (큐브 누적 배열의 시계열별 거래월 수/평균가 합이 다르면) 처음부터 다시 계산
+
+COMOVEMENT_DIR = os.path.join(storage.DATA_DIR, "comovement")
+VERSION_NAME = "_version.json"
+
+# 추적하는 최대 시계열 수 (수익률 월 수가 많은 순, 행렬 4개 × 시계열² × 8바이트)
+MAX_SERIES = 1000
+
+# 상관계수/베타를 계산하는 최소 겹치는 월 수
+MIN_OVERLAP = 6
+
+# 히트맵에 표시하는 최대 시계열 수 (수익률 월 수가 많은 순)
+HEATMAP_SERIES = 60
+
+SUM_NAMES = ["count", "sx", "sxx", "sxy"]
+CHECK_NAMES = ["observed", "price_sum", "total"]
+
+
+# 큐브 시계열별 로그 평균가 (아파트×평형대 × start 위치 이후 월, 거래 없는 칸은 NaN)
+def log_prices(cube, start=0):
+    n_months = len(cube.months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prices = np.log(cube.mid.reshape(-1, n_months)[:, start:].astype(np.float64))
+    prices[~np.isfinite(prices)] = np.nan
+    return prices
+
+
+# 이전 월 변경 검사용 값 (end 위치 월까지 추적 시계열별 거래월 수/평균가 합, 전체 시계열 합계)
+# - 큐브의 월 누적 배열에서 바로 읽음 (시계열 수에 비례, 과거 수익률을 다시 계산하지 않음)
+def _checks(cube, codes, end):
+    observed = cube.observed_cumsum[..., end + 1].reshape(-1)
+    price_sum = cube.mid_cumsum[..., end + 1].reshape(-1)
+    return {
+        "observed": observed[codes].astype(np.int64),
+        "price_sum": price_sum[codes],
+        "total": np.array([observed.sum(), price_sum.sum()], dtype=np.float64),
+    }
+
+
+# 수익률 행렬(시계열 × 월, NaN 포함) → 시계열 쌍별 겹치는 월의 합
+# - count[i, j]: 둘 다 수익률이 있는 월 수, sx[i, j]: 그 월들의 x_i 합, sxx[i, j]: x_i² 합, sxy[i, j]: x_i·x_j 합
+def pair_sums(returns):
+    observed = ~np.isnan(returns)
+    weights = observed.astype(np.float64)
+    values = np.where(observed, returns, 0.0)
+    return {
+        "count": weights @ weights.T,
+        "sx": values @ weights.T,
+        "sxx": (values * values) @ weights.T,
+        "sxy": values @ values.T,
+    }
+
+
+# 시계열 쌍별 수익률 합 (상관계수/베타 행렬의 누적 상태)
+# - series: (아파트, 평형대) MultiIndex, last_month: 마지막으로 반영한 월 키
+# - last_log: 시계열별 마지막 월의 로그 평균가 (다음 월 수익률 계산용, 거래가 없었으면 NaN)
+# - checks: 마지막 월까지의 변경 검사용 값 (_checks)
+class ReturnSums:
+    def __init__(self, series, first_month, last_month, last_log, sums, checks):
+        self.series = series
+        self.first_month = first_month
+        self.last_month = last_month
+        self.last_log = last_log
+        self.count = sums["count"]
+        self.sx = sums["sx"]
+        self.sxx = sums["sxx"]
+        self.sxy = sums["sxy"]
+        self.checks = checks
+
+    def sums(self):
+        return {name: getattr(self, name) for name in SUM_NAMES}
+
+    # 새 월 하나 반영 (prices: 추적 시계열 순서의 로그 평균가, 수익률이 없는 시계열은 0을 더함)
+    # - 바뀌는 칸은 수익률이 있는 시계열끼리의 블록뿐: 그 시계열이 절반 이하이면 블록만, 아니면 전체 외적으로 갱신
+    def add_month(self, month, prices):
+        returns = prices - self.last_log
+        observed = ~np.isnan(returns)
+        positions = np.flatnonzero(observed)
+        if 0 < len(positions) <= len(returns) // 2:
+            block = np.ix_(positions, positions)
+            x = returns[positions]
+            self.count[block] += 1
+            self.sx[block] += x[:, None]
+            self.sxx[block] += (x * x)[:, None]
+            self.sxy[block] += np.outer(x, x)
+        elif len(positions):
+            weights = observed.astype(np.float64)
+            x = np.where(observed, returns, 0.0)
+            self.count += np.outer(weights, weights)
+            self.sx += np.outer(x, weights)
+            self.sxx += np.outer(x * x, weights)
+            self.sxy += np.outer(x, x)
+        self.last_log = prices
+        self.last_month = int(month)
+
+    # 큐브에 새로 생긴 월만 제자리에서 반영하고 self 반환 (이전 월 데이터가 바뀌었거나 추적 시계열이 없어졌으면 None)
+    # - 이전 월 검증은 큐브 누적 배열의 시계열별 값만 비교하고, 로그 평균가는 마지막 반영 월부터만 계산
+    def update(self, cube, max_series=MAX_SERIES):
+        if not len(cube.months) or int(cube.months[0]) != self.first_month or int(cube.months[-1]) < self.last_month:
+            return None
+
+        codes = _series_codes(cube, self.series)
+        if (codes < 0).any():
+            return None
+
+        end = self.last_month - self.first_month
+        checks = _checks(cube, codes, end)
+        if not (
+            np.array_equal(checks["observed"], self.checks["observed"])
+            and np.allclose(checks["price_sum"], self.checks["price_sum"], rtol=1e-9, atol=1e-9)
+            and np.allclose(checks["total"], self.checks["total"], rtol=1e-9, atol=1e-9)
+        ):
+            return None
+
+        # 마지막 반영 월(첫 열)부터의 로그 평균가
+        prices = log_prices(cube, end)
+
+        # 이전 월이 그대로이면 추적하지 않는 시계열은 MAX_SERIES에서 빠졌거나 이전 수익률이 없는 시계열
+        # - 자리가 있는 만큼 마지막 반영 월 이후 거래가 있는 시계열을 0으로 채워 추가
+        untracked = np.ones(len(prices), dtype=bool)
+        untracked[codes] = False
+        added = np.flatnonzero(untracked & (~np.isnan(prices)).any(axis=1))[:max(max_series - len(codes), 0)]
+        if len(added):
+            grow = ((0, len(added)), (0, len(added)))
+            for name in SUM_NAMES:
+                setattr(self, name, np.pad(getattr(self, name), grow))
+            codes = np.concatenate([codes, added])
+            self.series = _series_index(cube, codes)
+            self.last_log = np.concatenate([self.last_log, prices[added, 0]])
+
+        for pos in range(1, prices.shape[1]):
+            self.add_month(cube.months[end + pos], prices[codes, pos])
+        self.checks = _checks(cube, codes, len(cube.months) - 1)
+        return self
+
+
+# 큐브 시계열 위치 → (아파트, 평형대) MultiIndex
+def _series_index(cube, codes):
+    apt_codes, size_codes = np.divmod(codes, len(cube.sizes))
+    return pd.MultiIndex.from_arrays([cube.apartments[apt_codes], cube.sizes[size_codes]], names=["아파트", "평형대"])
+
+
+# (아파트, 평형대) MultiIndex → 큐브 시계열 위치 (큐브에 없으면 -1)
+def _series_codes(cube, series):
+    apt_codes = cube.apartments.get_indexer(series.get_level_values(0))
+    size_codes = cube.sizes.get_indexer(series.get_level_values(1))
+    return np.where((apt_codes >= 0) & (size_codes >= 0), apt_codes * len(cube.sizes) + size_codes, -1)
+
+
+# 큐브 전체에서 누적 합 생성 (수익률 월 수가 많은 시계열 max_series개, 큐브 순서 유지)
+def build(cube, max_series=MAX_SERIES):
+    prices = log_prices(cube)
+    returns = np.diff(prices, axis=1)
+    observed = (~np.isnan(returns)).sum(axis=1)
+
+    ranked = np.argsort(-observed, kind="stable")
+    codes = np.sort(ranked[observed[ranked] > 0][:max_series])
+
+    first = int(cube.months[0]) if len(cube.months) else 0
+    last = int(cube.months[-1]) if len(cube.months) else 0
+    last_log = prices[codes, -1] if len(cube.months) else np.full(len(codes), np.nan)
+    checks = _checks(cube, codes, len(cube.months) - 1)
+    return ReturnSums(_series_index(cube, codes), first, last, last_log, pair_sums(returns[codes]), checks)
+
+
+# 선택된 아파트/평형대의 추적 시계열 위치 (수익률 월 수가 많은 순 limit개, 원래 순서 유지)
+def select(sums, apartments=None, sizes=None, limit=HEATMAP_SERIES):
+    selected = np.ones(len(sums.series), dtype=bool)
+    if apartments is not None:
+        selected &= sums.series.get_level_values(0).isin(list(apartments))
+    if sizes is not None:
+        selected &= sums.series.get_level_values(1).isin(list(sizes))
+
+    positions = np.flatnonzero(selected)
+    observed = np.diagonal(sums.count)[positions]
+    ranked = np.argsort(-observed, kind="stable")
+    return np.sort(positions[ranked[observed[ranked] >= MIN_OVERLAP][:limit]])
+
+
+# 위치 목록의 상관계수 행렬과 베타 행렬 (겹치는 월이 min_overlap 미만이면 NaN)
+# - beta[i, j]: 시계열 i 수익률을 시계열 j 수익률로 회귀한 기울기
+def matrices(sums, positions, min_overlap=MIN_OVERLAP):
+    grid = np.ix_(positions, positions)
+    n = sums.count[grid]
+    sx = sums.sx[grid]
+    sxx = sums.sxx[grid]
+    sxy = sums.sxy[grid]
+
+    covariance = n * sxy - sx * sx.T
+    var_x = n * sxx - sx * sx
+    var_y = var_x.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = covariance / np.sqrt(var_x * var_y)
+        beta = covariance / var_y
+    invalid = (n < min_overlap) | (var_x <= 0) | (var_y <= 0)
+    corr[invalid] = np.nan
+    beta[invalid] = np.nan
+    return np.clip(corr, -1, 1), beta
+
+
+# 상관계수 행렬의 군집 순서 (거리 1 - 상관계수의 평균 연결 병합, 값이 없는 쌍은 상관 0으로 봄)
+def cluster_order(corr):
+    n = len(corr)
+    if n <= 2:
+        return np.arange(n)
+
+    distance = 1 - np.nan_to_num(corr, nan=0.0)
+    np.fill_diagonal(distance, np.inf)
+    sizes = np.ones(n)
+    members = [[i] for i in range(n)]
+
+    for _ in range(n - 1):
+        i, j = np.unravel_index(np.argmin(distance), distance.shape)
+        merged = (sizes[i] * distance[i] + sizes[j] * distance[j]) / (sizes[i] + sizes[j])
+        distance[i, :] = merged
+        distance[:, i] = merged
+        distance[i, i] = np.inf
+        distance[j, :] = np.inf
+        distance[:, j] = np.inf
+        sizes[i] += sizes[j]
+        members[i] = members[i] + members[j]
+        members[j] = []
+    return np.array(max(members, key=len))
+
+
+# 누적 합 저장 (시계열 목록, 합 행렬, 버전 파일은 마지막에 교체)
+def save_sums(sums, version, comovement_dir=COMOVEMENT_DIR):
+    if not os.path.exists(comovement_dir):
+        os.makedirs(comovement_dir)
+
+    sums.series.to_frame(index=False).to_parquet(os.path.join(comovement_dir, "series.parquet"), index=False)
+    np.savez(os.path.join(comovement_dir, "sums.npz"), last_log=sums.last_log, **sums.sums(), **sums.checks)
+
+    path = os.path.join(comovement_dir, VERSION_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": version, "first_month": sums.first_month, "last_month": sums.last_month}, f)
+    os.replace(path + ".tmp", path)
+
+
+# 저장된 누적 합과 그 데이터 버전 (없거나 변경 검사용 값이 없는 이전 형식이면 (None, None))
+def load_sums(comovement_dir=COMOVEMENT_DIR):
+    path = os.path.join(comovement_dir, VERSION_NAME)
+    if not os.path.exists(path):
+        return None, None
+
+    with open(path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+
+    series = pd.MultiIndex.from_frame(pd.read_parquet(os.path.join(comovement_dir, "series.parquet")))
+    arrays = np.load(os.path.join(comovement_dir, "sums.npz"))
+    if not all(name in arrays for name in CHECK_NAMES):
+        return None, None
+    sums = ReturnSums(
+        series, saved["first_month"], saved["last_month"], arrays["last_log"],
+        {name: arrays[name] for name in SUM_NAMES}, {name: arrays[name] for name in CHECK_NAMES},
+    )
+    return sums, saved["version"]
+
+
+# 데이터 버전의 누적 합 (같은 버전이면 저장된 합, 새 월만 생겼으면 그 월만 반영, 그 외에는 새로 계산)
+def load(cube, version, comovement_dir=COMOVEMENT_DIR):
+    sums, saved = load_sums(comovement_dir)
+    if sums is not None and saved == version:
+        return sums
+
+    updated = sums.update(cube) if sums is not None else None
+    sums = updated if updated is not None else build(cube)
+    if version is not None:
+        save_sums(sums, version, comovement_dir)
+    return sums
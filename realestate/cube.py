@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+from realestate.storage import DATE_COLUMN, PRICE_COLUMNS, VOLUME_COLUMN
+
+
+# 정렬된 구간들(start, end)의 행 위치를 하나의 배열로 이어붙임
+def _expand_ranges(starts, ends):
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total, dtype=np.int64)
+
+
+# (아파트, 평형대, 날짜) 사전 인덱스 데이터 큐브
+# - data: (아파트, 평형대, 날짜) 순으로 정렬된 거래 데이터
+# - 아파트×평형대 별 행 구간(start, end)으로 필터를 인덱스 슬라이스로 처리
+# - 아파트×평형대×월 dense 배열로 특정 시점 가격을 O(1) 조회
+class PriceCube:
+    def __init__(self, data):
+        apt = data["아파트"].astype("category")
+        size = data["평형대"].astype("category")
+
+        apt_codes = apt.cat.codes.to_numpy(dtype=np.int64)
+        size_codes = size.cat.codes.to_numpy(dtype=np.int64)
+        months = data[DATE_COLUMN].to_numpy(dtype=np.int64)
+
+        # 아파트/평형대 값이 없는 행은 제외
+        valid = (apt_codes >= 0) & (size_codes >= 0)
+        order = np.lexsort((months, size_codes, apt_codes))
+        order = order[valid[order]]
+
+        self.apartments = apt.cat.categories
+        self.sizes = size.cat.categories
+        self.data = data.iloc[order].reset_index(drop=True)
+
+        n_apts = len(self.apartments)
+        n_sizes = len(self.sizes)
+        apt_codes = apt_codes[order]
+        size_codes = size_codes[order]
+        months = months[order]
+
+        # 아파트×평형대 별 행 구간
+        counts = np.bincount(apt_codes * n_sizes + size_codes, minlength=n_apts * n_sizes)
+        ends = np.cumsum(counts)
+        self._starts = (ends - counts).reshape(n_apts, n_sizes)
+        self._ends = ends.reshape(n_apts, n_sizes)
+
+        # 월 축 (최초 월 ~ 최종 월, 연속)
+        if len(months):
+            first_month = int(months.min())
+            n_months = int(months.max()) - first_month + 1
+        else:
+            first_month, n_months = 0, 0
+        self.months = np.arange(first_month, first_month + n_months, dtype=np.int32)
+
+        # 가격 큐브 (거래가 없는 칸은 NaN, 같은 칸에 여러 행이 있으면 마지막 값)
+        month_pos = months - first_month
+        self.values = {}
+        for col in PRICE_COLUMNS:
+            cube = np.full((n_apts, n_sizes, n_months), np.nan, dtype=np.float32)
+            cube[apt_codes, size_codes, month_pos] = self.data[col].to_numpy(dtype=np.float32)
+            self.values[col] = cube
+
+        # 평균가 = (최저가 + 최고가) / 2
+        self.mid = (self.values["최저가(억)"] + self.values["최고가(억)"]) / 2
+
+        # 월 구간 조회용 누적 배열 (아파트×평형대×(월+1), 앞에 0) → 임의 기간 평균가/거래월 수를 시계열당 뺄셈 한 번으로 계산
+        observed = ~np.isnan(self.mid)
+        zeros = np.zeros((n_apts, n_sizes, 1))
+        self.mid_cumsum = np.concatenate([zeros, np.cumsum(np.where(observed, self.mid, 0), axis=-1, dtype=np.float64)], axis=-1)
+        self.observed_cumsum = np.concatenate([zeros.astype(np.int32), np.cumsum(observed, axis=-1, dtype=np.int32)], axis=-1)
+
+        # 월마다 그 월 이전(포함) 마지막 거래월 위치(없으면 -1), 그 월 이후(포함) 첫 거래월 위치(없으면 월 수)
+        positions = np.arange(n_months, dtype=np.int32)
+        self.previous_observed = np.maximum.accumulate(np.where(observed, positions, -1), axis=-1)
+        self.next_observed = np.minimum.accumulate(np.where(observed, positions, n_months)[..., ::-1], axis=-1)[..., ::-1].copy()
+
+        # 월별 누적 거래 건수 (아파트×평형대×(월+1), 앞에 0) → 임의 기간 건수를 시계열당 뺄셈 한 번으로 계산
+        # - 거래 건수 컬럼이 없거나 모두 비어 있으면 None
+        self.volume_cumsum = None
+        if VOLUME_COLUMN in self.data.columns and self.data[VOLUME_COLUMN].notna().any():
+            volume = np.zeros((n_apts, n_sizes, n_months + 1), dtype=np.int32)
+            volume[apt_codes, size_codes, month_pos + 1] = np.nan_to_num(self.data[VOLUME_COLUMN].to_numpy(dtype=np.float32)).astype(np.int32)
+            self.volume_cumsum = np.cumsum(volume, axis=-1, dtype=np.int32)
+
+    # 이름 목록을 코드 배열로 변환 (None이면 전체, 없는 이름은 무시)
+    @staticmethod
+    def _codes(index, names):
+        if names is None:
+            return np.arange(len(index))
+        codes = index.get_indexer(list(names))
+        return codes[codes >= 0]
+
+    def apartment_codes(self, apartments=None):
+        return self._codes(self.apartments, apartments)
+
+    def size_codes(self, sizes=None):
+        return self._codes(self.sizes, sizes)
+
+    def apartment_code(self, apartment):
+        return self.apartments.get_loc(apartment)
+
+    def size_code(self, size):
+        return self.sizes.get_loc(size)
+
+    # 월 키의 큐브 위치 (범위 밖이거나 값이 없으면 None)
+    def month_position(self, month):
+        if month is None or pd.isna(month) or not len(self.months):
+            return None
+        pos = int(month) - int(self.months[0])
+        if 0 <= pos < len(self.months):
+            return pos
+        return None
+
+    # 거래 건수를 아는 데이터인지 여부
+    @property
+    def has_volume(self):
+        return self.volume_cumsum is not None
+
+    # start~end 월 키(포함)를 큐브 위치 [lo, hi)로 변환 (데이터 기간으로 자름, 겹치지 않으면 lo == hi)
+    def position_range(self, start=None, end=None):
+        n_months = len(self.months)
+        if not n_months:
+            return 0, 0
+        first = int(self.months[0])
+        lo = 0 if start is None else min(max(int(start) - first, 0), n_months)
+        hi = n_months if end is None else min(max(int(end) - first + 1, 0), n_months)
+        return lo, max(hi, lo)
+
+    # start~end 월(포함) 시계열별 평균가의 평균과 거래월 수 (선택 아파트 × 선택 평형대 배열, 거래가 없으면 NaN/0)
+    def range_mean(self, start=None, end=None, apartments=None, sizes=None):
+        lo, hi = self.position_range(start, end)
+        grid = np.ix_(self.apartment_codes(apartments), self.size_codes(sizes))
+        total = self.mid_cumsum[..., hi][grid] - self.mid_cumsum[..., lo][grid]
+        months = self.observed_cumsum[..., hi][grid] - self.observed_cumsum[..., lo][grid]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(months > 0, total / months, np.nan), months
+
+    # start~end 월(포함) 시계열별 첫/마지막 거래월 위치 (선택 아파트 × 선택 평형대 배열, 구간에 거래가 없으면 -1)
+    def range_endpoints(self, start=None, end=None, apartments=None, sizes=None):
+        lo, hi = self.position_range(start, end)
+        apt_codes = self.apartment_codes(apartments)
+        size_codes = self.size_codes(sizes)
+        if lo == hi:
+            empty = np.full((len(apt_codes), len(size_codes)), -1, dtype=np.int64)
+            return empty, empty.copy()
+
+        grid = np.ix_(apt_codes, size_codes)
+        first = self.next_observed[..., lo][grid].astype(np.int64)
+        last = self.previous_observed[..., hi - 1][grid].astype(np.int64)
+        found = (first < hi) & (last >= lo)
+        return np.where(found, first, -1), np.where(found, last, -1)
+
+    # start~end 월(포함) 거래 건수 합 (선택 아파트 × 선택 평형대 배열, 범위는 데이터 기간으로 자름, None이면 처음/끝까지)
+    def volume_window(self, start=None, end=None, apartments=None, sizes=None):
+        apt_codes = self.apartment_codes(apartments)
+        size_codes = self.size_codes(sizes)
+        if not self.has_volume or not len(self.months):
+            return np.zeros((len(apt_codes), len(size_codes)), dtype=np.int64)
+
+        lo, hi = self.position_range(start, end)
+        grid = np.ix_(apt_codes, size_codes)
+        return self.volume_cumsum[..., hi][grid].astype(np.int64) - self.volume_cumsum[..., lo][grid]
+
+    # 월마다 직전 window개월(해당 월 포함) 거래 건수 합 (선택 아파트 × 선택 평형대 × 월, 앞쪽은 있는 만큼)
+    def rolling_volume(self, window, apartments=None, sizes=None):
+        apt_codes = self.apartment_codes(apartments)
+        size_codes = self.size_codes(sizes)
+        if not self.has_volume:
+            return np.zeros((len(apt_codes), len(size_codes), len(self.months)), dtype=np.int64)
+
+        cumulative = self.volume_cumsum[np.ix_(apt_codes, size_codes)].astype(np.int64)
+        starts = np.maximum(np.arange(1, len(self.months) + 1) - int(window), 0)
+        return cumulative[..., 1:] - cumulative[..., starts]
+
+    # 선택된 아파트/평형대 행만 인덱스 구간으로 추출 (columns가 주어지면 해당 컬럼만)
+    def select(self, apartments=None, sizes=None, columns=None):
+        apt_codes = self.apartment_codes(apartments)
+        size_codes = self.size_codes(sizes)
+
+        grid = np.ix_(apt_codes, size_codes)
+        rows = _expand_ranges(self._starts[grid].ravel(), self._ends[grid].ravel())
+        data = self.data if columns is None else self.data[columns]
+        return data.iloc[rows]
+
+    # 아파트×평형대 한 개 시계열 (날짜순 연속 구간)
+    def series(self, apartment, size):
+        a = self.apartment_code(apartment)
+        s = self.size_code(size)
+        return self.data.iloc[self._starts[a, s]:self._ends[a, s]]
+
+    # 특정 월의 (최저가, 최고가), 거래가 없으면 None
+    def cell(self, apartment, size, month):
+        pos = self.month_position(month)
+        if pos is None or apartment not in self.apartments or size not in self.sizes:
+            return None
+
+        a = self.apartment_code(apartment)
+        s = self.size_code(size)
+        low = self.values["최저가(억)"][a, s, pos]
+        high = self.values["최고가(억)"][a, s, pos]
+        if np.isnan(low) or np.isnan(high):
+            return None
+        return float(low), float(high)
+
+    # 특정 월의 아파트×평형대별 (최저가, 최고가) 표 (거래가 없는 칸 제외, 아파트/평형대 순)
+    def cross_section(self, apartments=None, sizes=None, month=None):
+        apt_codes = self.apartment_codes(apartments)
+        size_codes = self.size_codes(sizes)
+        pos = self.month_position(month)
+        if pos is None:
+            apt_codes, size_codes, pos = apt_codes[:0], size_codes[:0], 0
+
+        grid = np.ix_(apt_codes, size_codes)
+        low = self.values["최저가(억)"][..., pos][grid].ravel()
+        high = self.values["최고가(억)"][..., pos][grid].ravel()
+        a, s = (codes.ravel() for codes in np.meshgrid(apt_codes, size_codes, indexing="ij"))
+        found = ~(np.isnan(low) | np.isnan(high))
+
+        return pd.DataFrame({
+            "아파트": self.apartments[a[found]],
+            "평형대": self.sizes[s[found]],
+            "최저가(억)": low[found],
+            "최고가(억)": high[found],
+        })
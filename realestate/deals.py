@@ -0,0 +1,132 @@
+import os
+
+import pandas as pd
+
+from realestate import ingest, sketch, storage
+
+# 개별 거래 저장소 (월별 파티션) 와 월별 분위수 스케치 저장소
+DEALS_DIR = os.path.join(storage.DATA_DIR, "deals")
+SKETCH_DIR = os.path.join(storage.DATA_DIR, "sketches")
+
+# 같은 거래 행이 몇 번째로 나왔는지 (임시 컬럼)
+_OCCURRENCE = "_occurrence"
+
+# 층 필드 추가 이전 파티션에는 없는 컬럼 (없으면 NaN으로 읽음)
+FLOOR_COLUMN = "층"
+
+
+def _write_partition(store_dir, manifest, month, frame):
+    name = ingest.partition_name(month)
+    frame.to_parquet(ingest.partition_path(store_dir, name), index=False)
+    manifest["partitions"][name] = {"month": int(month), "hash": ingest.frame_hash(frame), "rows": len(frame)}
+    return name
+
+
+# 행 전체 값의 해시 (카테고리는 코드가 아닌 값 기준)
+def _row_keys(frame):
+    return pd.util.hash_pandas_object(frame, index=False)
+
+
+# 행마다 같은 값의 행 중 몇 번째인지 (0부터)
+# - offsets: 이전 배치에서 이미 나온 키별 건수 (해시 → 건수)
+def _occurrence(frame, offsets=None):
+    keys = _row_keys(frame)
+    occurrence = keys.groupby(keys, sort=False).cumcount()
+    if offsets is not None:
+        occurrence += keys.map(offsets).fillna(0).astype(occurrence.dtype)
+    return occurrence.to_numpy()
+
+
+# 층이 없는 기존 거래를 층 외 컬럼이 같은 새 거래 수만큼 제거 (새 거래가 층을 채워 대체)
+# - 층 필드 추가 이전에 저장된 파티션을 다시 가져올 때 같은 거래가 두 번 저장되지 않도록 함
+def _drop_floorless(existing, incoming):
+    floorless = existing[existing[FLOOR_COLUMN].isna()]
+    incoming = incoming[incoming[FLOOR_COLUMN].notna()]
+    if floorless.empty or incoming.empty:
+        return existing
+
+    columns = [col for col in existing.columns if col != FLOOR_COLUMN]
+    counts = _row_keys(incoming[columns]).value_counts()
+    keys = _row_keys(floorless[columns])
+    replaced = keys.groupby(keys, sort=False).cumcount() < keys.map(counts).fillna(0)
+    return existing.drop(index=floorless.index[replaced.to_numpy()])
+
+
+# 개별 거래를 월별 파티션에 추가하고, 거래가 추가된 월의 스케치만 다시 계산
+# - deals: molit.normalize_deals 형식 (계약일, 날짜, 아파트, 법정동, 전용면적(㎡), 층, 평형대, 거래금액(억))
+# - 거래 키는 계약일과 층을 포함한 전체 컬럼이며, 같은 키의 거래는 기존 파티션과 이번 가져오기 중 건수가 많은 쪽만큼 저장
+#   (같은 덤프를 다시 가져와도 늘지 않고, 한 덤프 안에서 키가 같은 여러 거래는 그대로 유지)
+# - seen: 한 가져오기를 여러 배치로 나눠 기록할 때 넘기는 dict (월 → 키별 누적 건수, 호출마다 갱신)
+#   배치가 달라도 같은 가져오기의 같은 키 거래는 건수가 합산됨
+# - 층이 없는 기존 거래(층 필드 이전 파티션)는 층 외 컬럼이 같은 새 거래로 대체
+def append_deals(deals, deals_dir=DEALS_DIR, sketch_dir=SKETCH_DIR, seen=None):
+    for directory in (deals_dir, sketch_dir):
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    deal_manifest = ingest.load_manifest(deals_dir)
+    sketch_manifest = ingest.load_manifest(sketch_dir)
+    changed = []
+
+    for month, group in deals.groupby(storage.DATE_COLUMN, sort=True):
+        name = ingest.partition_name(month)
+        path = ingest.partition_path(deals_dir, name)
+
+        columns = list(group.columns)
+        offsets = seen.get(month) if seen is not None else None
+        if seen is not None:
+            counts = _row_keys(group).value_counts()
+            seen[month] = counts if offsets is None else offsets.add(counts, fill_value=0)
+
+        group = group.assign(**{_OCCURRENCE: _occurrence(group, offsets)})
+        if name in deal_manifest["partitions"] and os.path.exists(path):
+            # 해시가 같도록 카테고리 외 컬럼은 새 거래의 타입으로 맞춤 (없는 층은 NaN)
+            dtypes = {col: dtype for col, dtype in deals.dtypes.items() if not isinstance(dtype, pd.CategoricalDtype)}
+            existing = pd.read_parquet(path).reindex(columns=columns).astype(dtypes)
+            existing = _drop_floorless(existing, group[columns])
+            group = storage.concat_frames([existing.assign(**{_OCCURRENCE: _occurrence(existing)}), group])
+
+        merged = group.drop_duplicates().drop(columns=_OCCURRENCE).reset_index(drop=True)
+        for col in storage.CATEGORY_COLUMNS:
+            merged[col] = merged[col].astype("category").cat.remove_unused_categories()
+
+        # 행 수가 같아도 층이 채워질 수 있으므로 내용 해시로 비교
+        digest = ingest.frame_hash(merged)
+        if deal_manifest["partitions"].get(name, {}).get("hash") == digest:
+            continue
+
+        _write_partition(deals_dir, deal_manifest, month, merged)
+        _write_partition(sketch_dir, sketch_manifest, month, sketch.build_sketch(merged))
+        changed.append(name)
+
+    for directory, manifest in ((deals_dir, deal_manifest), (sketch_dir, sketch_manifest)):
+        manifest["version"] = ingest.store_version(manifest["partitions"])
+        ingest.save_manifest(directory, manifest)
+
+    return changed
+
+
+# 월별 스케치 로드 (start/end 월 키 범위의 파티션만 읽기)
+def read_sketches(sketch_dir=SKETCH_DIR, start=None, end=None):
+    manifest = ingest.load_manifest(sketch_dir)
+    frames = [
+        pd.read_parquet(ingest.partition_path(sketch_dir, name))
+        for name, info in sorted(manifest["partitions"].items())
+        if (start is None or info["month"] >= start) and (end is None or info["month"] <= end)
+    ]
+    if not frames:
+        return pd.DataFrame(columns=sketch.SKETCH_COLUMNS)
+    return storage.concat_frames(frames)
+
+
+# 개별 거래 로드 (start/end 월 키 범위의 파티션만 읽기)
+def read_deals(deals_dir=DEALS_DIR, start=None, end=None, columns=None):
+    manifest = ingest.load_manifest(deals_dir)
+    frames = [
+        pd.read_parquet(ingest.partition_path(deals_dir, name), columns=columns)
+        for name, info in sorted(manifest["partitions"].items())
+        if (start is None or info["month"] >= start) and (end is None or info["month"] <= end)
+    ]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return storage.concat_frames(frames)
@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from realestate import aggregates, analytics, ingest, storage
+
+# 아파트×평형대 시계열별 단기 가격 예측 (감쇠 추세 지수평활, 로그 평균가 기준)
+# - 모든 시계열을 (시계열 × 파라미터 후보) 배열로 묶어 월 단위로 한 번에 갱신 (시계열별 반복 없음)
+# - 후보 중 1개월 앞 예측 오차 제곱합이 가장 작은 파라미터를 시계열별로 선택
+# - 거래가 없는 월은 갱신 없이 예측값으로 상태를 이어감
+# - 적합 결과(파라미터/마지막 상태)는 데이터 버전별로 저장하여 재사용
+
+FORECAST_DIR = os.path.join(storage.DATA_DIR, "forecast")
+PARAMS_NAME = "params.parquet"
+VERSION_NAME = "_version.json"
+
+# 화면에 표시하는 예측 기간 (개월)
+HORIZONS = (3, 6, 12)
+MAX_HORIZON = max(HORIZONS)
+
+# 파라미터 후보 (level 평활, trend 평활, 추세 감쇠)
+ALPHAS = (0.2, 0.4, 0.6, 0.8)
+BETAS = (0.05, 0.15, 0.3)
+PHIS = (0.8, 0.9, 0.98)
+
+# 적합에 필요한 최소 거래월 수, 마지막 거래 이후 예측하지 않는 경과 월 수
+MIN_OBSERVATIONS = 6
+STALE_MONTHS = 12
+
+# 예측 구간 (80%)
+INTERVAL = 0.8
+INTERVAL_Z = 1.2816
+
+# 작업 하나에 묶는 시계열 수
+CHUNK_SERIES = 2000
+
+# 저장하는 적합 결과 컬럼
+PARAM_COLUMNS = ["아파트", "평형대", "alpha", "beta", "phi", "level", "trend", "sigma", "observations", "최근 평균가(억)", "기준월"]
+
+FORECAST_COLUMN = "예측(억)"
+LOWER_COLUMN = "하한(억)"
+UPPER_COLUMN = "상한(억)"
+
+
+def _candidates():
+    alpha, beta, phi = np.meshgrid(ALPHAS, BETAS, PHIS, indexing="ij")
+    return alpha.ravel(), beta.ravel(), phi.ravel()
+
+
+# 시계열 묶음 적합 (log_prices: 시계열 × 월, 거래 없는 월은 NaN)
+# - 반환: 시계열별 선택 파라미터, 마지막 월의 level/trend, 1개월 앞 예측 오차 표준편차, 거래월 수, 마지막 거래 위치
+def fit_block(log_prices):
+    n_series, n_months = log_prices.shape
+    alpha, beta, phi = _candidates()
+    shape = (n_series, len(alpha))
+
+    level = np.full(shape, np.nan)
+    trend = np.zeros(shape)
+    sse = np.zeros(shape)
+    errors = np.zeros(n_series)
+
+    for t in range(n_months):
+        y = log_prices[:, t][:, None]
+        observed = ~np.isnan(y)
+        started = ~np.isnan(level)
+
+        prediction = level + phi * trend
+        error = np.where(observed & started, y - prediction, 0.0)
+        sse += error * error
+        errors += (observed & started)[:, 0]
+
+        # 거래가 있으면 오차로 갱신, 없으면 예측값으로 이어감, 첫 거래월이면 초기화
+        level = np.where(started, prediction + alpha * error, np.where(observed, y, np.nan))
+        trend = np.where(started, phi * trend + alpha * beta * error, 0.0)
+
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(n_series)
+    observations = (~np.isnan(log_prices)).sum(axis=1)
+    positions = np.where(~np.isnan(log_prices), np.arange(n_months), -1).max(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = np.sqrt(sse[rows, best] / np.maximum(errors - 1, 1))
+    last_price = np.take_along_axis(log_prices, np.maximum(positions, 0)[:, None], axis=1)[:, 0]
+
+    return {
+        "alpha": alpha[best],
+        "beta": beta[best],
+        "phi": phi[best],
+        "level": level[rows, best],
+        "trend": trend[rows, best],
+        "sigma": sigma,
+        "observations": observations,
+        "last_position": positions,
+        "last_log_price": last_price,
+    }
+
+
+# 큐브의 모든 아파트×평형대 시계열 적합
+# - workers > 1이면 CHUNK_SERIES개씩 나누어 프로세스 풀에서 적합 (시계열이 수천 개 이상일 때)
+def fit(cube, workers=1, chunk=CHUNK_SERIES):
+    n_apts, n_sizes, n_months = cube.mid.shape
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_prices = np.log(cube.mid.reshape(-1, n_months).astype(np.float64))
+    log_prices[~np.isfinite(log_prices)] = np.nan
+
+    if not len(log_prices) or not n_months:
+        return pd.DataFrame(columns=PARAM_COLUMNS)
+
+    blocks = [log_prices[i:i + chunk] for i in range(0, len(log_prices), chunk)]
+    if workers and workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(blocks))) as pool:
+            results = list(pool.map(fit_block, blocks))
+    else:
+        results = [fit_block(block) for block in blocks]
+
+    apt_codes, size_codes = np.divmod(np.arange(n_apts * n_sizes), n_sizes)
+    params = pd.DataFrame({
+        "아파트": cube.apartments[apt_codes],
+        "평형대": cube.sizes[size_codes],
+        **{key: np.concatenate([result[key] for result in results]) for key in results[0]},
+    })
+
+    # 거래월이 충분하고 최근까지 거래가 있는 시계열만
+    recent = params["last_position"] >= n_months - STALE_MONTHS
+    params = params[(params["observations"] >= MIN_OBSERVATIONS) & recent].reset_index(drop=True)
+    params["최근 평균가(억)"] = np.exp(params.pop("last_log_price"))
+    params["기준월"] = int(cube.months[-1])
+    return params[PARAM_COLUMNS]
+
+
+# 적합 결과 → h = 1..horizon개월 예측 (긴 형식, 예측 구간 포함)
+# - 감쇠 추세: level + trend × (φ + φ² + ... + φ^h)
+# - 예측 분산: σ² × (1 + Σ_{j<h} c_j²), c_j = α(1 + βφ(1 - φ^j)/(1 - φ))
+def predict(params, horizon=MAX_HORIZON):
+    if params.empty:
+        return pd.DataFrame(columns=["아파트", "평형대", storage.DATE_COLUMN, "개월", FORECAST_COLUMN, LOWER_COLUMN, UPPER_COLUMN])
+
+    h = np.arange(1, horizon + 1)
+    alpha = params["alpha"].to_numpy()[:, None]
+    beta = params["beta"].to_numpy()[:, None]
+    phi = params["phi"].to_numpy()[:, None]
+
+    damped = np.cumsum(phi ** h, axis=1)
+    mean = params["level"].to_numpy()[:, None] + params["trend"].to_numpy()[:, None] * damped
+
+    c = alpha * (1 + beta * phi * (1 - phi ** h) / (1 - phi))
+    variance = 1 + np.concatenate([np.zeros((len(params), 1)), np.cumsum(c[:, :-1] ** 2, axis=1)], axis=1)
+    spread = INTERVAL_Z * params["sigma"].to_numpy()[:, None] * np.sqrt(variance)
+
+    n = len(params)
+    return pd.DataFrame({
+        "아파트": np.repeat(params["아파트"].to_numpy(), horizon),
+        "평형대": np.repeat(params["평형대"].to_numpy(), horizon),
+        storage.DATE_COLUMN: (np.repeat(params["기준월"].to_numpy(), horizon) + np.tile(h, n)).astype(np.int32),
+        "개월": np.tile(h, n),
+        FORECAST_COLUMN: np.exp(mean).ravel(),
+        LOWER_COLUMN: np.exp(mean - spread).ravel(),
+        UPPER_COLUMN: np.exp(mean + spread).ravel(),
+    })
+
+
+# 선택된 시계열의 기간별 예상 변동률 (최근 평균가 대비, 시계열 평균)
+def outlook(params, forecasts, apartments=None, sizes=None, horizons=HORIZONS):
+    selected = forecasts[forecasts["개월"].isin(horizons)]
+    if apartments is not None:
+        selected = selected[selected["아파트"].isin(apartments)]
+    if sizes is not None:
+        selected = selected[selected["평형대"].isin(sizes)]
+
+    selected = selected.merge(params[["아파트", "평형대", "최근 평균가(억)"]], on=["아파트", "평형대"])
+    base = selected["최근 평균가(억)"]
+    changes = pd.DataFrame({
+        "개월": selected["개월"],
+        "예상 변동률(%)": (selected[FORECAST_COLUMN] / base - 1) * 100,
+        "하한(%)": (selected[LOWER_COLUMN] / base - 1) * 100,
+        "상한(%)": (selected[UPPER_COLUMN] / base - 1) * 100,
+    })
+    summary = changes.groupby("개월").mean()
+    summary["시계열 수"] = changes.groupby("개월").size()
+    return summary.reindex(list(horizons)).reset_index()
+
+
+# 적합 결과 저장 (버전 파일은 마지막에 교체)
+def save_params(params, version, forecast_dir=FORECAST_DIR):
+    if not os.path.exists(forecast_dir):
+        os.makedirs(forecast_dir)
+
+    params.to_parquet(os.path.join(forecast_dir, PARAMS_NAME), index=False)
+
+    path = os.path.join(forecast_dir, VERSION_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": version}, f)
+    os.replace(path + ".tmp", path)
+
+
+# 저장된 적합 결과 (데이터 버전이 같을 때만, 아니면 None)
+def load_params(version, forecast_dir=FORECAST_DIR):
+    path = os.path.join(forecast_dir, VERSION_NAME)
+    if version is None or not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        if json.load(f).get("version") != version:
+            return None
+    return pd.read_parquet(os.path.join(forecast_dir, PARAMS_NAME))
+
+
+# 데이터 버전의 적합 결과 (저장된 결과가 없거나 오래되었으면 적합 후 저장)
+def load(cube, version, forecast_dir=FORECAST_DIR, workers=1):
+    params = load_params(version, forecast_dir)
+    if params is None:
+        params = fit(cube, workers)
+        if version is not None:
+            save_params(params, version, forecast_dir)
+    return params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="아파트×평형대 시계열 가격 예측 모델 일괄 적합")
+    parser.add_argument("--store", default=ingest.STORE_DIR)
+    parser.add_argument("--aggregates", default=aggregates.AGGREGATE_DIR)
+    parser.add_argument("--output", default=FORECAST_DIR, help="적합 결과 저장 디렉토리")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    version = ingest.load_manifest(args.store)["version"]
+    cube, _ = analytics.load(args.store, args.aggregates)
+    params = fit(cube, args.workers or os.cpu_count() or 1)
+    save_params(params, version, args.output)
+    print(f"시계열 {len(params):,}개 적합, {time.perf_counter() - start:.2f}초 (버전 {str(version)[:12]})")
+
+
+if __name__ == "__main__":
+    main()
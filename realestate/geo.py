@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# 아파트 위치 검색 (반경, 구/동) — 외부 서비스 없이 아파트 정보의 좌표만 사용
+# - 좌표를 기준 위도에서 평면(km)으로 펴서 CELL_KM 크기 격자에 나눠 담음
+# - 반경 검색은 원이 걸치는 격자 칸의 단지만 실제 거리(haversine)로 확인
+# - 구/동 검색은 생성 시 만든 이름 목록을 그대로 반환
+
+# 격자 칸 크기 (km, 자주 쓰는 반경 1km 안팎)
+CELL_KM = 0.5
+
+EARTH_RADIUS_KM = 6371.0088
+
+# 위도 1도의 거리 (km)
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+
+# 두 좌표(배열 가능) 사이 거리 (km)
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _empty():
+    return pd.DataFrame({"아파트": pd.Series(dtype=object), "거리(km)": pd.Series(dtype=np.float64)})
+
+
+# 아파트 위치 인덱스
+# - info: metadata.info_table 결과 (구, 동, 위도, 경도), 좌표가 없는 단지는 반경 검색에서 제외
+class GeoIndex:
+    def __init__(self, info, cell_km=CELL_KM):
+        located = info[info["위도"].notna() & info["경도"].notna()]
+        self.names = located.index.to_numpy(dtype=object)
+        self.lat = located["위도"].to_numpy(dtype=np.float64)
+        self.lon = located["경도"].to_numpy(dtype=np.float64)
+        self.cell_km = cell_km
+
+        # 평면 좌표 (경도 방향 거리는 단지들의 평균 위도 기준)
+        self.origin_lat = float(self.lat.mean()) if len(self.lat) else 0.0
+        self.km_per_lon = KM_PER_DEGREE * np.cos(np.radians(self.origin_lat))
+        self.positions = pd.Index(self.names)
+
+        # 격자 칸 → 단지 위치 배열
+        cx, cy = self._cells(self.lat, self.lon)
+        cells = {}
+        for pos, key in enumerate(zip(cx.tolist(), cy.tolist())):
+            cells.setdefault(key, []).append(pos)
+        self.cells = {key: np.array(rows) for key, rows in cells.items()}
+
+        # 구 → 단지, (구, 동) → 단지 (좌표가 없어도 주소가 있으면 포함)
+        self.districts = {}
+        for name, gu, dong in zip(info.index, info["구"], info["동"]):
+            if pd.isna(gu):
+                continue
+            self.districts.setdefault((gu, None), []).append(name)
+            if not pd.isna(dong):
+                self.districts.setdefault((gu, dong), []).append(name)
+
+    def _cells(self, lat, lon):
+        x = np.asarray(lon, dtype=np.float64) * self.km_per_lon
+        y = np.asarray(lat, dtype=np.float64) * KM_PER_DEGREE
+        return np.floor(x / self.cell_km).astype(np.int64), np.floor(y / self.cell_km).astype(np.int64)
+
+    # 좌표에서 반경 radius_km 안의 단지 (가까운 순, 아파트/거리(km))
+    def within(self, lat, lon, radius_km):
+        cx, cy = self._cells(lat, lon)
+        # 경도 방향은 평균 위도 기준이므로 격자 한 칸 여유를 둠
+        reach = int(np.ceil(radius_km / self.cell_km)) + 1
+        candidates = [
+            self.cells[key]
+            for key in ((int(cx) + dx, int(cy) + dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1))
+            if key in self.cells
+        ]
+        if not candidates:
+            return _empty()
+
+        rows = np.concatenate(candidates)
+        distance = haversine_km(lat, lon, self.lat[rows], self.lon[rows])
+        inside = distance <= radius_km
+        rows, distance = rows[inside], distance[inside]
+        order = np.argsort(distance, kind="stable")
+        return pd.DataFrame({"아파트": self.names[rows[order]], "거리(km)": distance[order]})
+
+    # 좌표를 아는 단지인지 여부
+    def has_location(self, apartment):
+        return apartment in self.positions
+
+    # 단지에서 반경 radius_km 안의 다른 단지 (좌표가 없는 단지면 빈 결과)
+    def near(self, apartment, radius_km):
+        if apartment not in self.positions:
+            return _empty()
+
+        pos = self.positions.get_loc(apartment)
+        result = self.within(self.lat[pos], self.lon[pos], radius_km)
+        return result[result["아파트"] != apartment].reset_index(drop=True)
+
+    # 구(와 동)에 속한 단지 이름 목록
+    def in_district(self, gu, dong=None):
+        return list(self.districts.get((gu, dong), []))
+
+    # 단지가 있는 (구, 동) 목록
+    def district_names(self):
+        return sorted(key for key in self.districts if key[1] is not None)
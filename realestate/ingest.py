@@ -0,0 +1,329 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from realestate import aggregates, rolling, storage
+
+# 월별 파티션 저장소 (data/store/YYYY-MM.parquet + _manifest.json)
+STORE_DIR = os.path.join(storage.DATA_DIR, "store")
+MANIFEST_NAME = "_manifest.json"
+
+# 같은 키의 행은 나중에 들어온 값으로 대체 (merge_rows에 combine 함수를 주면 그 함수로 합침)
+KEY_COLUMNS = [storage.DATE_COLUMN] + storage.CATEGORY_COLUMNS
+
+# 원본별 요약 (data/store/sources/<원본>/, 원본마다 같은 월별 파티션 저장소 형식)
+# - 저장소 파티션은 원본별 행을 combine_rows로 합친 결과이므로, 한 원본을 다시 기록해도 다른 원본의 행은 유지
+# - 원본을 나누기 전에 만들어진 저장소의 행은 LEGACY_SOURCE로 옮기고, 다른 원본에 같은 키가 있으면 그 원본의 행을 사용
+SOURCES_DIR = "sources"
+CSV_SOURCE = "csv"
+LEGACY_SOURCE = "legacy"
+
+# 추가(append) 여부 확인에 사용하는 이전 파일 끝부분 크기
+_TAIL_BYTES = 4096
+
+
+def _empty_manifest():
+    return {"version": None, "source": {}, "partitions": {}}
+
+
+# 저장소 매니페스트 로드
+def load_manifest(store_dir=STORE_DIR):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return _empty_manifest()
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 저장소 매니페스트 저장 (임시 파일에 쓴 뒤 교체)
+def save_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, path)
+
+
+# DataFrame 내용 해시 (행 순서 포함)
+def frame_hash(data):
+    hashed = pd.util.hash_pandas_object(data, index=False)
+    return hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()
+
+
+# 저장소 버전 = 파티션 해시들의 해시
+def store_version(partitions):
+    digest = hashlib.sha1()
+    for name in sorted(partitions):
+        digest.update(f"{name}:{partitions[name]['hash']};".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# 월 키의 파티션 파일 이름 (YYYY-MM.parquet)
+def partition_name(month):
+    return f"{storage.month_key_to_label(month)}.parquet"
+
+
+def partition_path(store_dir, name):
+    return os.path.join(store_dir, name)
+
+
+# 파티션 파일 이름의 월 키 (partition_name의 역변환)
+def partition_month(name):
+    return int(storage.to_month_key([name[:7]])[0])
+
+
+# 파티션 경로와 해시 목록 (월 순)
+def partitions(store_dir=STORE_DIR, manifest=None):
+    manifest = manifest or load_manifest(store_dir)
+    return [
+        (partition_path(store_dir, name), info["hash"])
+        for name, info in sorted(manifest["partitions"].items())
+    ]
+
+
+# 같은 키(월, 아파트, 평형대)의 행을 하나로 합침
+# - 최저가는 최솟값, 최고가는 최댓값, 거래 건수는 합계 (건수를 모르는 행이 섞이면 NaN)
+def combine_rows(rows):
+    keys = [rows[col] for col in KEY_COLUMNS]
+    grouped = rows.groupby(keys, observed=True, sort=False)
+    combined = grouped.agg({"최저가(억)": "min", "최고가(억)": "max"})
+    if storage.VOLUME_COLUMN in rows.columns:
+        volume = grouped[storage.VOLUME_COLUMN].sum()
+        unknown = rows[storage.VOLUME_COLUMN].isna().groupby(keys, observed=True, sort=False).any()
+        combined[storage.VOLUME_COLUMN] = volume.mask(unknown)
+    return combined.reset_index()[list(rows.columns)]
+
+
+# 새 행을 월별 파티션에 병합하고 내용이 바뀐 파티션만 다시 기록
+# - required: 필수 컬럼 (매매 요약 외 테이블, 예: 전월세 요약)
+# - replace=True이면 rows에 있는 월의 파티션을 기존 행 없이 rows로 다시 기록 (원본 전체 재동기화)
+# - remove: 삭제할 파티션 이름 목록 (삭제된 파티션도 반환 목록에 포함)
+# - combine: 같은 키의 기존 행과 새 행을 하나로 합치는 함수 (예: combine_rows, 없으면 새 행으로 대체)
+def merge_rows(rows, store_dir=STORE_DIR, manifest=None, required=storage.REQUIRED_COLUMNS, replace=False, remove=(), combine=None):
+    if not os.path.exists(store_dir):
+        os.makedirs(store_dir)
+
+    manifest = manifest if manifest is not None else load_manifest(store_dir)
+    rows = storage.normalize_frame(rows, required)
+    changed = []
+
+    for name in sorted(remove):
+        if manifest["partitions"].pop(name, None) is not None:
+            changed.append(name)
+        path = partition_path(store_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    for month, group in rows.groupby(storage.DATE_COLUMN, sort=True):
+        name = partition_name(month)
+        path = partition_path(store_dir, name)
+
+        if not replace and name in manifest["partitions"] and os.path.exists(path):
+            group = storage.concat_frames([storage.read_store(path), group])
+
+        merged = combine(group) if combine is not None else group.drop_duplicates(KEY_COLUMNS, keep="last")
+        merged = (
+            merged.sort_values(storage.CATEGORY_COLUMNS, kind="stable")
+            .reset_index(drop=True)
+        )
+        for col in storage.CATEGORY_COLUMNS:
+            merged[col] = merged[col].cat.remove_unused_categories()
+
+        partition_hash = frame_hash(merged)
+        if manifest["partitions"].get(name, {}).get("hash") == partition_hash:
+            continue
+
+        merged.to_parquet(path, index=False)
+        manifest["partitions"][name] = {"month": int(month), "hash": partition_hash, "rows": len(merged)}
+        changed.append(name)
+
+    manifest["version"] = store_version(manifest["partitions"])
+    save_manifest(store_dir, manifest)
+    return changed
+
+
+# 원본별 파티션 저장소 경로
+def source_dir(store_dir, source):
+    return os.path.join(store_dir, SOURCES_DIR, source)
+
+
+# 원본을 나누기 전의 저장소이면 기존 파티션을 LEGACY_SOURCE 원본으로 복사
+def _split_legacy(store_dir):
+    manifest = load_manifest(store_dir)
+    if not manifest["partitions"] or os.path.exists(os.path.join(store_dir, SOURCES_DIR)):
+        return
+
+    legacy_dir = source_dir(store_dir, LEGACY_SOURCE)
+    os.makedirs(legacy_dir)
+    for name in manifest["partitions"]:
+        shutil.copyfile(partition_path(store_dir, name), partition_path(legacy_dir, name))
+    save_manifest(legacy_dir, {**_empty_manifest(), "version": manifest["version"], "partitions": manifest["partitions"]})
+
+
+# names 월의 저장소 파티션을 원본별 파티션을 합쳐 다시 기록 (어느 원본에도 없는 월은 삭제)
+def combine_sources(names, store_dir=STORE_DIR, manifest=None):
+    root = os.path.join(store_dir, SOURCES_DIR)
+    frames = {}
+    for source in sorted(os.listdir(root)) if os.path.exists(root) else []:
+        directory = source_dir(store_dir, source)
+        stored = load_manifest(directory)["partitions"]
+        frames[source] = storage.concat_frames([
+            storage.read_store(partition_path(directory, name)) for name in names if name in stored
+        ])
+
+    legacy = frames.pop(LEGACY_SOURCE, None)
+    rows = storage.concat_frames(list(frames.values()))
+    if legacy is not None and len(legacy):
+        # 다른 원본에 같은 키가 있는 이전 행은 제외 (원본을 나누기 전에는 같은 키를 새 행으로 대체)
+        replaced = pd.MultiIndex.from_frame(legacy[KEY_COLUMNS]).isin(pd.MultiIndex.from_frame(rows[KEY_COLUMNS]))
+        rows = storage.concat_frames([rows, legacy[~replaced]])
+
+    present = {partition_name(month) for month in rows[storage.DATE_COLUMN].unique()}
+    return merge_rows(rows, store_dir, manifest, replace=True, remove=set(names) - present, combine=combine_rows)
+
+
+# 원본 source의 행을 원본별 저장소에 병합하고 (옵션은 merge_rows와 같음), 바뀐 월의 저장소 파티션을 다시 합침
+# - 반환값은 내용이 바뀐 저장소 파티션 이름 목록
+def merge_source(rows, source, store_dir=STORE_DIR, manifest=None, replace=False, remove=(), combine=None):
+    _split_legacy(store_dir)
+    changed = merge_rows(rows, source_dir(store_dir, source), replace=replace, remove=remove, combine=combine)
+    return combine_sources(changed, store_dir, manifest)
+
+
+# 파일 offset 직전 끝부분 해시
+def _tail_hash(path, offset):
+    with open(path, "rb") as f:
+        f.seek(max(0, offset - _TAIL_BYTES))
+        return hashlib.sha1(f.read(offset - max(0, offset - _TAIL_BYTES))).hexdigest()
+
+
+# offset 이후에 추가된 행만 읽기 (헤더는 파일 첫 줄 사용)
+def _read_appended(path, offset):
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(offset)
+        appended = f.read()
+
+    if not appended.strip():
+        return pd.DataFrame(columns=storage.REQUIRED_COLUMNS)
+    return pd.read_csv(io.BytesIO(header + appended))
+
+
+# 이전 동기화 이후 파일 뒤에만 행이 추가되었는지 확인
+def _is_append(path, source, size):
+    offset = source.get("size", 0)
+    if not 0 < offset < size or source.get("tail_hash") != _tail_hash(path, offset):
+        return False
+
+    # 이전 마지막 줄이 줄바꿈으로 끝나야 새 행이 온전한 줄로 시작
+    with open(path, "rb") as f:
+        f.seek(offset - 1)
+        return f.read(1) == b"\n"
+
+
+# 집계 테이블을 저장소 버전에 맞게 갱신
+# - previous_version: 변경 전 저장소 버전, 저장된 집계가 이 버전이면 changed 월 파티션만 다시 읽어 반영
+# - changed에 있지만 저장소에 없는 파티션(삭제된 월)은 집계에서 제외
+# - 그 외에는 저장소 전체로 다시 계산
+def refresh_aggregates(store_dir=STORE_DIR, changed=None, previous_version=None, aggregate_dir=aggregates.AGGREGATE_DIR):
+    manifest = load_manifest(store_dir)
+    tables = None
+    if changed is not None and previous_version is not None:
+        tables = aggregates.load_tables(previous_version, aggregate_dir)
+
+    since = None
+    if tables is None:
+        data = read_partitioned(store_dir, columns=storage.STORE_COLUMNS)
+    else:
+        # 바뀌지 않은 월의 행은 이동 통계까지 그대로 두고, 가장 이른 변경 월부터 다시 계산
+        months = [partition_month(name) for name in changed]
+        monthly = tables["monthly"]
+        kept = monthly.loc[~monthly[storage.DATE_COLUMN].isin(months), storage.STORE_COLUMNS + rolling.COLUMNS]
+        data = storage.concat_frames([kept] + [
+            storage.read_store(partition_path(store_dir, name)) for name in changed if name in manifest["partitions"]
+        ])
+        since = min(months) if months else None
+
+    tables = aggregates.build_tables(data, since)
+    aggregates.save_tables(tables, manifest["version"], aggregate_dir)
+    return tables
+
+
+# CSV 변경분을 저장소에 반영
+# - 파일 크기/수정 시각이 같으면 아무것도 읽지 않음
+# - 뒤에 행만 추가된 경우 추가된 부분만 읽어 병합
+# - 그 외에는 전체를 읽어 CSV 원본의 월 파티션을 CSV 내용으로 다시 기록 (내용 해시가 바뀐 월만)
+#   CSV 원본에 있었지만 지금은 CSV에 없는 월은 CSV 원본에서 삭제 (다른 원본의 행은 그대로)
+# - 집계 테이블이 저장소 버전과 다르면 바뀐 월만 반영하여 갱신
+def sync_csv(csv_path=storage.CSV_PATH, store_dir=STORE_DIR, aggregate_dir=aggregates.AGGREGATE_DIR):
+    start = time.perf_counter()
+    manifest = load_manifest(store_dir)
+    previous_version = manifest["version"]
+    stat = os.stat(csv_path)
+    source = manifest.get("source", {})
+
+    if (
+        manifest["version"] is not None
+        and source.get("size") == stat.st_size
+        and source.get("mtime") == stat.st_mtime_ns
+    ):
+        mode, rows, changed = "unchanged", [], []
+    else:
+        if _is_append(csv_path, source, stat.st_size):
+            mode = "append"
+            rows = storage.normalize_frame(_read_appended(csv_path, source["size"]))
+            remove = set()
+        else:
+            mode = "full"
+            rows = storage.read_csv(csv_path)
+            months = {partition_name(month) for month in rows[storage.DATE_COLUMN].unique()}
+            remove = set(load_manifest(source_dir(store_dir, CSV_SOURCE))["partitions"]) - months
+
+        manifest["source"] = {
+            "path": csv_path,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "tail_hash": _tail_hash(csv_path, stat.st_size),
+        }
+        changed = merge_source(rows, CSV_SOURCE, store_dir, manifest, replace=mode == "full", remove=remove)
+
+    if aggregates.saved_version(aggregate_dir) != manifest["version"]:
+        refresh_aggregates(store_dir, changed, previous_version, aggregate_dir)
+
+    return {
+        "mode": mode,
+        "rows": len(rows),
+        "changed": changed,
+        "version": manifest["version"],
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# 저장소 전체 로드 (columns로 필요한 컬럼만 읽기)
+def read_partitioned(store_dir=STORE_DIR, columns=None):
+    return storage.concat_frames([storage.read_store(path, columns=columns) for path, _ in partitions(store_dir)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV 변경분을 월별 파티션 저장소에 반영")
+    parser.add_argument("--csv", default=storage.CSV_PATH)
+    parser.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args(argv)
+
+    result = sync_csv(args.csv, args.store)
+    print(
+        f"{result['mode']}: {result['rows']:,}행 읽음, "
+        f"파티션 {len(result['changed'])}개 갱신, {result['seconds']:.2f}초 "
+        f"(버전 {result['version'][:12]})"
+    )
+
+
+if __name__ == "__main__":
+    main()
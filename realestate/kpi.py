@@ -0,0 +1,149 @@
+import numpy as np
+
+from realestate import analytics, metadata
+from realestate.changes import price_changes
+from realestate.rentals import RATIO_COLUMN
+from realestate.sketch import COUNT_COLUMN
+from realestate.storage import DATE_COLUMN
+
+# 상승률/최고가 비교 기간 (개월), 직전 같은 길이 기간과 비교
+PERIOD_MONTHS = 6
+
+
+# 비교 기간 (시작 월, 끝 월), 양끝 포함 period개월 (offset=0: 최근 기간, 1: 직전 기간)
+def _window(end, period, offset=0):
+    last = end - offset * period
+    return last - period + 1, last
+
+
+# 기간 내 시계열별 첫 거래월 → 마지막 거래월 변동률 (평균, 최대 상승 시계열, 평당 가격 변동률)
+# - 평당 가격은 단지 면적 범위 기준 대표 평수로 계산 (metadata.representative_pyeong)
+def _period_changes(cube, info, start, end):
+    changes = price_changes(cube, start=start, end=end, per_series=True)
+    if changes.empty:
+        return None, None, None
+
+    # 평당 가격 변동률 = 대표 평수를 아는 시계열의 평당 가격 합계 변동률
+    pyeong = metadata.representative_pyeong(info, changes["아파트"], changes["평형대"])
+    known = ~np.isnan(pyeong)
+    pyeong_change = None
+    if known.any():
+        first = (changes["첫 평균가(억)"].to_numpy()[known] / pyeong[known]).sum()
+        last = (changes["최신 평균가(억)"].to_numpy()[known] / pyeong[known]).sum()
+        pyeong_change = float((last - first) / first * 100)
+
+    return float(changes["변동률(%)"].mean()), changes.iloc[0], pyeong_change
+
+
+# 기간 내 최고가 (값, 아파트, 평형대), 기간이 데이터 기간과 겹치지 않거나 거래가 없으면 None
+def _period_max(cube, start, end):
+    lo, hi = cube.position_range(start, end)
+    high = cube.values["최고가(억)"][..., lo:hi]
+    if high.size == 0 or np.isnan(high).all():
+        return None
+
+    a, s, _ = np.unravel_index(np.nanargmax(high), high.shape)
+    return float(np.nanmax(high)), cube.apartments[a], cube.sizes[s]
+
+
+# 월별 거래 건수 / 세대수 (%), 세대수를 아는 아파트 기준
+# - 큐브에 거래 건수가 있으면 누적 건수로 계산 (analytics.turnover), 없으면 개별 거래 스케치의 건수 사용
+# - 데이터 기간 밖의 월이면 None
+def _turnover(cube, info, sketches, households, month):
+    if households.empty or households.sum() <= 0 or cube.month_position(month) is None:
+        return None
+
+    if cube.has_volume:
+        rates = analytics.turnover(cube, info, window=1, end=month)
+        volume = rates.loc[rates["세대수"] > 0, "거래 건수"].sum()
+    elif sketches is not None and not sketches.empty:
+        known = sketches[sketches["아파트"].isin(households.index) & (sketches[DATE_COLUMN] == month)]
+        volume = known[COUNT_COLUMN].sum()
+    else:
+        return None
+    return float(volume / households.sum() * 100)
+
+
+# 기간 내 (양끝 포함) 평균 전세가율 (전월세 실거래 as-of 조인 결과 기준), 없으면 None
+def _period_ratio(ratios, start, end):
+    months = ratios[DATE_COLUMN]
+    selected = ratios.loc[(months >= start) & (months <= end), RATIO_COLUMN]
+    return float(selected.mean()) if len(selected) else None
+
+
+# 개요/시장 분석 주요 지표 (데이터 버전별로 한 번 계산)
+# - cube: 가격 큐브, info: metadata.info_table 결과, sketches: 월별 분위수 스케치 (거래 건수)
+# - ratios: 시계열×월별 전세가율 (rentals.jeonse_ratios 결과, 없으면 아파트 정보의 가격 범위로 계산)
+# - *_prev: 직전 기간 값 (없으면 None)
+def compute(cube, info, sketches=None, ratios=None, period=PERIOD_MONTHS):
+    kpis = {
+        "period_months": period,
+        "apartments": cube.apartments.tolist(),
+        "end": None,
+    }
+    if not len(cube.months):
+        return kpis
+
+    end = int(cube.months[-1])
+    kpis["end"] = end
+
+    # 비교 기간 (최근 period개월 / 직전 period개월, 모든 지표가 같은 기간 사용)
+    current = _window(end, period)
+    previous = _window(end, period, offset=1)
+
+    # 가격 상승률 (최근 기간 / 직전 기간)
+    avg_change, top_change, pyeong_change = _period_changes(cube, info, *current)
+    avg_change_prev, _, pyeong_change_prev = _period_changes(cube, info, *previous)
+    kpis.update({
+        "avg_change": avg_change,
+        "avg_change_prev": avg_change_prev,
+        "top_change": None if top_change is None else top_change.to_dict(),
+        "pyeong_change": pyeong_change,
+        "pyeong_change_prev": pyeong_change_prev,
+    })
+
+    # 최고가 거래
+    max_price = _period_max(cube, *current)
+    max_price_prev = _period_max(cube, *previous)
+    kpis.update({
+        "max_price": None if max_price is None else max_price[0],
+        "max_price_apartment": None if max_price is None else max_price[1],
+        "max_price_size": None if max_price is None else max_price[2],
+        "max_price_prev": None if max_price_prev is None else max_price_prev[0],
+    })
+
+    # 세대수 (조사 대상 아파트 중 정보가 있는 아파트 합계)
+    apartment_info = info.reindex(cube.apartments)
+    households = apartment_info["세대수"].dropna()
+    kpis.update({
+        "households": int(households.sum()),
+        "households_complete": len(households) == len(apartment_info),
+    })
+
+    # 전세가율 (전월세 실거래가 있으면 최근 기간 평균, 없으면 아파트 정보의 매매가/전세가 범위 중간값 기준)
+    if ratios is not None and not ratios.empty:
+        kpis["jeonse_ratio"] = _period_ratio(ratios, *current)
+        kpis["jeonse_ratio_prev"] = _period_ratio(ratios, *previous)
+        kpis["jeonse_ratio_source"] = "rentals"
+    else:
+        sale = (apartment_info["매매가 하한(억)"] + apartment_info["매매가 상한(억)"]) / 2
+        jeonse = (apartment_info["전세가 하한(억)"] + apartment_info["전세가 상한(억)"]) / 2
+        ratio = (jeonse / sale * 100).dropna()
+        kpis["jeonse_ratio"] = float(ratio.mean()) if len(ratio) else None
+        kpis["jeonse_ratio_prev"] = None
+        kpis["jeonse_ratio_source"] = "info"
+
+    # 회전율 (최근 월 / 직전 월)
+    kpis["turnover"] = _turnover(cube, info, sketches, households, end)
+    kpis["turnover_prev"] = _turnover(cube, info, sketches, households, end - 1)
+
+    return kpis
+
+
+# 지표 변화량 (둘 중 하나라도 없으면 None)
+def delta(kpis, name):
+    current = kpis.get(name)
+    previous = kpis.get(f"{name}_prev")
+    if current is None or previous is None:
+        return None
+    return current - previous
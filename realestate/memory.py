@@ -0,0 +1,93 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+# 현재 프로세스 상주 메모리(RSS) 바이트 (알 수 없으면 None)
+def process_rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    # /proc 이 없는 환경은 최대 RSS로 대체 (macOS는 바이트, Linux는 KB 단위, resource 모듈이 없는 Windows는 None)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# 객체가 참조하는 DataFrame/배열 메모리 합계 (같은 객체는 한 번만 계산)
+def deep_nbytes(obj, _seen=None):
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, pd.Index):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_nbytes(v, seen) for v in obj.values())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(deep_nbytes(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return deep_nbytes(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+# 객체가 참조하는 numpy 배열을 읽기 전용으로 설정 (세션 간 공유 데이터 보호)
+def freeze(obj, _seen=None):
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return obj
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            freeze(value, seen)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            freeze(value, seen)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        freeze(vars(obj), seen)
+    return obj
+
+
+# 바이트 → 사람이 읽기 쉬운 단위 문자열
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:,.1f}{unit}"
+        size /= 1024
+    return f"{size:,.1f}GB"
+
+
+# 메모리 보고서
+# - shared: 모든 세션이 공유하는 객체 (데이터 큐브 등)
+# - sessions: 활성 세션 수 (모르면 None)
+# - 세션당 오버헤드는 (RSS - 공유 데이터) / 세션 수 로 추정한 상한값 (RSS를 모르면 None)
+def memory_report(shared, sessions=None):
+    shared_bytes = deep_nbytes(shared)
+    rss_bytes = process_rss_bytes()
+    report = {
+        "shared_bytes": shared_bytes,
+        "rss_bytes": rss_bytes,
+        "sessions": sessions,
+        "per_session_bytes": None,
+    }
+    if sessions and rss_bytes is not None:
+        report["per_session_bytes"] = max(rss_bytes - shared_bytes, 0) / sessions
+    return report
@@ -0,0 +1,137 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from realestate import storage, units
+
+# 아파트 정보 파일 (앱이 처음 실행될 때 기본 정보로 생성)
+INFO_PATH = os.path.join(storage.DATA_DIR, "apartment_info.json")
+
+# 문자열 안의 숫자 ("1,788세대", "11.8억 ~ 80억" 등)
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+# 문자열의 숫자 목록 (쉼표 제거), 숫자가 없으면 빈 목록
+def parse_numbers(text):
+    return [float(match.replace(",", "")) for match in _NUMBER.findall(str(text))]
+
+
+# 첫 번째 숫자, 없으면 NaN ("정보 제한적" 등)
+def parse_number(text):
+    numbers = parse_numbers(text)
+    return numbers[0] if numbers else np.nan
+
+
+# 범위 문자열 → (하한, 상한), 숫자가 하나면 (값, 값), 없으면 (NaN, NaN)
+def parse_range(text):
+    numbers = parse_numbers(text)
+    if not numbers:
+        return np.nan, np.nan
+    return min(numbers), max(numbers)
+
+
+# 날짜 문자열 ("2011.11.30", "2011-11-30") → Timestamp, 인식할 수 없으면 NaT
+def parse_date(text):
+    numbers = re.findall(r"\d+", str(text))
+    if len(numbers) < 3:
+        return pd.NaT
+    return pd.to_datetime("-".join(numbers[:3]), format="%Y-%m-%d", errors="coerce")
+
+
+# 주소 문자열 ("부산광역시 해운대구 우동 1407") → (구, 동), 없으면 None
+# - 구: '구/군'으로 끝나는 첫 단어, 동: 그 뒤 '동/읍/면'으로 끝나는 첫 단어
+def parse_district(text):
+    gu = dong = None
+    for word in str(text or "").split():
+        if gu is None and word[-1:] in ("구", "군") and len(word) > 1:
+            gu = word
+        elif gu is not None and word[-1:] in ("동", "읍", "면") and len(word) > 1:
+            dong = word
+            break
+    return gu, dong
+
+
+# 아파트 정보 파일 로드 (없으면 빈 dict → 평당 가격 등은 평형대 대표 평수 기준)
+def read_info(path=INFO_PATH):
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+INFO_COLUMNS = [
+    "세대수", "동수", "사용승인일",
+    "최소 면적(㎡)", "최대 면적(㎡)",
+    "매매가 하한(억)", "매매가 상한(억)", "전세가 하한(억)", "전세가 상한(억)",
+    "구", "동", "위도", "경도",
+]
+
+
+# 아파트 정보(dict, 자유 형식 문자열) → 아파트별 타입 지정 컬럼 테이블 (인덱스: 아파트)
+# - 로드 시 한 번만 변환하고, 이후 계산은 이 테이블로 벡터 연산
+def info_table(apartment_info):
+    rows = []
+    for name, info in apartment_info.items():
+        area_low, area_high = parse_range(info.get("면적", ""))
+        sale_low, sale_high = parse_range(info.get("매매가", ""))
+        jeonse_low, jeonse_high = parse_range(info.get("전세가", ""))
+        gu, dong = parse_district(info.get("주소", ""))
+        rows.append({
+            "아파트": name,
+            "세대수": parse_number(info.get("세대수", "")),
+            "동수": parse_number(info.get("동수", "")),
+            "사용승인일": parse_date(info.get("사용승인일", "")),
+            "최소 면적(㎡)": area_low,
+            "최대 면적(㎡)": area_high,
+            "매매가 하한(억)": sale_low,
+            "매매가 상한(억)": sale_high,
+            "전세가 하한(억)": jeonse_low,
+            "전세가 상한(억)": jeonse_high,
+            "구": gu,
+            "동": dong,
+            "위도": parse_number(info.get("위도", "")),
+            "경도": parse_number(info.get("경도", "")),
+        })
+
+    table = pd.DataFrame(rows, columns=["아파트"] + INFO_COLUMNS).set_index("아파트")
+    return table.astype({
+        "세대수": "Int64",
+        "동수": "Int64",
+        "사용승인일": "datetime64[ns]",
+        "최소 면적(㎡)": np.float64,
+        "최대 면적(㎡)": np.float64,
+        "매매가 하한(억)": np.float64,
+        "매매가 상한(억)": np.float64,
+        "전세가 하한(억)": np.float64,
+        "전세가 상한(억)": np.float64,
+        "구": "category",
+        "동": "category",
+        "위도": np.float64,
+        "경도": np.float64,
+    })
+
+
+# (아파트, 평형대) 행별 대표 평수
+# - 단지 면적 범위(공급면적)와 평형대 구간이 겹치는 부분의 중간값
+# - 면적 정보가 없거나 겹치지 않으면 평형대 대표 평수 (units.BAND_PYEONG)
+def representative_pyeong(info, apartments, bands):
+    area = info.reindex(pd.Series(apartments, copy=False).astype(str))
+    low = units.m2_to_pyeong(area["최소 면적(㎡)"])
+    high = units.m2_to_pyeong(area["최대 면적(㎡)"])
+
+    band_codes = pd.Categorical(pd.Series(bands, copy=False).astype(str), categories=units.SIZE_BANDS).codes
+    edges = np.append(np.asarray(units.SIZE_BAND_EDGES, dtype=np.float64), np.nan)
+    band_low = edges[np.where(band_codes >= 0, band_codes, -1)]
+    band_high = edges[np.where(band_codes >= 0, band_codes + 1, -1)]
+
+    # 면적/평형대 정보가 없으면 NaN이 전파되어 대표 평수로 대체됨
+    overlap_low = np.maximum(low, band_low)
+    overlap_high = np.minimum(high, band_high)
+
+    with np.errstate(invalid="ignore"):
+        pyeong = np.where(overlap_low <= overlap_high, (overlap_low + overlap_high) / 2, np.nan)
+    return np.where(np.isnan(pyeong), units.band_pyeong(bands), pyeong)
@@ -0,0 +1,358 @@
+import argparse
+import os
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from realestate import deals as deal_store
+from realestate import anomaly, ingest, storage, units
+
+# 한 번에 처리하는 거래 행 수 (메모리 상한)
+CHUNK_ROWS = 100_000
+
+# 개별 거래 저장 시 모아서 기록하는 행 수 (월 파티션 재기록 횟수 제한)
+DEAL_FLUSH_ROWS = 1_000_000
+
+# 국토교통부 아파트 매매 실거래가 필드명 (XML 국문/영문 태그, 실거래가 공개시스템 CSV 헤더)
+FIELD_ALIASES = {
+    "아파트": ["아파트", "aptNm", "단지명"],
+    "거래금액": ["거래금액", "dealAmount", "거래금액(만원)"],
+    "전용면적": ["전용면적", "excluUseAr", "전용면적(㎡)"],
+    "계약년월": ["계약년월"],
+    "년": ["년", "dealYear"],
+    "월": ["월", "dealMonth"],
+    "일": ["일", "dealDay", "계약일"],
+    "법정동": ["법정동", "umdNm"],
+    "층": ["층", "floor"],
+    "해제여부": ["해제여부", "cdealType", "해제사유발생일"],
+}
+
+# 정규화된 개별 거래 컬럼
+DEAL_COLUMNS = ["계약일", "날짜", "아파트", "법정동", "전용면적(㎡)", "층", "평형대", "거래금액(억)"]
+
+ROLLUP_KEYS = [storage.DATE_COLUMN, "아파트", "평형대"]
+
+# 저장소의 원본 이름 (CSV 등 다른 원본의 요약과 따로 기록한 뒤 combine_rows로 합침)
+# - SOURCE: 개별 거래 없이 가져온 요약 (가져올 때마다 누적)
+# - DEALS_SOURCE: 개별 거래 저장소에서 다시 집계한 요약 (가져온 월을 통째로 대체)
+SOURCE = "molit"
+DEALS_SOURCE = "deals"
+
+
+def _pick(raw, field, aliases=FIELD_ALIASES):
+    for alias in aliases[field]:
+        if alias in raw.columns:
+            return raw[alias]
+    return None
+
+
+# 텍스트 필드 (CSV 읽을 때 문자열로 유지)
+TEXT_FIELDS = ["아파트", "법정동", "해제여부"]
+
+
+def _numeric(values):
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values
+    return pd.to_numeric(values, errors="coerce")
+
+
+# 문자열 정리는 고유값에만 적용 후 코드로 펼침 (단지명/동 이름은 반복이 많음)
+def _map_unique(values, func):
+    codes, uniques = pd.factorize(values)
+    mapped = func(pd.Series(uniques, dtype=object).astype(str)).to_numpy(dtype=object)
+    result = mapped.take(codes) if len(mapped) else np.full(len(codes), "", dtype=object)
+    result[codes < 0] = ""
+    return pd.Series(result, index=values.index)
+
+
+def _strip(values):
+    return values.str.strip()
+
+
+# 매매/전월세 공통 필드 (계약일, 날짜, 아파트, 법정동)
+# - 계약일: 계약년월+계약일 또는 년/월/일 → datetime, 날짜는 월 키
+def contract_fields(raw, aliases=FIELD_ALIASES):
+    year_month = _pick(raw, "계약년월", aliases)
+    if year_month is not None:
+        year_month = _numeric(year_month)
+        year, month = year_month // 100, year_month % 100
+    else:
+        year, month = _numeric(_pick(raw, "년", aliases)), _numeric(_pick(raw, "월", aliases))
+
+    day = _pick(raw, "일", aliases)
+    day = _numeric(day).fillna(1) if day is not None else pd.Series(1, index=raw.index)
+    contract = pd.to_datetime(pd.DataFrame({"year": year, "month": month, "day": day}), errors="coerce")
+
+    dong = _pick(raw, "법정동", aliases)
+    if dong is None and "시군구" in raw.columns:
+        # "부산광역시 해운대구 우동" → "우동"
+        dong = _map_unique(raw["시군구"], lambda names: names.str.split().str[-1])
+
+    return {
+        "계약일": contract,
+        "날짜": (year * 12 + month - 1),
+        "아파트": _map_unique(_pick(raw, "아파트", aliases), _strip),
+        "법정동": _map_unique(dong, _strip) if dong is not None else "",
+    }
+
+
+# 층 (같은 날 같은 면적/금액 거래를 구분하는 데 사용, 필드가 없으면 NaN)
+def _floor(raw):
+    floor = _pick(raw, "층")
+    if floor is None:
+        return pd.Series(np.nan, index=raw.index, dtype=np.float32)
+    return _numeric(floor).astype(np.float32)
+
+
+# 원본 필드(문자열)를 개별 거래 스키마로 정규화, (거래, 제외된 행 수) 반환
+# - 거래금액: 만원 → 억
+# - 전용면적: ㎡ 그대로 두고 평형대 구분 추가
+def normalize_deals(raw):
+    raw = raw.reset_index(drop=True)
+    area = pd.to_numeric(_pick(raw, "전용면적"), errors="coerce")
+    deals = pd.DataFrame({
+        **contract_fields(raw),
+        "전용면적(㎡)": area.astype(np.float32),
+        "층": _floor(raw),
+        "평형대": units.size_band(area),
+        "거래금액(억)": units.manwon_to_eok(_pick(raw, "거래금액")).astype(np.float32),
+    })
+
+    # 해제(취소)된 거래 제외
+    cancelled = _pick(raw, "해제여부")
+    if cancelled is not None:
+        cancelled = ~_map_unique(cancelled, _strip).isin(["", "-", "nan"])
+    else:
+        cancelled = pd.Series(False, index=raw.index)
+
+    valid = deals[["계약일", "평형대", "거래금액(억)"]].notna().all(axis=1) & (deals["아파트"] != "") & ~cancelled
+    deals = deals[valid].astype({"날짜": np.int32})
+    return deals.reset_index(drop=True), int((~valid).sum())
+
+
+# XML 응답 파일의 <item>을 청크 단위로 스트리밍
+def iter_xml_chunks(path, chunk_rows=CHUNK_ROWS):
+    batch = []
+    stack = []
+
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if elem.tag != "item":
+            continue
+
+        batch.append({child.tag: (child.text or "").strip() for child in elem})
+
+        # 처리한 요소는 트리에서 제거해 메모리를 일정하게 유지
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+        if len(batch) >= chunk_rows:
+            yield pd.DataFrame(batch)
+            batch = []
+
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+# CSV 인코딩 감지 (실거래가 공개시스템 파일은 보통 cp949)
+def _detect_encoding(path):
+    with open(path, "rb") as f:
+        head = f.read(65536)
+    try:
+        head.decode("utf-8")
+        return "utf-8-sig"
+    except UnicodeDecodeError as e:
+        # 읽은 구간 끝에서 잘린 멀티바이트 문자는 무시
+        if e.start >= len(head) - 3:
+            return "utf-8-sig"
+        return "cp949"
+
+
+# 안내문 줄을 건너뛰고 헤더 줄 위치 찾기 (header_fields의 별칭이 모두 있는 첫 줄)
+def _find_header_row(path, encoding, aliases=FIELD_ALIASES, header_fields=("아파트", "거래금액"), max_lines=50):
+    with open(path, "r", encoding=encoding, errors="replace") as f:
+        for i, line in enumerate(f):
+            if i >= max_lines:
+                break
+            if all(any(alias in line for alias in aliases[field]) for field in header_fields):
+                return i
+    return 0
+
+
+# CSV 파일을 청크 단위로 스트리밍
+# - aliases/text_fields/header_fields: 전월세 등 다른 덤프 형식의 필드명
+def iter_csv_chunks(path, chunk_rows=CHUNK_ROWS, encoding=None, aliases=FIELD_ALIASES, text_fields=TEXT_FIELDS, header_fields=("아파트", "거래금액")):
+    encoding = encoding or _detect_encoding(path)
+    header_row = _find_header_row(path, encoding, aliases, header_fields)
+    text_columns = [alias for field in text_fields for alias in aliases[field]] + ["시군구"]
+    yield from pd.read_csv(
+        path,
+        encoding=encoding,
+        skiprows=header_row,
+        thousands=",",
+        dtype={col: str for col in text_columns},
+        chunksize=chunk_rows,
+    )
+
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS, encoding=None, **fields):
+    if path.lower().endswith(".xml"):
+        return iter_xml_chunks(path, chunk_rows)
+    return iter_csv_chunks(path, chunk_rows, encoding, **fields)
+
+
+# (월, 아파트, 평형대) 별 최저가/최고가/거래 건수 누적 (거래 건수는 저장소의 선택 컬럼으로 기록)
+# - 상태 크기는 행 수가 아니라 그룹 수에 비례
+class DealRollup:
+    def __init__(self):
+        self._state = None
+
+    def add(self, deals):
+        if deals.empty:
+            return
+
+        grouped = deals.groupby(ROLLUP_KEYS, observed=True, sort=False)["거래금액(억)"].agg(["min", "max", "count"])
+        grouped.index = grouped.index.set_levels(
+            [level.astype(object) if level.dtype == "category" else level for level in grouped.index.levels]
+        )
+
+        if self._state is None:
+            self._state = grouped
+        else:
+            self._state = (
+                pd.concat([self._state, grouped])
+                .groupby(level=[0, 1, 2], sort=False)
+                .agg({"min": "min", "max": "max", "count": "sum"})
+            )
+
+    # 앱 스키마 (날짜, 아파트, 평형대, 최저가(억), 최고가(억), 거래 건수)로 변환
+    def result(self):
+        if self._state is None:
+            return storage.normalize_frame(pd.DataFrame(columns=storage.STORE_COLUMNS))
+
+        rows = self._state.reset_index().rename(columns={"min": "최저가(억)", "max": "최고가(억)", "count": storage.VOLUME_COLUMN})
+        rows = rows.sort_values(ROLLUP_KEYS, kind="stable")
+        return storage.normalize_frame(rows[storage.STORE_COLUMNS])
+
+
+# 덤프 파일들을 스트리밍으로 읽어 월별 요약으로 집계
+# - keep_deals=True 이면 개별 거래와 분위수 스케치도 저장
+# - detector가 주어지면 이상 거래를 요약/개별 거래에서 빼고 결과의 quarantined로 반환
+def import_files(paths, dongs=None, chunk_rows=CHUNK_ROWS, encoding=None, progress=None, keep_deals=False, detector=None):
+    start = time.perf_counter()
+    rollup = DealRollup()
+    total_rows = 0
+    skipped = 0
+    pending = []
+    pending_rows = 0
+    seen = {}
+    quarantined = []
+
+    for path in paths:
+        for raw in iter_chunks(path, chunk_rows, encoding):
+            deals, invalid = normalize_deals(raw)
+            if dongs:
+                deals = deals[deals["법정동"].isin(dongs)]
+
+            if detector is not None:
+                deals, flagged = detector.check(deals)
+                if len(flagged):
+                    quarantined.append(flagged)
+
+            rollup.add(deals)
+            total_rows += len(raw)
+            skipped += invalid
+
+            if keep_deals:
+                pending.append(deals)
+                pending_rows += len(deals)
+                if pending_rows >= DEAL_FLUSH_ROWS:
+                    deal_store.append_deals(pd.concat(pending, ignore_index=True), seen=seen)
+                    pending, pending_rows = [], 0
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(path, total_rows, total_rows / elapsed if elapsed else 0.0)
+
+    if pending:
+        deal_store.append_deals(pd.concat(pending, ignore_index=True), seen=seen)
+
+    elapsed = time.perf_counter() - start
+    rows = rollup.result()
+    return {
+        "rows": rows,
+        "deals": total_rows,
+        "skipped": skipped,
+        "quarantined": pd.concat(quarantined, ignore_index=True) if quarantined else None,
+        "seconds": elapsed,
+        "rows_per_second": total_rows / elapsed if elapsed else 0.0,
+    }
+
+
+# 개별 거래 저장소에서 month 월의 요약을 다시 집계 (이전 가져오기의 거래까지 합친 최저가/최고가/거래 건수)
+# - 월 파티션 하나만 읽음
+def rollup_stored_deals(month, deals_dir=deal_store.DEALS_DIR):
+    rollup = DealRollup()
+    rollup.add(deal_store.read_deals(deals_dir, month, month, columns=ROLLUP_KEYS + ["거래금액(억)"]))
+    return rollup.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="국토교통부 아파트 매매 실거래가 덤프(XML/CSV) 가져오기")
+    parser.add_argument("paths", nargs="+", help="XML 또는 CSV 덤프 파일")
+    parser.add_argument("--dong", nargs="*", default=None, help="포함할 법정동 (예: 우동)")
+    parser.add_argument("--encoding", default=None, help="CSV 인코딩 (미지정 시 자동 감지)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--store", default=ingest.STORE_DIR, help="병합할 월별 파티션 저장소")
+    parser.add_argument("--output", default=None, help="저장소 대신 CSV로 저장")
+    parser.add_argument("--no-deals", action="store_true", help="개별 거래/분위수 스케치를 저장하지 않음")
+    parser.add_argument("--quarantine", default=anomaly.QUARANTINE_DIR, help="이상 거래와 검출기 상태 저장 디렉토리")
+    parser.add_argument("--no-check", action="store_true", help="이상 거래 검출을 하지 않음")
+    args = parser.parse_args(argv)
+
+    def progress(path, rows, rate):
+        print(f"\r{os.path.basename(path)}: {rows:,}행 ({rate:,.0f}행/초)", end="", flush=True)
+
+    keep_deals = not args.output and not args.no_deals
+    detector = None if args.no_check else anomaly.load_detector(args.quarantine)
+    result = import_files(args.paths, args.dong, args.chunk_rows, args.encoding, progress, keep_deals, detector)
+    print()
+
+    quarantined = result["quarantined"]
+    if detector is not None:
+        if quarantined is not None:
+            anomaly.append_quarantine(quarantined, args.quarantine)
+        anomaly.save_detector(detector, args.quarantine)
+
+    rows = result["rows"]
+    if args.output:
+        rows.assign(날짜=[storage.month_key_to_label(key) for key in rows["날짜"]]).to_csv(args.output, index=False)
+        destination = args.output
+    else:
+        previous_version = ingest.load_manifest(args.store)["version"]
+        if keep_deals:
+            # 가져온 월은 한 달씩 개별 거래 저장소 기준으로 다시 집계 (다시 가져와도 건수가 늘지 않고 스케치와 일치)
+            # 다른 원본(CSV, 요약만 가져온 덤프)의 같은 키 행과는 저장소 파티션에서 합쳐짐
+            changed = []
+            for month in sorted(rows[storage.DATE_COLUMN].unique()):
+                changed += ingest.merge_source(rollup_stored_deals(month), DEALS_SOURCE, args.store, replace=True)
+        else:
+            changed = ingest.merge_source(rows, SOURCE, args.store, combine=ingest.combine_rows)
+        ingest.refresh_aggregates(args.store, changed, previous_version)
+        destination = f"{args.store} (파티션 {len(changed)}개 갱신)"
+
+    print(
+        f"거래 {result['deals']:,}행 (제외 {result['skipped']:,}행, 이상 거래 {0 if quarantined is None else len(quarantined):,}행) → 요약 {len(rows):,}행, "
+        f"{result['seconds']:.2f}초, {result['rows_per_second']:,.0f}행/초 → {destination}"
+    )
+
+
+if __name__ == "__main__":
+    main()
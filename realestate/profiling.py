@@ -0,0 +1,72 @@
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+# 재실행 지연 시간 히스토그램 구간 (ms, 마지막 구간은 상한 없음)
+LATENCY_BINS_MS = [0, 50, 100, 200, 500, 1000, 2000, 5000, np.inf]
+
+
+# 구간별 실행 시간/처리 행 수/전송 크기 기록
+# - lap(name): 직전 기록 이후 경과 시간을 name 구간으로 기록 (페이지 코드 흐름 그대로 사용)
+# - enabled=False이면 아무것도 기록하지 않음
+# - finished: 이 프로파일러의 실행이 끝났는지 여부 (이후 fragment만 다시 실행될 때 새 프로파일러를 쓰도록)
+class Profiler:
+    def __init__(self, enabled=True, start=None):
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.sections = []
+        self.finished = False
+
+    def _add(self, name, seconds, rows, nbytes=None):
+        self.sections.append({
+            "section": name,
+            "seconds": seconds,
+            "rows": None if rows is None else int(rows),
+            "bytes": None if nbytes is None else int(nbytes),
+        })
+
+    def lap(self, name, rows=None, nbytes=None):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._add(name, now - self._last, rows, nbytes)
+        self._last = now
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def finish(self):
+        self.finished = True
+
+    # 한 번의 실행 기록 (JSON 직렬화 가능한 dict)
+    def record(self, **fields):
+        return {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "total_seconds": self.total(),
+            **fields,
+            "sections": self.sections,
+        }
+
+
+# 실행 기록을 JSON lines 파일에 한 줄로 추가
+def append_jsonl(path, record):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+# 지연 시간(초) 목록 → 구간 이름, 건수
+def latency_histogram(seconds, bins_ms=LATENCY_BINS_MS):
+    counts, _ = np.histogram(np.asarray(seconds, dtype=np.float64) * 1000, bins=bins_ms)
+    labels = [
+        f"{int(low)}ms~" if np.isinf(high) else f"{int(low)}~{int(high)}ms"
+        for low, high in zip(bins_ms[:-1], bins_ms[1:])
+    ]
+    return labels, counts
@@ -0,0 +1,270 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from realestate import aggregates, ingest, molit, storage, units
+
+# 전월세 실거래 (국토교통부 아파트 전월세 덤프) 저장소와 전세가율
+# - 덤프를 청크 단위로 읽어 (월, 아파트, 평형대)별 요약으로 누적 (매매 덤프 가져오기와 같은 방식)
+# - 요약은 매매와 같은 월별 파티션 저장소 형식으로 data/rentals에 저장
+# - 매매 월별 평균가와 전세 요약을 시계열별 as-of 조인 (가장 최근 전세 거래월, 행별 반복 없음)
+
+RENTAL_DIR = os.path.join(storage.DATA_DIR, "rentals")
+
+# 전월세 덤프 필드명 (XML 국문/영문 태그, 실거래가 공개시스템 CSV 헤더)
+FIELD_ALIASES = {
+    **molit.FIELD_ALIASES,
+    "보증금": ["보증금액", "deposit", "보증금(만원)"],
+    "월세": ["월세금액", "monthlyRent", "월세금(만원)", "월세(만원)"],
+}
+
+TEXT_FIELDS = ["아파트", "법정동"]
+HEADER_FIELDS = ("아파트", "보증금")
+
+JEONSE_COLUMN = "전세가(억)"
+RATIO_COLUMN = "전세가율(%)"
+
+# 월별 요약 컬럼 (월세 보증금/월세는 평균)
+RENTAL_COLUMNS = [
+    storage.DATE_COLUMN, "아파트", "평형대",
+    JEONSE_COLUMN, "전세 건수", "월세 보증금(억)", "월세(만원)", "월세 건수",
+]
+REQUIRED_COLUMNS = [storage.DATE_COLUMN, "아파트", "평형대", JEONSE_COLUMN, "전세 건수"]
+
+# 매매 월보다 이만큼 이전의 전세 거래월까지 as-of 조인에 사용
+TOLERANCE_MONTHS = 3
+
+# 합계 상태 컬럼 (청크 간 누적은 합계로, 평균은 마지막에 계산)
+_SUM_COLUMNS = ["전세 보증금 합", "전세 건수", "월세 보증금 합", "월세 합", "월세 건수"]
+
+
+# 원본 필드(문자열)를 전월세 거래로 정규화, (거래, 제외된 행 수) 반환
+# - 보증금: 만원 → 억, 월세: 만원, 월세가 0이면 전세
+def normalize_rentals(raw):
+    raw = raw.reset_index(drop=True)
+    area = pd.to_numeric(molit._pick(raw, "전용면적", FIELD_ALIASES), errors="coerce")
+    rent = molit._pick(raw, "월세", FIELD_ALIASES)
+    if rent is None:
+        rent = pd.Series(0.0, index=raw.index)
+    elif not pd.api.types.is_numeric_dtype(rent.dtype):
+        rent = pd.to_numeric(rent.str.replace(",", ""), errors="coerce")
+    rent = rent.fillna(0)
+
+    rentals = pd.DataFrame({
+        **molit.contract_fields(raw, FIELD_ALIASES),
+        "전용면적(㎡)": area.astype(np.float32),
+        "평형대": units.size_band(area),
+        "보증금(억)": units.manwon_to_eok(molit._pick(raw, "보증금", FIELD_ALIASES)).astype(np.float32),
+        "월세(만원)": rent.astype(np.float32),
+    })
+
+    valid = rentals[["계약일", "평형대", "보증금(억)"]].notna().all(axis=1) & (rentals["아파트"] != "")
+    rentals = rentals[valid].astype({"날짜": np.int32})
+    return rentals.reset_index(drop=True), int((~valid).sum())
+
+
+# (월, 아파트, 평형대) 별 전세/월세 합계와 건수 누적 (상태 크기는 그룹 수에 비례)
+class RentalRollup:
+    def __init__(self):
+        self._state = None
+
+    def add(self, rentals):
+        if rentals.empty:
+            return
+
+        jeonse = (rentals["월세(만원)"] <= 0).to_numpy()
+        deposit = rentals["보증금(억)"].to_numpy(dtype=np.float64)
+        rent = rentals["월세(만원)"].to_numpy(dtype=np.float64)
+        self.add_sums(pd.DataFrame({
+            **{col: rentals[col] for col in molit.ROLLUP_KEYS},
+            "전세 보증금 합": np.where(jeonse, deposit, 0.0),
+            "전세 건수": jeonse.astype(np.int64),
+            "월세 보증금 합": np.where(jeonse, 0.0, deposit),
+            "월세 합": np.where(jeonse, 0.0, rent),
+            "월세 건수": (~jeonse).astype(np.int64),
+        }))
+
+    # (월, 아파트, 평형대, 합계 상태 컬럼) 행을 누적
+    def add_sums(self, sums):
+        grouped = sums.groupby(molit.ROLLUP_KEYS, observed=True, sort=False)[_SUM_COLUMNS].sum()
+        grouped.index = grouped.index.set_levels(
+            [level.astype(object) if level.dtype == "category" else level for level in grouped.index.levels]
+        )
+
+        if self._state is None:
+            self._state = grouped
+        else:
+            self._state = pd.concat([self._state, grouped]).groupby(level=[0, 1, 2], sort=False).sum()
+
+    # 월별 요약 (날짜, 아파트, 평형대, 전세가(억), 전세 건수, 월세 보증금(억), 월세(만원), 월세 건수)
+    def result(self):
+        if self._state is None:
+            return storage.normalize_frame(pd.DataFrame(columns=RENTAL_COLUMNS), REQUIRED_COLUMNS)
+
+        state = self._state.reset_index().sort_values(molit.ROLLUP_KEYS, kind="stable")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rows = state[molit.ROLLUP_KEYS].assign(**{
+                JEONSE_COLUMN: (state["전세 보증금 합"] / state["전세 건수"]).astype(np.float32),
+                "전세 건수": state["전세 건수"].astype(np.int32),
+                "월세 보증금(억)": (state["월세 보증금 합"] / state["월세 건수"]).astype(np.float32),
+                "월세(만원)": (state["월세 합"] / state["월세 건수"]).astype(np.float32),
+                "월세 건수": state["월세 건수"].astype(np.int32),
+            })
+        return storage.normalize_frame(rows[RENTAL_COLUMNS], REQUIRED_COLUMNS)
+
+
+# 같은 키의 전월세 요약을 하나로 합침 (건수는 합계, 평균은 건수 가중 평균)
+def combine_rows(rows):
+    jeonse = rows["전세 건수"].fillna(0).to_numpy(dtype=np.float64)
+    monthly = rows["월세 건수"].fillna(0).to_numpy(dtype=np.float64)
+    rollup = RentalRollup()
+    rollup.add_sums(pd.DataFrame({
+        **{col: rows[col] for col in molit.ROLLUP_KEYS},
+        "전세 보증금 합": np.nan_to_num(rows[JEONSE_COLUMN].to_numpy(dtype=np.float64)) * jeonse,
+        "전세 건수": jeonse.astype(np.int64),
+        "월세 보증금 합": np.nan_to_num(rows["월세 보증금(억)"].to_numpy(dtype=np.float64)) * monthly,
+        "월세 합": np.nan_to_num(rows["월세(만원)"].to_numpy(dtype=np.float64)) * monthly,
+        "월세 건수": monthly.astype(np.int64),
+    }))
+    return rollup.result()
+
+
+# 덤프 파일들을 스트리밍으로 읽어 월별 전월세 요약으로 집계
+def import_files(paths, dongs=None, chunk_rows=molit.CHUNK_ROWS, encoding=None, progress=None):
+    start = time.perf_counter()
+    rollup = RentalRollup()
+    total_rows = 0
+    skipped = 0
+
+    for path in paths:
+        chunks = molit.iter_chunks(path, chunk_rows, encoding, aliases=FIELD_ALIASES, text_fields=TEXT_FIELDS, header_fields=HEADER_FIELDS)
+        for raw in chunks:
+            rentals, invalid = normalize_rentals(raw)
+            if dongs:
+                rentals = rentals[rentals["법정동"].isin(dongs)]
+
+            rollup.add(rentals)
+            total_rows += len(raw)
+            skipped += invalid
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(path, total_rows, total_rows / elapsed if elapsed else 0.0)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rollup.result(),
+        "rentals": total_rows,
+        "skipped": skipped,
+        "seconds": elapsed,
+        "rows_per_second": total_rows / elapsed if elapsed else 0.0,
+    }
+
+
+# 전월세 요약을 월별 파티션 저장소에 병합 (같은 키의 기존 요약과 건수/평균을 합침)
+def merge_rows(rows, rental_dir=RENTAL_DIR):
+    return ingest.merge_rows(rows, rental_dir, required=REQUIRED_COLUMNS, combine=combine_rows)
+
+
+# 저장된 전월세 요약 전체 (없으면 빈 테이블)
+def read_rentals(rental_dir=RENTAL_DIR):
+    frames = [storage.read_store(path) for path, _ in ingest.partitions(rental_dir)]
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return storage.normalize_frame(pd.DataFrame(columns=RENTAL_COLUMNS), REQUIRED_COLUMNS)
+    return storage.concat_frames(frames)
+
+
+# 시계열 키 (아파트, 평형대 → left의 카테고리 기준 정수, 없는 조합은 -1)
+def _series_codes(frame, apartments, sizes):
+    apt = pd.Categorical(frame["아파트"], categories=apartments).codes.astype(np.int64)
+    size = pd.Categorical(frame["평형대"], categories=sizes).codes.astype(np.int64)
+    return np.where((apt >= 0) & (size >= 0), apt * len(sizes) + size, -1)
+
+
+# left 행마다 같은 시계열에서 월이 같거나 이전인 가장 최근 right 행 위치 (tolerance개월 이내, 없으면 -1)
+# - (시계열, 월)을 하나의 정수 키로 묶어 정렬된 right 키에서 searchsorted 한 번으로 찾음
+def asof_positions(left, right, tolerance=TOLERANCE_MONTHS):
+    apartments = left["아파트"].astype("category").cat.categories
+    sizes = left["평형대"].astype("category").cat.categories
+    span = np.int64(1) << 20
+
+    left_series = _series_codes(left, apartments, sizes)
+    right_series = _series_codes(right, apartments, sizes)
+    left_month = left[storage.DATE_COLUMN].to_numpy(dtype=np.int64)
+    right_month = right[storage.DATE_COLUMN].to_numpy(dtype=np.int64)
+
+    usable = np.flatnonzero(right_series >= 0)
+    if not len(usable):
+        return np.full(len(left), -1, dtype=np.int64)
+
+    right_key = right_series[usable] * span + right_month[usable]
+    order = np.argsort(right_key, kind="stable")
+    right_key = right_key[order]
+    rows = usable[order]
+
+    found = np.searchsorted(right_key, left_series * span + left_month, side="right") - 1
+    match = np.maximum(found, 0)
+    valid = (
+        (found >= 0)
+        & (left_series >= 0)
+        & (right_key[match] // span == left_series)
+        & (left_month - right_key[match] % span <= tolerance)
+    )
+    return np.where(valid, rows[match], -1)
+
+
+# 매매 월별 평균가와 전세 요약의 as-of 조인 → 시계열×월별 전세가율
+# - monthly: 매매 월별 테이블 (날짜, 아파트, 평형대, 평균가(억)), rentals: 전월세 요약
+# - 전세 거래가 없는 달은 TOLERANCE_MONTHS개월 이내의 가장 최근 전세가 사용, 그보다 오래되었으면 제외
+def jeonse_ratios(monthly, rentals, tolerance=TOLERANCE_MONTHS):
+    columns = [storage.DATE_COLUMN, "아파트", "평형대", aggregates.AVG_COLUMN, JEONSE_COLUMN, "전세 기준월", RATIO_COLUMN]
+    jeonse = rentals[rentals["전세 건수"] > 0]
+    if monthly.empty or jeonse.empty:
+        return pd.DataFrame(columns=columns)
+
+    positions = asof_positions(monthly, jeonse, tolerance)
+    matched = positions >= 0
+    sale = monthly.loc[matched, [storage.DATE_COLUMN, "아파트", "평형대", aggregates.AVG_COLUMN]].reset_index(drop=True)
+    deposit = jeonse[JEONSE_COLUMN].to_numpy(dtype=np.float64)[positions[matched]]
+
+    return sale.assign(**{
+        JEONSE_COLUMN: deposit.astype(np.float32),
+        "전세 기준월": jeonse[storage.DATE_COLUMN].to_numpy()[positions[matched]],
+        RATIO_COLUMN: (deposit / sale[aggregates.AVG_COLUMN].to_numpy(dtype=np.float64) * 100).astype(np.float32),
+    })[columns]
+
+
+# 월별 평균 전세가율 추이 (by: 함께 묶을 컬럼, 예: 평형대)
+def ratio_trend(ratios, by=()):
+    keys = [storage.DATE_COLUMN] + list(by)
+    return ratios.groupby(keys, observed=True, sort=True)[RATIO_COLUMN].mean().reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="국토교통부 아파트 전월세 실거래가 덤프(XML/CSV) 가져오기")
+    parser.add_argument("paths", nargs="+", help="XML 또는 CSV 덤프 파일")
+    parser.add_argument("--dong", nargs="*", default=None, help="포함할 법정동 (예: 우동)")
+    parser.add_argument("--encoding", default=None, help="CSV 인코딩 (미지정 시 자동 감지)")
+    parser.add_argument("--chunk-rows", type=int, default=molit.CHUNK_ROWS)
+    parser.add_argument("--store", default=RENTAL_DIR, help="병합할 전월세 월별 파티션 저장소")
+    args = parser.parse_args(argv)
+
+    def progress(path, rows, rate):
+        print(f"\r{os.path.basename(path)}: {rows:,}행 ({rate:,.0f}행/초)", end="", flush=True)
+
+    result = import_files(args.paths, args.dong, args.chunk_rows, args.encoding, progress)
+    print()
+
+    changed = merge_rows(result["rows"], args.store)
+    print(
+        f"거래 {result['rentals']:,}행 (제외 {result['skipped']:,}행) → 요약 {len(result['rows']):,}행, "
+        f"{result['seconds']:.2f}초, {result['rows_per_second']:,.0f}행/초 → {args.store} (파티션 {len(changed)}개 갱신)"
+    )
+
+
+if __name__ == "__main__":
+    main()
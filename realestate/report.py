@@ -0,0 +1,153 @@
+import argparse
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from realestate import aggregates, analytics, charts, ingest, metadata, storage
+
+# 작업 하나에 묶는 아파트 수
+CHUNK_APARTMENTS = 50
+
+REPORT_FORMATS = ["csv", "json", "html"]
+
+# 작업 프로세스별 데이터셋 (큐브, 집계 테이블, 평당 가격, 초기화 시 한 번 로드)
+_dataset = None
+
+
+def _init_worker(store_dir, aggregate_dir, info_path):
+    global _dataset
+    cube, tables = analytics.load(store_dir, aggregate_dir)
+    _dataset = cube, tables, analytics.unit_prices(tables, metadata.info_table(metadata.read_info(info_path)))
+
+
+# 파일 이름으로 쓸 수 있게 아파트 이름 정리
+def _file_name(apartment):
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", str(apartment)).strip("_") + ".html"
+
+
+# 아파트 한 곳의 HTML 리포트 (시계열 요약 표 + 평형대별 평균가 추이 차트)
+def _apartment_html(cube, apartment, report):
+    fig = charts.line_figure(
+        cube.select([apartment], report["평형대"]),
+        y=aggregates.AVG_COLUMN,
+        color="평형대",
+        title=f"{apartment} 평형별 평균 가격 추이",
+        xaxis_title="날짜",
+        yaxis_title="평균 가격 (억원)",
+        height=400
+    )
+
+    table = _display_frame(report.drop(columns="아파트")).to_html(index=False, float_format=lambda v: f"{v:,.2f}", na_rep="-")
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{html.escape(str(apartment))}</title></head><body>"
+        f"<h1>{html.escape(str(apartment))}</h1>{table}"
+        f"{fig.to_html(full_html=False, include_plotlyjs='cdn')}"
+        "</body></html>"
+    )
+
+
+# 월 키 컬럼을 'YYYY-MM' 문자열로 변환 (리포트 표시용)
+def _display_frame(report):
+    display = report.copy()
+    for col in ("첫 거래월", "최신 거래월"):
+        if col in display.columns:
+            display[col] = [storage.month_key_to_label(key) for key in display[col]]
+    return display
+
+
+# 아파트 묶음 하나의 리포트 계산 (html_dir가 주어지면 아파트별 HTML 파일도 기록)
+def _report_chunk(apartments, html_dir=None):
+    cube, tables, prices = _dataset
+    report = analytics.series_reports(cube, tables, prices, apartments)
+
+    if html_dir:
+        for apartment, apt_report in report.groupby("아파트", observed=True, sort=False):
+            with open(os.path.join(html_dir, _file_name(apartment)), "w", encoding="utf-8") as f:
+                f.write(_apartment_html(cube, apartment, apt_report))
+    return report
+
+
+# 전체 아파트×평형대 리포트 생성
+# - 아파트를 CHUNK 단위로 나누어 workers개 프로세스에 분배 (workers=1이면 현재 프로세스에서 실행)
+# - 평당 가격은 info_path의 아파트 정보(단지 면적) 기준
+def generate(store_dir=ingest.STORE_DIR, aggregate_dir=aggregates.AGGREGATE_DIR, output_dir="reports", formats=("csv",), workers=None, chunk=CHUNK_APARTMENTS, info_path=metadata.INFO_PATH):
+    start = time.perf_counter()
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    html_dir = None
+    if "html" in formats:
+        html_dir = os.path.join(output_dir, "html")
+        if not os.path.exists(html_dir):
+            os.makedirs(html_dir)
+
+    # 부모 프로세스에서 먼저 로드하여 집계 테이블이 없으면 한 번만 계산/저장
+    _init_worker(store_dir, aggregate_dir, info_path)
+    apartments = _dataset[0].apartments.tolist()
+    chunks = [apartments[i:i + chunk] for i in range(0, len(apartments), chunk)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        frames = [_report_chunk(apts, html_dir) for apts in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker, initargs=(store_dir, aggregate_dir, info_path)) as pool:
+            frames = list(pool.map(_report_chunk, chunks, [html_dir] * len(chunks)))
+
+    report = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    display = _display_frame(report)
+
+    written = []
+    if "csv" in formats:
+        path = os.path.join(output_dir, "report.csv")
+        display.to_csv(path, index=False, encoding="utf-8-sig")
+        written.append(path)
+    if "json" in formats:
+        path = os.path.join(output_dir, "report.json")
+        display.to_json(path, orient="records", force_ascii=False, indent=4)
+        written.append(path)
+    if html_dir:
+        links = "".join(
+            f"<li><a href='html/{html.escape(_file_name(apartment))}'>{html.escape(str(apartment))}</a></li>"
+            for apartment in display["아파트"].unique()
+        )
+        path = os.path.join(output_dir, "index.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>아파트 리포트</title></head><body><ul>{links}</ul></body></html>")
+        written.append(path)
+
+    return {
+        "apartments": len(apartments),
+        "series": len(report),
+        "workers": workers if len(chunks) > 1 else 1,
+        "files": written,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="아파트×평형대 리포트 일괄 생성 (CSV/JSON/HTML)")
+    parser.add_argument("--store", default=ingest.STORE_DIR)
+    parser.add_argument("--aggregates", default=aggregates.AGGREGATE_DIR)
+    parser.add_argument("--output", default="reports", help="리포트 저장 디렉토리")
+    parser.add_argument("--format", nargs="+", choices=REPORT_FORMATS, default=["csv"])
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_APARTMENTS, help="작업 하나에 묶는 아파트 수")
+    parser.add_argument("--info", default=metadata.INFO_PATH, help="아파트 정보 파일 (평당 가격의 단지 면적)")
+    args = parser.parse_args(argv)
+
+    result = generate(args.store, args.aggregates, args.output, args.format, args.workers, args.chunk, args.info)
+    print(
+        f"아파트 {result['apartments']:,}곳, 시계열 {result['series']:,}개, "
+        f"프로세스 {result['workers']}개, {result['seconds']:.2f}초"
+    )
+    for path in result["files"]:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
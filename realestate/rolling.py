@@ -0,0 +1,154 @@
+import numpy as np
+
+from realestate.storage import DATE_COLUMN
+
+# 아파트×평형대 시계열별 이동 통계 (월별 집계 테이블의 컬럼으로 저장)
+# - 이동평균: 최근 k개월(달력 기준) 안의 거래월 평균가 평균
+# - 변동성: 최근 12개월 안의 거래월 간 로그 수익률 표준편차 (연율화, %)
+#   수익률마다 걸친 개월 수가 다르므로 월 분산 = Σ(r - μ·g)²/g / (n - 1), μ = Σr / Σg (g: 걸친 개월 수)
+# - 낙폭: 그때까지의 최고 평균가 대비 하락률 (%)
+# 월 축이 연속인 (시계열 × 월) 배열에서 누적합으로 한 번에 계산 (시계열별 반복 없음)
+
+MA_MONTHS = (3, 6, 12)
+VOLATILITY_MONTHS = 12
+
+VOLATILITY_COLUMN = "변동성(%)"
+DRAWDOWN_COLUMN = "낙폭(%)"
+MAX_DRAWDOWN_COLUMN = "최대 낙폭(%)"
+
+
+def ma_column(months):
+    return f"{months}개월 이동평균(억)"
+
+
+COLUMNS = [ma_column(months) for months in MA_MONTHS] + [VOLATILITY_COLUMN, DRAWDOWN_COLUMN]
+
+# 증분 계산 시 앞쪽에 더 읽는 월 수 (가장 긴 윈도)
+WARMUP_MONTHS = max(MA_MONTHS + (VOLATILITY_MONTHS,))
+
+# 한 번에 (시계열 × 월) 배열로 펼치는 시계열 수
+BLOCK_SERIES = 4096
+
+
+# 마지막 축 방향 길이 k 윈도 합 (앞쪽은 있는 만큼)
+def _window_sum(values, k):
+    total = np.cumsum(values, axis=-1)
+    total[..., k:] -= total[..., :-k].copy()
+    return total
+
+
+# (시계열 × 월) 평균가 배열의 이동 통계 (거래 없는 월은 NaN)
+# - peak, last: 시계열별 앞 구간 최고가/마지막 거래 가격 (증분 계산용, 없으면 NaN)
+# - last_position: 시계열별 앞 구간 마지막 거래월의 위치 (배열 첫 월 기준, 음수)
+def dense_stats(prices, peak=None, last=None, last_position=None):
+    prices = np.asarray(prices, dtype=np.float64)
+    observed = ~np.isnan(prices)
+    filled = np.where(observed, prices, 0.0)
+    count = observed.astype(np.float64)
+
+    stats = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for months in MA_MONTHS:
+            stats[ma_column(months)] = _window_sum(filled, months) / _window_sum(count, months)
+
+        # 직전 거래월 가격 (거래 없는 월을 건너뛰어 이전 거래와 비교)
+        positions = np.where(observed, np.arange(prices.shape[-1]), -1)
+        last_seen = np.maximum.accumulate(positions, axis=-1)
+        previous_pos = np.concatenate([np.full(last_seen.shape[:-1] + (1,), -1), last_seen[..., :-1]], axis=-1)
+        previous = np.take_along_axis(prices, np.maximum(previous_pos, 0), axis=-1)
+        if last is not None:
+            previous = np.where(previous_pos >= 0, previous, np.asarray(last, dtype=np.float64)[:, None])
+            previous_pos = np.where(previous_pos >= 0, previous_pos, np.asarray(last_position, dtype=np.float64)[:, None])
+        else:
+            previous = np.where(previous_pos >= 0, previous, np.nan)
+        returns = np.where(observed, np.log(prices / previous), np.nan)
+
+        # 수익률이 걸친 개월 수 (거래 없는 달을 건너뛴 수익률은 그만큼 긴 기간의 수익률)
+        has_return = ~np.isnan(returns)
+        gap = np.where(has_return, np.arange(prices.shape[-1]) - previous_pos, 1.0)
+        r = np.where(has_return, returns, 0.0)
+        n = _window_sum(has_return.astype(np.float64), VOLATILITY_MONTHS)
+        s = _window_sum(r, VOLATILITY_MONTHS)
+        g = _window_sum(np.where(has_return, gap, 0.0), VOLATILITY_MONTHS)
+        q = _window_sum(r * r / gap, VOLATILITY_MONTHS)
+        variance = np.maximum(q - s * s / g, 0) / (n - 1)
+        stats[VOLATILITY_COLUMN] = np.where(n >= 2, np.sqrt(variance * 12) * 100, np.nan)
+
+        running = np.fmax.accumulate(prices, axis=-1)
+        if peak is not None:
+            running = np.fmax(running, np.asarray(peak, dtype=np.float64)[:, None])
+        stats[DRAWDOWN_COLUMN] = (prices / running - 1) * 100
+
+    # 거래가 없는 월은 값 없음
+    for col in COLUMNS:
+        stats[col] = np.where(observed, stats[col], np.nan)
+    return stats
+
+
+# 월별 테이블((아파트, 평형대, 날짜) 순 정렬)에 이동 통계 컬럼 추가
+# - price_column: 기준 가격 컬럼 (평균가)
+# - since: 이 월 이후 행만 다시 계산하고 이전 행은 기존 값 유지 (새 월 반영 시 증분 갱신)
+#   앞 WARMUP_MONTHS개월만 다시 읽고, 낙폭 기준 고점은 그 이전 행의 시계열별 최고가로 이어받음
+# - 시계열 BLOCK_SERIES개씩 (시계열 × 월) 배열로 펼쳐 계산 (메모리 상한)
+def add_rolling(monthly, price_column, since=None):
+    if since is not None and not all(col in monthly.columns for col in COLUMNS):
+        since = None
+
+    n_rows = len(monthly)
+    months = monthly[DATE_COLUMN].to_numpy(dtype=np.int64)
+    prices = monthly[price_column].to_numpy(dtype=np.float64)
+
+    # 정렬된 행에서 시계열 경계 → 시계열 번호, 시계열별 시작 행
+    apt = monthly["아파트"].cat.codes.to_numpy()
+    size = monthly["평형대"].cat.codes.to_numpy()
+    starts = np.ones(n_rows, dtype=bool)
+    starts[1:] = (apt[1:] != apt[:-1]) | (size[1:] != size[:-1])
+    series = np.cumsum(starts) - 1
+    offsets = np.append(np.flatnonzero(starts), n_rows)
+
+    if since is None:
+        first_month = int(months.min()) if n_rows else 0
+        values = {col: np.full(n_rows, np.nan, dtype=np.float32) for col in COLUMNS}
+    else:
+        first_month = int(since) - WARMUP_MONTHS
+        values = {col: monthly[col].to_numpy(dtype=np.float32, copy=True) for col in COLUMNS}
+    n_months = int(months.max()) - first_month + 1 if n_rows else 0
+
+    for block in range(0, len(offsets) - 1, BLOCK_SERIES):
+        rows = slice(offsets[block], offsets[min(block + BLOCK_SERIES, len(offsets) - 1)])
+        block_series = series[rows] - block
+        block_months = months[rows]
+        block_prices = prices[rows]
+        n_series = int(block_series[-1]) + 1
+
+        window = block_months >= first_month
+        peak = last = last_position = None
+        if since is not None:
+            before = np.flatnonzero(~window)
+            peak = np.full(n_series, np.nan)
+            np.fmax.at(peak, block_series[before], block_prices[before])
+            # 날짜순 정렬이므로 시계열별 마지막 행 = 가장 큰 행 위치
+            last_row = np.full(n_series, -1)
+            np.maximum.at(last_row, block_series[before], before)
+            last = np.where(last_row >= 0, block_prices[last_row], np.nan)
+            last_position = np.where(last_row >= 0, block_months[last_row] - first_month, -1)
+
+        grid = np.full((n_series, n_months), np.nan)
+        grid[block_series[window], block_months[window] - first_month] = block_prices[window]
+        stats = dense_stats(grid, peak, last, last_position)
+
+        update = window if since is None else block_months >= int(since)
+        targets = np.arange(rows.start, rows.stop)[update]
+        for col in COLUMNS:
+            values[col][targets] = stats[col][block_series[update], block_months[update] - first_month]
+
+    # 이동 통계 컬럼은 항상 마지막 (전체/증분 계산 결과의 컬럼 순서 동일)
+    result = monthly.drop(columns=[col for col in COLUMNS if col in monthly.columns])
+    for col in COLUMNS:
+        result[col] = values[col]
+    return result
+
+
+# 시계열별 최대 낙폭 (%, 낙폭 컬럼의 최솟값)
+def max_drawdown(monthly, keys):
+    return monthly.groupby(keys, observed=True, sort=True)[DRAWDOWN_COLUMN].min().rename(MAX_DRAWDOWN_COLUMN)
@@ -0,0 +1,268 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from realestate import aggregates, analytics, ingest, storage, units
+
+# 비교 단지 (가격 수준, 평당 가격, 평형 구성, 연식, 세대수, 최근 변동률이 비슷한 아파트) 검색
+# - 아파트별 특성 행렬을 표준화하여 가중 유클리드 거리로 비교
+# - 모든 아파트의 상위 k개 이웃을 블록 단위 행렬 연산으로 미리 계산 (조회는 행 하나 읽기)
+# - 새 데이터가 들어오면 특성이 바뀐 아파트와 그 아파트를 이웃으로 가진 아파트만 다시 계산
+# - 저장된 인덱스는 특성 표 해시로 구분 (데이터 버전뿐 아니라 아파트 정보가 바뀌어도 갱신)
+# - 다시 맞춘 표준화 기준이 저장된 기준에서 DRIFT 넘게 벗어나면 증분 갱신 대신 새로 생성
+
+SIMILAR_DIR = os.path.join(storage.DATA_DIR, "similar")
+VERSION_NAME = "_version.json"
+
+# 아파트별 미리 계산해 두는 이웃 수
+NEIGHBORS = 10
+
+# 거리 계산 블록 크기 (행 수)
+BLOCK_ROWS = 1024
+
+# 표준화 기준 허용 변화 (평균 이동은 기존 표준편차 대비, 표준편차는 비율)
+DRIFT = 0.1
+
+SIZE_MIX_COLUMNS = [f"{band} 비중" for band in units.SIZE_BANDS]
+
+# 특성 → 가중치 (표준화 후 곱함, 평형 구성은 네 컬럼이 합쳐서 하나의 특성 역할)
+FEATURE_WEIGHTS = {
+    "가격 수준": 1.0,
+    "평당 가격": 1.0,
+    **{col: 0.5 for col in SIZE_MIX_COLUMNS},
+    "연식": 1.0,
+    "세대수": 1.0,
+    "최근 변동률": 1.0,
+}
+FEATURE_COLUMNS = list(FEATURE_WEIGHTS)
+
+
+# 아파트별 특성 표 (인덱스: 아파트)
+# - 가격 수준: 최신 평균가의 로그 평균, 평당 가격: 면적 기준 평당 가격 평균 (만원)
+# - 평형 구성: 평형대별 거래월 수 비중, 연식: 마지막 거래월 기준 사용승인 후 경과 연수
+# - 세대수: 로그(1 + 세대수), 최근 변동률: 평형대별 12개월 변동률 평균 (%)
+def build_features(tables, info):
+    latest = tables["latest"]
+    summary = tables["summary"]
+    prices = analytics.unit_prices(tables, info)
+
+    apartments = summary["아파트"].astype(str)
+    names = pd.Index(apartments.unique(), name="아파트")
+    features = pd.DataFrame(index=names)
+
+    features["가격 수준"] = np.log(latest[aggregates.AVG_COLUMN].astype(np.float64)).groupby(latest["아파트"].astype(str)).mean()
+    features["평당 가격"] = prices[aggregates.PYEONG_PRICE_COLUMN].groupby(prices["아파트"].astype(str)).mean()
+
+    months = summary.pivot_table(index=apartments, columns=summary["평형대"].astype(str), values="거래월 수", aggfunc="sum", observed=True)
+    months = months.reindex(index=names, columns=units.SIZE_BANDS).fillna(0)
+    shares = months.div(months.sum(axis=1).replace(0, np.nan), axis=0)
+    features[SIZE_MIX_COLUMNS] = shares.to_numpy()
+
+    apartment_info = info.reindex(names)
+    end = int(latest[storage.DATE_COLUMN].max()) if len(latest) else None
+    if end is not None:
+        end_date = storage.month_key_to_datetime([end])[0]
+        features["연식"] = (end_date - apartment_info["사용승인일"]).dt.days.to_numpy() / 365.25
+    else:
+        features["연식"] = np.nan
+    features["세대수"] = np.log1p(apartment_info["세대수"].astype(np.float64)).to_numpy()
+
+    deltas = tables["deltas"]
+    features["최근 변동률"] = deltas[aggregates.delta_column(12)].groupby(deltas["아파트"].astype(str)).mean()
+    return features[FEATURE_COLUMNS].astype(np.float64)
+
+
+# 특성 표 내용 해시 (저장된 인덱스 구분용)
+def features_hash(features):
+    return ingest.frame_hash(features.reset_index())
+
+
+# 표준화 기준 (특성별 평균, 표준편차, 값이 없거나 0이면 1)
+def fit_scaling(features):
+    return features.mean().to_numpy(), features.std().fillna(1.0).replace(0, 1.0).to_numpy()
+
+
+# 블록 단위 상위 k개 이웃 (자기 자신 제외)
+# - rows: 계산할 행 위치, 반환: (len(rows), k) 이웃 위치/거리 (이웃이 부족하면 -1/inf)
+def _top_k(matrix, rows, k, block=BLOCK_ROWS):
+    n = len(matrix)
+    k_found = min(k, n - 1)
+    positions = np.full((len(rows), k), -1, dtype=np.int64)
+    distances = np.full((len(rows), k), np.inf)
+    if k_found <= 0:
+        return positions, distances
+
+    norms = (matrix * matrix).sum(axis=1)
+    for start in range(0, len(rows), block):
+        block_rows = rows[start:start + block]
+        d = norms[block_rows][:, None] + norms[None, :] - 2 * matrix[block_rows] @ matrix.T
+        d[np.arange(len(block_rows)), block_rows] = np.inf
+        nearest = np.argpartition(d, k_found - 1, axis=1)[:, :k_found]
+        nearest_d = np.take_along_axis(d, nearest, axis=1)
+        order = np.argsort(nearest_d, axis=1, kind="stable")
+        positions[start:start + len(block_rows), :k_found] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:start + len(block_rows), :k_found] = np.sqrt(np.maximum(np.take_along_axis(nearest_d, order, axis=1), 0))
+    return positions, distances
+
+
+# 비교 단지 인덱스
+# - features: 아파트별 원래 단위 특성 표, center/scale: 표준화 기준 (증분 갱신 시 유지)
+# - neighbors/distances: 아파트별 상위 NEIGHBORS개 이웃 위치와 거리
+class SimilarityIndex:
+    def __init__(self, features, center=None, scale=None, neighbors=None, distances=None):
+        self.features = features
+        self.names = features.index
+        if center is None or scale is None:
+            center, scale = fit_scaling(features)
+        self.center = np.asarray(center, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.matrix = self._standardize(features)
+
+        if neighbors is None:
+            neighbors, distances = _top_k(self.matrix, np.arange(len(self.names)), NEIGHBORS)
+        self.neighbors = neighbors
+        self.distances = distances
+
+    # 표준화 + 가중치, 값이 없는 특성은 평균(0)으로 채움
+    def _standardize(self, features):
+        z = (features[FEATURE_COLUMNS].to_numpy(dtype=np.float64) - self.center) / self.scale
+        z = np.nan_to_num(z, nan=0.0)
+        return z * np.array([FEATURE_WEIGHTS[col] for col in FEATURE_COLUMNS])
+
+    # 아파트의 비교 단지 (가까운 순, 미리 계산된 이웃)
+    def similar(self, apartment, k=5):
+        if apartment not in self.names:
+            return pd.DataFrame(columns=["아파트", "거리"] + FEATURE_COLUMNS)
+
+        pos = self.names.get_loc(apartment)
+        found = self.neighbors[pos] >= 0
+        neighbors = self.neighbors[pos][found][:k]
+        result = self.features.iloc[neighbors].reset_index()
+        result.insert(1, "거리", self.distances[pos][found][:k])
+        return result
+
+    # 임의 특성 값에 가까운 아파트 (전체 스캔)
+    def query(self, features, k=5):
+        z = self._standardize(pd.DataFrame([features], columns=FEATURE_COLUMNS))[0]
+        d = np.sqrt(((self.matrix - z) ** 2).sum(axis=1))
+        nearest = np.argsort(d, kind="stable")[:k]
+        result = self.features.iloc[nearest].reset_index()
+        result.insert(1, "거리", d[nearest])
+        return result
+
+    # 새 특성 표로 다시 맞춘 표준화 기준이 현재 기준에서 DRIFT 넘게 벗어났는지 여부
+    def drifted(self, features, drift=DRIFT):
+        center, scale = fit_scaling(features)
+        with np.errstate(invalid="ignore"):
+            moved = np.abs(np.nan_to_num(center - self.center)) > drift * self.scale
+            rescaled = np.abs(scale / self.scale - 1) > drift
+        return bool((moved | rescaled).any())
+
+    # 새 특성 표로 갱신한 인덱스 (표준화 기준 유지)
+    # - 특성이 바뀌었거나 새로 생긴 아파트, 이웃 목록에 바뀐/사라진 아파트가 있는 아파트: 다시 계산
+    # - 나머지 아파트: 기존 이웃과 바뀐 아파트까지의 거리만 비교하여 병합
+    def update(self, features):
+        previous = self.features.reindex(features.index)
+        old_pos = self.names.get_indexer(features.index)
+        same = ((previous == features) | (previous.isna() & features.isna())).all(axis=1).to_numpy() & (old_pos >= 0)
+        changed = np.flatnonzero(~same)
+        n = len(features)
+
+        # 표준화 행렬만 새로 만들고 이웃 목록은 아래에서 채움
+        neighbors = np.full((n, NEIGHBORS), -1, dtype=np.int64)
+        distances = np.full((n, NEIGHBORS), np.inf)
+        updated = SimilarityIndex(features, self.center, self.scale, neighbors, distances)
+
+        # 기존 이웃 위치를 새 위치로 변환 (사라진 아파트는 -1)
+        new_of_old = np.full(len(self.names), -1, dtype=np.int64)
+        new_of_old[old_pos[old_pos >= 0]] = np.flatnonzero(old_pos >= 0)
+
+        kept = np.flatnonzero(same)
+        old_neighbors = self.neighbors[old_pos[kept]]
+        mapped = np.where(old_neighbors >= 0, new_of_old[np.maximum(old_neighbors, 0)], -1)
+
+        # 이웃 중 바뀌었거나 사라진 아파트가 있으면 다시 계산
+        stale = ((old_neighbors >= 0) & (mapped < 0)).any(axis=1) | (~same[np.maximum(mapped, 0)] & (mapped >= 0)).any(axis=1)
+        recompute = np.union1d(changed, kept[stale])
+        merge = kept[~stale]
+
+        neighbors[merge] = mapped[~stale]
+        distances[merge] = self.distances[old_pos[merge]]
+
+        if len(recompute):
+            neighbors[recompute], distances[recompute] = _top_k(updated.matrix, recompute, NEIGHBORS)
+
+        # 바뀐 아파트가 기존 이웃보다 가까우면 교체
+        if len(changed) and len(merge):
+            matrix = updated.matrix
+            for start in range(0, len(merge), BLOCK_ROWS):
+                rows = merge[start:start + BLOCK_ROWS]
+                d = np.sqrt(np.maximum(
+                    (matrix[rows] ** 2).sum(axis=1)[:, None] + (matrix[changed] ** 2).sum(axis=1)[None, :] - 2 * matrix[rows] @ matrix[changed].T,
+                    0,
+                ))
+                candidates = np.concatenate([neighbors[rows], np.broadcast_to(changed, d.shape)], axis=1)
+                candidate_d = np.concatenate([distances[rows], d], axis=1)
+                order = np.argsort(candidate_d, axis=1, kind="stable")[:, :NEIGHBORS]
+                neighbors[rows] = np.take_along_axis(candidates, order, axis=1)
+                distances[rows] = np.take_along_axis(candidate_d, order, axis=1)
+        return updated
+
+
+# 인덱스 저장 (특성, 표준화 기준, 이웃 목록, 버전 파일은 마지막에 교체)
+# - key: 특성 표 해시 (features_hash)
+def save_index(index, version, similar_dir=SIMILAR_DIR, key=None):
+    if not os.path.exists(similar_dir):
+        os.makedirs(similar_dir)
+
+    index.features.reset_index().to_parquet(os.path.join(similar_dir, "features.parquet"), index=False)
+    np.savez(os.path.join(similar_dir, "neighbors.npz"), neighbors=index.neighbors, distances=index.distances)
+
+    path = os.path.join(similar_dir, VERSION_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({
+            "version": version,
+            "key": features_hash(index.features) if key is None else key,
+            "center": index.center.tolist(),
+            "scale": index.scale.tolist(),
+            "features": FEATURE_COLUMNS,
+        }, f)
+    os.replace(path + ".tmp", path)
+
+
+# 저장된 인덱스와 그 특성 표 해시 (없거나 특성 구성이 다르면 (None, None))
+def load_index(similar_dir=SIMILAR_DIR):
+    path = os.path.join(similar_dir, VERSION_NAME)
+    if not os.path.exists(path):
+        return None, None
+
+    with open(path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    if saved.get("features") != FEATURE_COLUMNS:
+        return None, None
+
+    features = pd.read_parquet(os.path.join(similar_dir, "features.parquet")).set_index("아파트")
+    arrays = np.load(os.path.join(similar_dir, "neighbors.npz"))
+    index = SimilarityIndex(features, saved["center"], saved["scale"], arrays["neighbors"], arrays["distances"])
+    return index, saved.get("key")
+
+
+# 데이터 버전의 인덱스
+# - 특성 표(집계 테이블 + 아파트 정보)가 저장된 것과 같으면 저장된 인덱스
+# - 다르면 바뀐 아파트만 갱신, 저장된 인덱스가 없거나 표준화 기준이 많이 바뀌었으면 새로 생성
+def load(tables, info, version, similar_dir=SIMILAR_DIR):
+    index, saved = load_index(similar_dir)
+    features = build_features(tables, info)
+    key = features_hash(features)
+    if index is not None and saved == key:
+        return index
+
+    if index is None or index.drifted(features):
+        index = SimilarityIndex(features)
+    else:
+        index = index.update(features)
+    if version is not None:
+        save_index(index, version, similar_dir, key)
+    return index
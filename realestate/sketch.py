@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from realestate.storage import DATE_COLUMN
+
+# 로그 버킷 분위수 스케치 (DDSketch 방식)
+# - 값 x는 버킷 ceil(log_γ(x))에 들어가며, 버킷 대표값의 상대 오차는 RELATIVE_ACCURACY 이내
+# - 같은 버킷끼리 건수를 더하면 병합되므로 월별 스케치를 임의 기간으로 합칠 수 있음
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+
+BUCKET_COLUMN = "버킷"
+COUNT_COLUMN = "건수"
+GROUP_COLUMNS = [DATE_COLUMN, "아파트", "평형대"]
+SKETCH_COLUMNS = GROUP_COLUMNS + [BUCKET_COLUMN, COUNT_COLUMN]
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+# 가격(양수) → 버킷 번호
+def bucket_index(values):
+    return np.ceil(np.log(np.asarray(values, dtype=np.float64)) / _LOG_GAMMA).astype(np.int32)
+
+
+# 버킷 번호 → 대표값 (버킷 구간의 상대 오차 중앙)
+def bucket_value(index):
+    return 2 * np.power(_GAMMA, np.asarray(index, dtype=np.float64)) / (_GAMMA + 1)
+
+
+# 개별 거래를 (월, 아파트, 평형대, 버킷) 별 건수 스케치로 변환
+def build_sketch(deals, price_column="거래금액(억)"):
+    prices = deals[price_column].to_numpy(dtype=np.float64)
+    valid = prices > 0
+
+    buckets = deals.loc[valid, GROUP_COLUMNS].assign(**{BUCKET_COLUMN: bucket_index(prices[valid])})
+    sketch = (
+        buckets.groupby(GROUP_COLUMNS + [BUCKET_COLUMN], observed=True, sort=True)
+        .size()
+        .rename(COUNT_COLUMN)
+        .reset_index()
+    )
+    sketch[COUNT_COLUMN] = sketch[COUNT_COLUMN].astype(np.int32)
+    return sketch
+
+
+# 스케치 병합 (같은 그룹/버킷 건수 합산), keys로 병합 단위 지정
+def merge_sketches(sketch, keys=GROUP_COLUMNS):
+    return (
+        sketch.groupby(list(keys) + [BUCKET_COLUMN], observed=True, sort=True)[COUNT_COLUMN]
+        .sum()
+        .reset_index()
+    )
+
+
+# 그룹별 분위수를 한 번에 계산
+# - keys: 결과 그룹 (기본: 아파트, 평형대 → 기간 전체 병합 / 날짜 포함 시 월별)
+# - start/end: 포함할 월 키 범위
+def sketch_quantiles(sketch, quantiles=DEFAULT_QUANTILES, keys=("아파트", "평형대"), start=None, end=None):
+    keys = list(keys)
+    columns = keys + ["거래 건수"] + [f"p{round(q * 100)}" for q in quantiles]
+
+    if start is not None:
+        sketch = sketch[sketch[DATE_COLUMN] >= start]
+    if end is not None:
+        sketch = sketch[sketch[DATE_COLUMN] <= end]
+    if sketch.empty:
+        return pd.DataFrame(columns=columns)
+
+    merged = merge_sketches(sketch, keys)
+    counts = merged[COUNT_COLUMN].to_numpy(dtype=np.int64)
+    buckets = merged[BUCKET_COLUMN].to_numpy()
+
+    # 그룹 시작 위치 (merged는 keys, 버킷 순으로 정렬됨)
+    group_ids = merged.groupby(keys, observed=True, sort=False).ngroup().to_numpy()
+    group_starts = np.flatnonzero(np.diff(group_ids, prepend=-1) != 0)
+
+    cumulative = np.cumsum(counts)
+    group_totals = np.add.reduceat(counts, group_starts)
+    before = cumulative[group_starts] - counts[group_starts]
+
+    result = merged[keys].iloc[group_starts].reset_index(drop=True)
+    result["거래 건수"] = group_totals
+    for q in quantiles:
+        # 그룹 내 순위 q·(n-1)보다 누적 건수가 처음으로 커지는 버킷
+        rank = before + np.floor(q * (group_totals - 1)).astype(np.int64)
+        positions = np.searchsorted(cumulative, rank, side="right")
+        result[f"p{round(q * 100)}"] = bucket_value(buckets[positions])
+
+    return result[columns]
@@ -0,0 +1,186 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+
+# 데이터 파일 경로
+DATA_DIR = "data"
+CSV_PATH = os.path.join(DATA_DIR, "real_estate_data.csv")
+PARQUET_PATH = os.path.join(DATA_DIR, "real_estate_data.parquet")
+
+# 거래 데이터 스키마
+DATE_COLUMN = "날짜"
+CATEGORY_COLUMNS = ["아파트", "평형대"]
+PRICE_COLUMNS = ["최저가(억)", "최고가(억)"]
+REQUIRED_COLUMNS = [DATE_COLUMN] + CATEGORY_COLUMNS + PRICE_COLUMNS
+
+# (월, 아파트, 평형대) 별 거래 건수 (선택 컬럼, 건수를 모르는 행은 NaN)
+VOLUME_COLUMN = "거래 건수"
+STORE_COLUMNS = REQUIRED_COLUMNS + [VOLUME_COLUMN]
+
+# 월 키 = 연도 * 12 + (월 - 1), int32
+_EPOCH_MONTH_KEY = 1970 * 12
+
+
+# 날짜 값('YYYY-MM' 문자열, datetime, Period)을 int32 월 키로 변환
+def to_month_key(values):
+    series = pd.Series(values, copy=False)
+
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.to_numpy(dtype=np.int32)
+
+    if isinstance(series.dtype, pd.PeriodDtype):
+        return (series.dt.year * 12 + series.dt.month - 1).to_numpy(dtype=np.int32)
+
+    dates = pd.to_datetime(series)
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=np.int32)
+
+
+# 월 키를 datetime64 (해당 월 1일)로 변환 - 차트 x축용
+def month_key_to_datetime(keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    return (keys - _EPOCH_MONTH_KEY).astype("datetime64[M]").astype("datetime64[ns]")
+
+
+# 월 키를 'YYYY-MM' 문자열로 변환 - 화면 표시용
+def month_key_to_label(key):
+    key = int(key)
+    return f"{key // 12:04d}-{key % 12 + 1:02d}"
+
+
+# 존재하는 스키마 컬럼에 고정 타입 적용 (컬럼 일부만 읽은 경우 포함)
+def apply_schema(data):
+    typed = data.copy(deep=False)
+
+    if DATE_COLUMN in typed.columns:
+        typed[DATE_COLUMN] = to_month_key(typed[DATE_COLUMN])
+
+    for col in CATEGORY_COLUMNS:
+        if col in typed.columns and not isinstance(typed[col].dtype, pd.CategoricalDtype):
+            typed[col] = typed[col].astype("category")
+
+    for col in PRICE_COLUMNS + [VOLUME_COLUMN]:
+        if col in typed.columns:
+            typed[col] = pd.to_numeric(typed[col], errors="coerce").astype(np.float32, copy=False)
+
+    return typed.reset_index(drop=True)
+
+
+# 임의의 거래 DataFrame을 고정 스키마로 정규화 (required: 필수 컬럼, 전월세 등 다른 테이블은 따로 지정)
+def normalize_frame(data, required=REQUIRED_COLUMNS):
+    missing = [col for col in required if col not in data.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 누락되었습니다: {', '.join(missing)}")
+
+    return apply_schema(data)
+
+
+# 컬럼형 저장소(Parquet)에 기록
+def write_store(data, path=PARQUET_PATH):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    normalize_frame(data).to_parquet(path, index=False)
+
+
+# 컬럼형 저장소 로드 (columns로 필요한 컬럼만 읽기, 파일에 없는 선택 컬럼은 건너뜀)
+def read_store(path=PARQUET_PATH, columns=None):
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in available]
+    # 다른 도구로 기록된 파일도 동일한 타입으로 맞춤
+    return apply_schema(pd.read_parquet(path, columns=columns))
+
+
+# CSV 로드 후 스키마 적용
+def read_csv(path=CSV_PATH, columns=None):
+    data = pd.read_csv(path, usecols=columns)
+    if columns is None:
+        return normalize_frame(data)
+    return apply_schema(data)
+
+
+# 여러 DataFrame 연결 (category 컬럼은 카테고리를 합쳐 category로 유지)
+def concat_frames(frames):
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return normalize_frame(pd.DataFrame(columns=REQUIRED_COLUMNS))
+
+    category_columns = [col for col in CATEGORY_COLUMNS if col in frames[0].columns]
+    result = pd.concat([frame.drop(columns=category_columns) for frame in frames], ignore_index=True)
+    for col in category_columns:
+        merged = union_categoricals([frame[col].astype("category").cat.as_unordered() for frame in frames])
+        result.insert(frames[0].columns.get_loc(col), col, merged)
+
+    return result
+
+
+# 기존 방식 (타입 변환 없음)
+def _read_csv_untyped(path, columns=None):
+    return pd.read_csv(path, usecols=columns)
+
+
+# 로드 시간과 메모리 사용량 측정 (typed=False 이면 기존 pd.read_csv 방식)
+def measure_load(path, columns=None, typed=True):
+    if not typed:
+        reader = _read_csv_untyped
+    elif path.endswith(".parquet"):
+        reader = read_store
+    else:
+        reader = read_csv
+
+    start = time.perf_counter()
+    data = reader(path, columns=columns)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "path": path,
+        "typed": typed,
+        "columns": list(data.columns),
+        "rows": len(data),
+        "load_seconds": elapsed,
+        "memory_bytes": int(data.memory_usage(deep=True).sum()),
+    }
+
+
+def _print_measurement(result):
+    mode = "스키마 적용" if result["typed"] else "기존 방식"
+    print(
+        f"{result['path']} ({mode}): {result['rows']:,}행, "
+        f"{result['load_seconds'] * 1000:.1f}ms, "
+        f"{result['memory_bytes'] / 1024:,.1f}KB "
+        f"({', '.join(result['columns'])})"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="실거래가 컬럼형 저장소 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="CSV를 Parquet 저장소로 변환")
+    convert.add_argument("--csv", default=CSV_PATH)
+    convert.add_argument("--parquet", default=PARQUET_PATH)
+
+    compare = subparsers.add_parser("compare", help="CSV와 Parquet 로드 성능 비교")
+    compare.add_argument("--csv", default=CSV_PATH)
+    compare.add_argument("--parquet", default=PARQUET_PATH)
+    compare.add_argument("--columns", nargs="*", default=None, help="읽을 컬럼 (미지정 시 전체)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        write_store(pd.read_csv(args.csv), args.parquet)
+        print(f"{args.csv} -> {args.parquet} 변환 완료")
+    elif args.command == "compare":
+        _print_measurement(measure_load(args.csv, columns=args.columns, typed=False))
+        for path in (args.csv, args.parquet):
+            _print_measurement(measure_load(path, columns=args.columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+# 1평 = 3.3058㎡
+PYEONG_M2 = 3.3058
+
+# 전용면적 → 공급면적 환산 비율 (아파트 평균 전용률 약 75% 기준)
+SUPPLY_AREA_RATIO = 1.33
+
+# 평형대 구분 (공급면적 평 기준, 하한 포함)
+SIZE_BAND_EDGES = [0, 30, 50, 70, np.inf]
+SIZE_BANDS = ["20평대 이하", "30-40평대", "50-60평대", "70평대 이상"]
+
+# 평형대별 대표 평수 (평당 가격 계산용 대략값)
+BAND_PYEONG = {"20평대 이하": 25, "30-40평대": 35, "50-60평대": 55, "70평대 이상": 80}
+
+
+# 만원 단위 금액(숫자 또는 "82,500" 등 문자열)을 억 단위로 변환
+def manwon_to_eok(values):
+    values = pd.Series(values, copy=False)
+    if not pd.api.types.is_numeric_dtype(values.dtype):
+        text = values.astype(str).str.replace(",", "", regex=False)
+        values = pd.to_numeric(text, errors="coerce")
+    return values / 10000
+
+
+# ㎡ → 평
+def m2_to_pyeong(area_m2):
+    return np.asarray(area_m2, dtype=np.float64) / PYEONG_M2
+
+
+# 전용면적(㎡)으로 평형대 구분
+def size_band(exclusive_area_m2, supply_ratio=SUPPLY_AREA_RATIO):
+    pyeong = m2_to_pyeong(exclusive_area_m2) * supply_ratio
+    return pd.cut(pyeong, SIZE_BAND_EDGES, labels=SIZE_BANDS, right=False, ordered=False)
+
+
+# 평형대(카테고리) → 대표 평수 배열, 모르는 평형대는 NaN
+def band_pyeong(bands):
+    bands = pd.Series(bands, copy=False).astype("category")
+    lookup = np.array([BAND_PYEONG.get(band, np.nan) for band in bands.cat.categories] + [np.nan], dtype=np.float64)
+    return lookup[bands.cat.codes.to_numpy()]
@@ -1,14 +1,39 @@
+import time
+
+# 실행 시간 측정 시작 (첫 실행에는 import 시간 포함)
+APP_START = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
+from types import SimpleNamespace
+import copy
+import logging
 import os
 import json
 
+from collections import deque
+
+from realestate import aggregates, analytics, anomaly, comovement, deals, forecast, geo, ingest, kpi, memory, metadata, profiling, rentals, similar, sketch, storage
+import views
+
+logger = logging.getLogger(__name__)
+IMPORT_DONE = time.perf_counter()
+
+# 캐시된 공유 데이터에서 파생된 DataFrame은 수정 시에만 복사 (세션 간 공유 데이터 보호)
+pd.set_option("mode.copy_on_write", True)
+
+# 진단 정보(메모리 사용량 등) 사이드바 표시 여부
+DIAGNOSTICS = os.environ.get("REALESTATE_DIAGNOSTICS", "") not in ("", "0")
+
+# 구간별 실행 시간 프로파일링 (사이드바 패널 + JSON lines 로그)
+PROFILE = os.environ.get("REALESTATE_PROFILE", "") not in ("", "0")
+PROFILE_LOG = os.environ.get("REALESTATE_PROFILE_LOG", os.path.join(storage.DATA_DIR, "profile.jsonl"))
+
+profiler = profiling.Profiler(PROFILE, start=APP_START)
+profiler.lap("import")
+
 # 페이지 설정
 st.set_page_config(
     page_title="부산 해운대구 우동 아파트 실거래가 분석",
@@ -17,30 +42,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 데이터 로드 함수
-@st.cache_data
-def load_data():
-    # 데이터 파일 경로
-    data_path = 'data/real_estate_data.csv'
-    
-    # 데이터 디렉토리가 없으면 생성
-    if not os.path.exists('data'):
-        os.makedirs('data')
-    
-    # 실제 데이터 파일이 있는 경우 로드
-    if os.path.exists(data_path):
-        try:
-            data = pd.read_csv(data_path)
-            # 데이터 유효성 검사
-            required_columns = ['날짜', '아파트', '평형대', '최저가(억)', '최고가(억)']
-            if not all(col in data.columns for col in required_columns):
-                raise ValueError("필수 컬럼이 누락되었습니다.")
-            return data
-        except Exception as e:
-            st.error(f"데이터 로드 중 오류 발생: {str(e)}")
-            st.info("샘플 데이터를 생성합니다.")
-    
-    # 샘플 데이터 생성
+# 저장소 모드: auto(CSV 변경분을 월별 파티션 저장소에 반영 후 로드), parquet(저장소만 사용), csv
+STORAGE_MODE = os.environ.get("REALESTATE_STORAGE", "auto")
+
+# 샘플 데이터 생성 함수
+def create_sample_data(save_path=None):
     try:
         apartments = [
             "두산위브더제니스", "해운대아이파크", "해운대경동제이드", "더샵센텀파크"
@@ -81,16 +87,163 @@ def load_data():
         # DataFrame 생성
         df = pd.DataFrame(data)
         
+        # 월별 거래 건수
+        df[storage.VOLUME_COLUMN] = np.random.randint(0, 6, len(df))
+        
         # 샘플 데이터 저장
-        df.to_csv(data_path, index=False)
+        if save_path:
+            df.to_csv(save_path, index=False)
         
-        return df
+        return storage.normalize_frame(df)
     except Exception as e:
         st.error(f"샘플 데이터 생성 중 오류 발생: {str(e)}")
-        return pd.DataFrame(columns=['날짜', '아파트', '평형대', '최저가(억)', '최고가(억)'])
+        return storage.normalize_frame(pd.DataFrame(columns=storage.REQUIRED_COLUMNS))
+
+# 월 파티션 로드 함수 (내용 해시가 같으면 캐시 재사용, 프로세스 내 공유)
+@st.cache_resource
+def load_partition(path, partition_hash):
+    return storage.read_store(path)
+
+# 데이터 동기화 함수 (CSV 변경분만 저장소에 반영하고 데이터 버전 반환)
+def sync_data():
+    # 데이터 파일 경로
+    data_path = storage.CSV_PATH
+    
+    # 데이터 디렉토리가 없으면 생성
+    if not os.path.exists('data'):
+        os.makedirs('data')
+    
+    # 데이터 파일이 없으면 샘플 데이터 생성
+    if STORAGE_MODE != "parquet" and not os.path.exists(data_path):
+        create_sample_data(data_path)
+    
+    try:
+        if STORAGE_MODE == "parquet":
+            return ingest.load_manifest()["version"]
+        if STORAGE_MODE == "csv":
+            stat = os.stat(data_path)
+            return f"csv:{stat.st_size}:{stat.st_mtime_ns}"
+        return ingest.sync_csv(data_path)["version"]
+    except Exception as e:
+        st.error(f"데이터 동기화 중 오류 발생: {str(e)}")
+        return None
+
+# 집계 테이블로 큐브 생성 후 읽기 전용 설정
+def shared_data(tables):
+    return memory.freeze(analytics.dataset(tables))
+
+# 데이터 로드 함수 (데이터 버전별 캐시, 집계 테이블과 사전 인덱스 큐브 생성)
+# - 저장된 집계 테이블이 같은 버전이면 그대로 사용, 아니면 계산 후 저장
+# - 모든 세션이 같은 읽기 전용 큐브를 공유 (세션별 역직렬화/복사 없음)
+@st.cache_resource(max_entries=2)
+def load_data(version):
+    if version is not None:
+        try:
+            tables = aggregates.load_tables(version)
+            if tables is None:
+                if STORAGE_MODE == "csv":
+                    data = storage.read_csv(storage.CSV_PATH)
+                else:
+                    data = storage.concat_frames([load_partition(path, partition_hash) for path, partition_hash in ingest.partitions()])
+                tables = aggregates.build_tables(data)
+                
+                try:
+                    aggregates.save_tables(tables, version)
+                except Exception as e:
+                    st.warning(f"집계 테이블 저장 중 오류 발생: {str(e)}")
+            return shared_data(tables)
+        except Exception as e:
+            st.error(f"데이터 로드 중 오류 발생: {str(e)}")
+    
+    st.info("샘플 데이터를 생성합니다.")
+    return shared_data(aggregates.build_tables(create_sample_data()))
+
+# 분위수 스케치 로드 함수 (스케치 버전별 캐시, 프로세스 내 공유)
+@st.cache_resource(max_entries=2)
+def load_sketches(version):
+    try:
+        return deals.read_sketches()
+    except Exception as e:
+        st.error(f"분위수 스케치 로드 중 오류 발생: {str(e)}")
+        return pd.DataFrame(columns=sketch.SKETCH_COLUMNS)
+
+# 이상 거래 검토 대기 목록 로드 함수 (검토 대기 저장소 버전별 캐시, 프로세스 내 공유)
+@st.cache_resource(max_entries=2)
+def load_quarantine(version):
+    try:
+        return memory.freeze(anomaly.read_quarantine())
+    except Exception as e:
+        st.error(f"이상 거래 목록 로드 중 오류 발생: {str(e)}")
+        return pd.DataFrame(columns=anomaly.QUARANTINE_COLUMNS)
 
-# 아파트 정보 로드 함수
-@st.cache_data
+# 프로세스 단위 실행 시간 기록 (첫 실행 = 콜드 스타트)
+@st.cache_resource
+def startup_stats():
+    return {}
+
+# 프로세스 단위 최근 재실행 지연 시간 (프로파일링 히스토그램용)
+@st.cache_resource
+def rerun_latencies():
+    return deque(maxlen=1000)
+
+# 기본 아파트 정보 (파일이 없을 때 생성, 예전 파일에 없는 필드를 채우는 데도 사용)
+DEFAULT_APARTMENT_INFO = {
+    "두산위브더제니스": {
+        "세대수": "1,788세대",
+        "동수": "3동",
+        "사용승인일": "2011.11.30",
+        "면적": "148.11㎡ ~ 325.3㎡",
+        "매매가": "11.8억 ~ 80억",
+        "전세가": "5.8억 ~ 20억",
+        "주소": "부산광역시 해운대구 우동",
+        "위도": 35.1563,
+        "경도": 129.1453,
+        "이미지": "https://raw.githubusercontent.com/username/repo/main/images/dusan_zenith.jpg",
+        "설명": "두산위브더제니스는 해운대 마린시티에 위치한 초고층 아파트로, 해운대 해변과 광안대교의 탁트인 전망을 자랑합니다. 총 1,788세대, 3개 동으로 구성되어 있으며, 2011년 11월에 사용 승인되었습니다."
+    },
+    "해운대아이파크": {
+        "세대수": "1,631세대",
+        "동수": "3동",
+        "사용승인일": "2011.11.03",
+        "면적": "118.45㎡ ~ 411.1㎡",
+        "매매가": "8억 ~ 75억",
+        "전세가": "4.5억 ~ 22억",
+        "주소": "부산광역시 해운대구 우동",
+        "위도": 35.1561,
+        "경도": 129.1427,
+        "이미지": "https://raw.githubusercontent.com/username/repo/main/images/ipark.jpg",
+        "설명": "해운대아이파크는 해운대 마린시티에 위치한 초고층 아파트로, 해운대 해변과 광안대교의 탁트인 전망을 자랑합니다. 총 1,631세대, 3개 동으로 구성되어 있으며, 2011년 11월에 사용 승인되었습니다."
+    },
+    "해운대경동제이드": {
+        "세대수": "278세대",
+        "동수": "3동",
+        "사용승인일": "2012.11.19",
+        "면적": "169.91㎡ ~ 330.56㎡",
+        "매매가": "25억 ~ 90억",
+        "전세가": "12.5억",
+        "주소": "부산광역시 해운대구 우동",
+        "위도": 35.1589,
+        "경도": 129.1473,
+        "이미지": "https://raw.githubusercontent.com/username/repo/main/images/jade.jpg",
+        "설명": "해운대경동제이드는 해운대 우동에 위치한 고급 아파트로, 278세대, 3개 동으로 구성되어 있습니다. 2012년 11월에 사용 승인되었으며, 넓은 평형대와 고급 인테리어로 프리미엄을 유지하고 있습니다."
+    },
+    "더샵센텀파크": {
+        "세대수": "정보 제한적",
+        "동수": "정보 제한적",
+        "사용승인일": "정보 제한적",
+        "면적": "85㎡ ~ 135㎡ (추정)",
+        "매매가": "3억 ~ 7.5억",
+        "전세가": "정보 제한적",
+        "주소": "부산광역시 해운대구 우동",
+        "위도": 35.1737,
+        "경도": 129.1285,
+        "이미지": "https://raw.githubusercontent.com/username/repo/main/images/thesharp.jpg",
+        "설명": "더샵센텀파크는 해운대구 우동에 위치한 아파트로, 센텀시티 인근에 위치하여 교통과 생활 편의성이 좋습니다. 다른 아파트들에 비해 상대적으로 저렴한 가격대를 형성하고 있습니다."
+    }
+}
+
+# 아파트 정보 로드 함수 (프로세스 내 공유)
+@st.cache_resource
 def load_apartment_info():
     try:
         # 아파트 정보 파일 경로
@@ -100,50 +253,15 @@ def load_apartment_info():
         if os.path.exists(info_path):
             with open(info_path, 'r', encoding='utf-8') as f:
                 apartment_info = json.load(f)
-        else:
-            # 기본 아파트 정보
+            
+            # 예전에 저장된 파일에 없는 필드(주소, 위도, 경도 등)는 기본 정보로 채움 (파일 값 우선)
             apartment_info = {
-                "두산위브더제니스": {
-                    "세대수": "1,788세대",
-                    "동수": "3동",
-                    "사용승인일": "2011.11.30",
-                    "면적": "148.11㎡ ~ 325.3㎡",
-                    "매매가": "11.8억 ~ 80억",
-                    "전세가": "5.8억 ~ 20억",
-                    "이미지": "https://raw.githubusercontent.com/username/repo/main/images/dusan_zenith.jpg",
-                    "설명": "두산위브더제니스는 해운대 마린시티에 위치한 초고층 아파트로, 해운대 해변과 광안대교의 탁트인 전망을 자랑합니다. 총 1,788세대, 3개 동으로 구성되어 있으며, 2011년 11월에 사용 승인되었습니다."
-                },
-                "해운대아이파크": {
-                    "세대수": "1,631세대",
-                    "동수": "3동",
-                    "사용승인일": "2011.11.03",
-                    "면적": "118.45㎡ ~ 411.1㎡",
-                    "매매가": "8억 ~ 75억",
-                    "전세가": "4.5억 ~ 22억",
-                    "이미지": "https://raw.githubusercontent.com/username/repo/main/images/ipark.jpg",
-                    "설명": "해운대아이파크는 해운대 마린시티에 위치한 초고층 아파트로, 해운대 해변과 광안대교의 탁트인 전망을 자랑합니다. 총 1,631세대, 3개 동으로 구성되어 있으며, 2011년 11월에 사용 승인되었습니다."
-                },
-                "해운대경동제이드": {
-                    "세대수": "278세대",
-                    "동수": "3동",
-                    "사용승인일": "2012.11.19",
-                    "면적": "169.91㎡ ~ 330.56㎡",
-                    "매매가": "25억 ~ 90억",
-                    "전세가": "12.5억",
-                    "이미지": "https://raw.githubusercontent.com/username/repo/main/images/jade.jpg",
-                    "설명": "해운대경동제이드는 해운대 우동에 위치한 고급 아파트로, 278세대, 3개 동으로 구성되어 있습니다. 2012년 11월에 사용 승인되었으며, 넓은 평형대와 고급 인테리어로 프리미엄을 유지하고 있습니다."
-                },
-                "더샵센텀파크": {
-                    "세대수": "정보 제한적",
-                    "동수": "정보 제한적",
-                    "사용승인일": "정보 제한적",
-                    "면적": "85㎡ ~ 135㎡ (추정)",
-                    "매매가": "3억 ~ 7.5억",
-                    "전세가": "정보 제한적",
-                    "이미지": "https://raw.githubusercontent.com/username/repo/main/images/thesharp.jpg",
-                    "설명": "더샵센텀파크는 해운대구 우동에 위치한 아파트로, 센텀시티 인근에 위치하여 교통과 생활 편의성이 좋습니다. 다른 아파트들에 비해 상대적으로 저렴한 가격대를 형성하고 있습니다."
-                }
+                name: {**DEFAULT_APARTMENT_INFO.get(name, {}), **info}
+                for name, info in apartment_info.items()
             }
+        else:
+            # 기본 아파트 정보
+            apartment_info = copy.deepcopy(DEFAULT_APARTMENT_INFO)
             
             # 데이터 디렉토리가 없으면 생성
             if not os.path.exists('data'):
@@ -164,9 +282,86 @@ def load_apartment_info():
         st.error(f"아파트 정보 로드 중 오류 발생: {str(e)}")
         return {}
 
+# 아파트 정보를 타입 지정 테이블로 한 번만 변환 (프로세스 내 공유)
+@st.cache_resource
+def load_apartment_table():
+    return memory.freeze(metadata.info_table(load_apartment_info()))
+
+# 아파트 위치 인덱스 (반경/구·동 검색, 프로세스 내 공유)
+@st.cache_resource
+def load_geo_index():
+    return geo.GeoIndex(load_apartment_table())
+
+# 시계열×월별 전세가율 (매매 월별 평균가와 전월세 요약 as-of 조인, 데이터/전월세 버전별 캐시)
+@st.cache_resource(max_entries=2)
+def load_jeonse_ratios(version, rental_version):
+    _, tables = load_data(version)
+    return memory.freeze(rentals.jeonse_ratios(tables["monthly"], rentals.read_rentals()))
+
+# 주요 지표 계산 함수 (데이터/스케치/전월세 버전별 캐시, 프로세스 내 공유)
+@st.cache_resource(max_entries=2)
+def load_kpis(version, sketch_version, rental_version):
+    cube, _ = load_data(version)
+    ratios = load_jeonse_ratios(version, rental_version)
+    return kpi.compute(cube, load_apartment_table(), load_sketches(sketch_version), ratios)
+
+# 단지×평형대별 평당/㎡당 가격 (데이터 버전별 캐시, 프로세스 내 공유)
+@st.cache_resource(max_entries=2)
+def load_unit_prices(version):
+    _, tables = load_data(version)
+    return memory.freeze(analytics.unit_prices(tables, load_apartment_table()))
+
+# 시계열별 가격 예측 (데이터 버전별로 적합 결과를 저장/재사용, 프로세스 내 공유)
+@st.cache_resource(max_entries=2)
+def load_forecasts(version):
+    cube, _ = load_data(version)
+    try:
+        params = forecast.load(cube, version)
+    except OSError as e:
+        logger.warning("예측 모델 적합 결과 저장 실패: %s", e)
+        params = forecast.fit(cube)
+    return memory.freeze((params, forecast.predict(params)))
+
+# 비교 단지 인덱스 (데이터 버전이 바뀌면 바뀐 아파트만 갱신하여 저장, 프로세스 내 공유)
+@st.cache_resource(max_entries=2)
+def load_similar(version):
+    _, tables = load_data(version)
+    try:
+        return similar.load(tables, load_apartment_table(), version)
+    except OSError as e:
+        logger.warning("비교 단지 인덱스 저장 실패: %s", e)
+        return similar.SimilarityIndex(similar.build_features(tables, load_apartment_table()))
+
+# 시계열 간 수익률 누적 합 (데이터 버전이 바뀌면 새 월만 반영하여 저장, 프로세스 내 공유)
+@st.cache_resource(max_entries=2)
+def load_comovement(version):
+    cube, _ = load_data(version)
+    try:
+        return comovement.load(cube, version)
+    except OSError as e:
+        logger.warning("동조화 누적 합 저장 실패: %s", e)
+        return comovement.build(cube)
+
 # 데이터 로드
-data = load_data()
+load_start = time.perf_counter()
+data_version = sync_data()
+sketch_version = ingest.load_manifest(deals.SKETCH_DIR)["version"]
+rental_version = ingest.load_manifest(rentals.RENTAL_DIR)["version"]
+quarantine_version = ingest.load_manifest(anomaly.QUARANTINE_DIR)["version"]
+cube, tables = load_data(data_version)
+data = cube.data
 apartment_info = load_apartment_info()
+sketches = load_sketches(sketch_version)
+quarantine = load_quarantine(quarantine_version)
+kpis = load_kpis(data_version, sketch_version, rental_version)
+jeonse_ratios = load_jeonse_ratios(data_version, rental_version)
+unit_prices = load_unit_prices(data_version)
+forecast_params, forecasts = load_forecasts(data_version)
+similar_index = load_similar(data_version)
+comovement_sums = load_comovement(data_version)
+geo_index = load_geo_index()
+load_seconds = time.perf_counter() - load_start
+profiler.lap("데이터 로드", rows=len(data))
 
 # 사이드바
 st.sidebar.title("부산 해운대구 우동 아파트")
@@ -180,668 +375,142 @@ menu = st.sidebar.radio(
 
 # 필터 옵션
 st.sidebar.subheader("필터 옵션")
+
+# 지역 선택 (아파트 정보의 주소 기준 구/동, 전체는 위치 정보가 없는 단지 포함, 주소가 있는 단지가 없으면 표시하지 않음)
+districts = geo_index.district_names()
+selected_district = None
+if districts:
+    selected_district = st.sidebar.selectbox(
+        "지역 선택",
+        options=[None] + districts,
+        format_func=lambda district: "전체" if district is None else " ".join(district)
+    )
+
+apartment_options = data["아파트"].unique().tolist()
+if selected_district is not None:
+    in_district = set(geo_index.in_district(*selected_district))
+    apartment_options = [apt for apt in apartment_options if apt in in_district]
+
 selected_apartments = st.sidebar.multiselect(
     "아파트 선택",
-    options=data["아파트"].unique(),
-    default=data["아파트"].unique()
+    options=apartment_options,
+    default=apartment_options
 )
 
 selected_sizes = st.sidebar.multiselect(
     "평형대 선택",
-    options=data["평형대"].unique(),
-    default=data["평형대"].unique()
+    options=data["평형대"].unique().tolist(),
+    default=data["평형대"].unique().tolist()
+)
+
+# 비교 기간 (월 키, 전체는 선택 영역의 첫 거래월과 마지막 거래월 비교)
+# - 직접 선택은 시계열별로 구간 안의 첫 거래월과 마지막 거래월 비교 (큐브의 누적 배열에서 조회)
+# - 전년 동월 대비/전분기 대비는 기준 월과 12/3개월 전 월을 그대로 비교 (period_exact, 두 월 모두 거래가 있는 시계열만)
+months = cube.months.tolist()
+period_mode = st.sidebar.radio(
+    "비교 기간",
+    ["전체", "직접 선택", "전년 동월 대비", "전분기 대비"] if len(months) > 1 else ["전체"],
+    horizontal=True
 )
 
+period_start, period_end = None, None
+period_exact = period_mode in ("전년 동월 대비", "전분기 대비")
+if period_mode == "직접 선택":
+    period_start, period_end = st.sidebar.select_slider(
+        "기간",
+        options=months,
+        value=(months[0], months[-1]),
+        format_func=storage.month_key_to_label
+    )
+elif period_mode != "전체":
+    period_end = st.sidebar.select_slider(
+        "기준 월",
+        options=months,
+        value=months[-1],
+        format_func=storage.month_key_to_label
+    )
+    period_start = period_end - (12 if period_mode == "전년 동월 대비" else 3)
+
 # 필터링된 데이터
 try:
     if not selected_apartments or not selected_sizes:
         st.warning("아파트와 평형대를 모두 선택해주세요.")
-        filtered_data = pd.DataFrame(columns=data.columns)
+        filtered_data = data.iloc[:0]
     else:
-        filtered_data = data[
-            (data["아파트"].isin(selected_apartments)) &
-            (data["평형대"].isin(selected_sizes))
-        ]
+        filtered_data = analytics.filter_rows(cube, selected_apartments, selected_sizes)
         
         if filtered_data.empty:
             st.warning("선택한 조건에 맞는 데이터가 없습니다.")
 except Exception as e:
     st.error(f"데이터 필터링 중 오류 발생: {str(e)}")
-    filtered_data = pd.DataFrame(columns=data.columns)
+    filtered_data = data.iloc[:0]
+profiler.lap("사이드바 필터", rows=len(filtered_data))
 
 # 최종 업데이트 날짜
 st.sidebar.markdown("---")
 st.sidebar.write(f"최종 업데이트: {datetime.now().strftime('%Y-%m-%d')}")
 
-# 개요 페이지
-if menu == "개요":
-    st.title("부산 해운대구 우동 아파트 실거래가 분석")
-    
-    st.markdown("""
-    <div style="background-color:#f8f9fa; padding:20px; border-radius:10px;">
-    <h3>해운대구 우동 아파트 시장 개요</h3>
-    <p>부산 해운대구 우동 지역의 주요 프리미엄 아파트 실거래가 정보와 시장 분석 데이터를 제공합니다.</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # 주요 지표
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="조사 대상 아파트",
-            value="4개",
-            help="두산위브더제니스, 해운대아이파크, 해운대경동제이드, 더샵센텀파크"
-        )
-    
-    with col2:
-        st.metric(
-            label="평균 상승률",
-            value="5.2%",
-            delta="0.8%",
-            help="최근 6개월 기준 평균 가격 상승률"
-        )
-    
-    with col3:
-        st.metric(
-            label="최고가 거래",
-            value="90억",
-            help="해운대경동제이드 70평대 이상 최고가"
-        )
-    
-    with col4:
-        st.metric(
-            label="총 세대수",
-            value="3,697+",
-            help="조사 대상 아파트 합계 (일부 정보 제한적)"
-        )
-    
-    # 최근 시장 동향
-    st.subheader("최근 시장 동향")
-    
-    st.info("""
-    해운대구 우동 지역 아파트 실거래가는 지난 6개월간 평균 5.2% 상승했으며, 
-    특히 70평대 이상 대형 평형에서 상승세가 두드러집니다. 
-    해운대경동제이드의 70평대 이상 평형이 지난 6개월간 가장 높은 상승률(8.5%)을 보였습니다.
-    """)
-    
-    # 아파트별 평균 가격 차트
-    st.subheader("아파트별 평균 가격")
-    
-    # 평균 가격 계산
-    avg_prices = filtered_data.groupby(["아파트", "평형대"]).agg({
-        "최저가(억)": "mean",
-        "최고가(억)": "mean"
-    }).reset_index()
-    
-    avg_prices["평균가(억)"] = (avg_prices["최저가(억)"] + avg_prices["최고가(억)"]) / 2
-    
-    # Plotly로 차트 생성
-    fig = px.bar(
-        avg_prices,
-        x="아파트",
-        y="평균가(억)",
-        color="평형대",
-        barmode="group",
-        title="아파트별 평균 가격 (평형대별)",
-        labels={"평균가(억)": "평균 가격 (억원)", "아파트": "아파트명"},
-        color_discrete_sequence=px.colors.qualitative.Set1
-    )
-    
-    fig.update_layout(
-        legend_title="평형대",
-        xaxis_title="아파트명",
-        yaxis_title="평균 가격 (억원)",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # 관련 뉴스
-    st.subheader("관련 뉴스")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        **부산 해운대구 아파트 가격 상승세 지속**  
-        *2025년 3월 30일*  
-        부산 해운대구 아파트 가격이 지난달 대비 0.8% 상승하며 상승세를 이어가고 있습니다.
-        """)
-        
-        st.markdown("""
-        **해운대 초고층 아파트, 희소성 높아 프리미엄 유지**  
-        *2025년 3월 15일*  
-        해운대 마린시티 일대 초고층 아파트는 희소성으로 인해 가격 하락 압력에도 프리미엄을 유지하고 있습니다.
-        """)
-    
-    with col2:
-        st.markdown("""
-        **부산 부동산 시장, 대형 평형 중심으로 회복세**  
-        *2025년 2월 28일*  
-        부산 지역 부동산 시장이 대형 평형을 중심으로 회복세를 보이고 있으며, 특히 해운대구와 수영구에서 거래가 활발합니다.
-        """)
-        
-        st.markdown("""
-        **해운대구 우동 아파트, 전세가율 하락세**  
-        *2025년 2월 15일*  
-        해운대구 우동 지역 아파트의 전세가율이 평균 48.3%로 하락세를 보이고 있습니다.
-        """)
-
-# 가격 추이 페이지
-elif menu == "가격 추이":
-    st.title("아파트별 실거래가 추이")
-    
-    # 평형대 선택
-    size_for_trend = st.selectbox(
-        "평형대 선택",
-        options=data["평형대"].unique()
-    )
-    
-    # 선택된 평형대의 데이터 필터링
-    size_data = filtered_data[filtered_data["평형대"] == size_for_trend]
-    
-    # 아파트별 가격 추이 차트
-    st.subheader(f"{size_for_trend} 실거래가 추이")
-    
-    # 아파트별로 그룹화하여 시계열 데이터 생성
-    apartments = size_data["아파트"].unique()
-    
-    # Plotly로 차트 생성
-    fig = go.Figure()
-    
-    for apt in apartments:
-        apt_data = size_data[size_data["아파트"] == apt].sort_values("날짜")
-        
-        # 평균 가격 계산
-        apt_data["평균가(억)"] = (apt_data["최저가(억)"] + apt_data["최고가(억)"]) / 2
-        
-        fig.add_trace(go.Scatter(
-            x=apt_data["날짜"],
-            y=apt_data["평균가(억)"],
-            mode='lines+markers',
-            name=apt,
-            hovertemplate='%{y:.1f}억원'
-        ))
-    
-    fig.update_layout(
-        title=f"{size_for_trend} 아파트별 평균 가격 추이",
-        xaxis_title="날짜",
-        yaxis_title="평균 가격 (억원)",
-        hovermode="x unified",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # 가격 범위 차트
-    st.subheader("가격 범위 (최저가-최고가)")
-    
-    # 최신 데이터만 필터링
-    latest_date = filtered_data["날짜"].max()
-    latest_data = filtered_data[
-        (filtered_data["날짜"] == latest_date) &
-        (filtered_data["평형대"] == size_for_trend)
-    ]
-    
-    # Plotly로 차트 생성
-    fig = go.Figure()
-    
-    for apt in latest_data["아파트"]:
-        apt_row = latest_data[latest_data["아파트"] == apt].iloc[0]
-        
-        fig.add_trace(go.Bar(
-            x=[apt],
-            y=[apt_row["최고가(억)"] - apt_row["최저가(억)"]],
-            base=apt_row["최저가(억)"],
-            name=apt,
-            text=[f"{apt_row['최저가(억)']:.1f}억 ~ {apt_row['최고가(억)']:.1f}억"],
-            hoverinfo="text"
-        ))
-    
-    fig.update_layout(
-        title=f"{size_for_trend} 아파트별 가격 범위 (최신 데이터 기준)",
-        xaxis_title="아파트명",
-        yaxis_title="가격 (억원)",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # 주요 변동 사항
-    st.subheader("주요 변동 사항")
-    
-    # 첫 데이터와 마지막 데이터 비교하여 변동률 계산
-    first_date = filtered_data["날짜"].min()
-    
-    changes = []
-    
-    for apt in apartments:
-        apt_first = filtered_data[
-            (filtered_data["아파트"] == apt) &
-            (filtered_data["평형대"] == size_for_trend) &
-            (filtered_data["날짜"] == first_date)
-        ]
-        
-        apt_last = filtered_data[
-            (filtered_data["아파트"] == apt) &
-            (filtered_data["평형대"] == size_for_trend) &
-            (filtered_data["날짜"] == latest_date)
-        ]
-        
-        if not apt_first.empty and not apt_last.empty:
-            first_avg = (apt_first["최저가(억)"].iloc[0] + apt_first["최고가(억)"].iloc[0]) / 2
-            last_avg = (apt_last["최저가(억)"].iloc[0] + apt_last["최고가(억)"].iloc[0]) / 2
-            
-            change_pct = ((last_avg - first_avg) / first_avg) * 100
-            
-            changes.append({
-                "아파트": apt,
-                "변동률(%)": change_pct,
-                "첫 평균가(억)": first_avg,
-                "최신 평균가(억)": last_avg
-            })
-    
-    changes_df = pd.DataFrame(changes).sort_values("변동률(%)", ascending=False)
-    
-    # 변동률 표시
-    for i, row in enumerate(changes_df.itertuples()):
-        col1, col2 = st.columns([1, 3])
-        
-        with col1:
-            st.markdown(f"**{row.아파트}**")
-        
-        with col2:
-            if row._3 > 0:
-                st.markdown(f"<span style='color:green'>▲ {row._3:.1f}% 상승</span> ({row._4:.1f}억 → {row._5:.1f}억)", unsafe_allow_html=True)
-            elif row._3 < 0:
-                st.markdown(f"<span style='color:red'>▼ {abs(row._3):.1f}% 하락</span> ({row._4:.1f}억 → {row._5:.1f}억)", unsafe_allow_html=True)
-            else:
-                st.markdown(f"변동 없음 ({row._4:.1f}억)")
-        
-        if i < len(changes_df) - 1:
-            st.markdown("---")
-    
-    # 인사이트
-    if changes:
-        max_change = changes_df.iloc[0]
-        
-        if max_change["변동률(%)"] > 0:
-            st.info(f"{size_for_trend}에서 {max_change['아파트']}가 지난 6개월간 가장 높은 상승률({max_change['변동률(%)']:.1f}%)을 보였습니다.")
-        else:
-            st.warning(f"{size_for_trend}에서 모든 아파트가 하락세를 보이고 있습니다.")
+# 활성 세션 수 (Streamlit 런타임 정보가 없으면 None)
+def active_sessions():
+    try:
+        return st.runtime.get_instance()._session_mgr.num_active_sessions()
+    except Exception:
+        return None
 
-# 평수별 비교 페이지
-elif menu == "평수별 비교":
-    st.title("평수별 가격 비교 분석")
-    
-    # 아파트 선택
-    apt_for_comparison = st.selectbox(
-        "아파트 선택",
-        options=filtered_data["아파트"].unique()
-    )
-    
-    # 선택된 아파트의 데이터 필터링
-    apt_data = filtered_data[filtered_data["아파트"] == apt_for_comparison]
-    
-    # 최신 데이터만 필터링
-    latest_date = apt_data["날짜"].max()
-    latest_apt_data = apt_data[apt_data["날짜"] == latest_date]
-    
-    # 평수별 가격 비교 차트
-    st.subheader(f"{apt_for_comparison} 평수별 가격 비교")
-    
-    # Plotly로 차트 생성
-    fig = go.Figure()
-    
-    for size in latest_apt_data["평형대"]:
-        size_row = latest_apt_data[latest_apt_data["평형대"] == size].iloc[0]
-        
-        fig.add_trace(go.Bar(
-            x=[size],
-            y=[size_row["최고가(억)"] - size_row["최저가(억)"]],
-            base=size_row["최저가(억)"],
-            name=size,
-            text=[f"{size_row['최저가(억)']:.1f}억 ~ {size_row['최고가(억)']:.1f}억"],
-            hoverinfo="text"
-        ))
-    
-    fig.update_layout(
-        title=f"{apt_for_comparison} 평수별 가격 범위 (최신 데이터 기준)",
-        xaxis_title="평형대",
-        yaxis_title="가격 (억원)",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # 평수별 가격 추이
-    st.subheader("평수별 가격 추이")
-    
-    # Plotly로 차트 생성
-    fig = go.Figure()
-    
-    for size in apt_data["평형대"].unique():
-        size_data = apt_data[apt_data["평형대"] == size].sort_values("날짜")
-        
-        # 평균 가격 계산
-        size_data["평균가(억)"] = (size_data["최저가(억)"] + size_data["최고가(억)"]) / 2
-        
-        fig.add_trace(go.Scatter(
-            x=size_data["날짜"],
-            y=size_data["평균가(억)"],
-            mode='lines+markers',
-            name=size,
-            hovertemplate='%{y:.1f}억원'
-        ))
-    
-    fig.update_layout(
-        title=f"{apt_for_comparison} 평수별 평균 가격 추이",
-        xaxis_title="날짜",
-        yaxis_title="평균 가격 (억원)",
-        hovermode="x unified",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # 평당 가격 분석
-    st.subheader("평당 가격 분석")
-    
-    # 평형대별 평당 가격 계산 (대략적인 평수 기준)
-    pyeong_conversion = {
-        "30-40평대": 35,
-        "50-60평대": 55,
-        "70평대 이상": 80
-    }
-    
-    price_per_pyeong = []
-    
-    for _, row in latest_apt_data.iterrows():
-        avg_price = (row["최저가(억)"] + row["최고가(억)"]) / 2
-        pyeong = pyeong_conversion.get(row["평형대"], 0)
-        
-        if pyeong > 0:
-            price_per_pyeong.append({
-                "평형대": row["평형대"],
-                "평당 가격(만원)": (avg_price * 10000) / pyeong
-            })
-    
-    price_per_pyeong_df = pd.DataFrame(price_per_pyeong)
-    
-    if not price_per_pyeong_df.empty:
-        # Plotly로 차트 생성
-        fig = px.bar(
-            price_per_pyeong_df,
-            x="평형대",
-            y="평당 가격(만원)",
-            title=f"{apt_for_comparison} 평당 가격 (최신 데이터 기준)",
-            labels={"평당 가격(만원)": "평당 가격 (만원)", "평형대": "평형대"},
-            color="평형대",
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
-        
-        fig.update_layout(
-            xaxis_title="평형대",
-            yaxis_title="평당 가격 (만원)",
-            height=500
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 인사이트
-        max_price_per_pyeong = price_per_pyeong_df.loc[price_per_pyeong_df["평당 가격(만원)"].idxmax()]
-        min_price_per_pyeong = price_per_pyeong_df.loc[price_per_pyeong_df["평당 가격(만원)"].idxmin()]
-        
-        st.info(f"{apt_for_comparison}의 경우 {max_price_per_pyeong['평형대']}가 평당 {max_price_per_pyeong['평당 가격(만원)']:.0f}만원으로 가장 높고, {min_price_per_pyeong['평형대']}가 평당 {min_price_per_pyeong['평당 가격(만원)']:.0f}만원으로 가장 낮습니다.")
-        
-        if len(price_per_pyeong_df) > 1:
-            if price_per_pyeong_df["평당 가격(만원)"].is_monotonic_increasing:
-                st.success("평형이 클수록 평당 가격이 상승하는 추세를 보입니다.")
-            elif price_per_pyeong_df["평당 가격(만원)"].is_monotonic_decreasing:
-                st.success("평형이 클수록 평당 가격이 하락하는 추세를 보입니다.")
-            else:
-                st.success("평형별 평당 가격은 일정한 패턴을 보이지 않습니다.")
-
-# 아파트 상세 페이지
-elif menu == "아파트 상세":
-    st.title("아파트 상세 정보")
-    
-    # 아파트 선택
-    apt_for_detail = st.selectbox(
-        "아파트 선택",
-        options=filtered_data["아파트"].unique()
-    )
-    
-    # 선택된 아파트 정보
-    apt_info = apartment_info.get(apt_for_detail, {})
-    
-    if apt_info:
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
-            st.image(apt_info.get("이미지", "https://via.placeholder.com/400x300?text=No+Image"), caption=apt_for_detail)
-            
-            st.subheader("기본 정보")
-            
-            info_table = {
-                "세대수": apt_info.get("세대수", "정보 없음"),
-                "동수": apt_info.get("동수", "정보 없음"),
-                "사용승인일": apt_info.get("사용승인일", "정보 없음"),
-                "면적": apt_info.get("면적", "정보 없음"),
-                "매매가": apt_info.get("매매가", "정보 없음"),
-                "전세가": apt_info.get("전세가", "정보 없음")
-            }
-            
-            for key, value in info_table.items():
-                st.markdown(f"**{key}:** {value}")
-        
-        with col2:
-            st.subheader("아파트 설명")
-            st.write(apt_info.get("설명", "상세 설명이 없습니다."))
-            
-            # 선택된 아파트의 데이터 필터링
-            apt_data = filtered_data[filtered_data["아파트"] == apt_for_detail]
-            
-            st.subheader("평형별 시세")
-            
-            # 최신 데이터만 필터링
-            latest_date = apt_data["날짜"].max()
-            latest_apt_data = apt_data[apt_data["날짜"] == latest_date]
-            
-            # 평형별 시세 표시
-            for _, row in latest_apt_data.iterrows():
-                st.markdown(f"**{row['평형대']}:** {row['최저가(억)']:.1f}억 ~ {row['최고가(억)']:.1f}억")
-            
-            # 가격 추이 차트
-            st.subheader("가격 추이")
-            
-            # Plotly로 차트 생성
-            fig = go.Figure()
-            
-            for size in apt_data["평형대"].unique():
-                size_data = apt_data[apt_data["평형대"] == size].sort_values("날짜")
-                
-                # 평균 가격 계산
-                size_data["평균가(억)"] = (size_data["최저가(억)"] + size_data["최고가(억)"]) / 2
-                
-                fig.add_trace(go.Scatter(
-                    x=size_data["날짜"],
-                    y=size_data["평균가(억)"],
-                    mode='lines+markers',
-                    name=size,
-                    hovertemplate='%{y:.1f}억원'
-                ))
-            
-            fig.update_layout(
-                title=f"{apt_for_detail} 평형별 평균 가격 추이",
-                xaxis_title="날짜",
-                yaxis_title="평균 가격 (억원)",
-                hovermode="x unified",
-                height=400
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.error(f"{apt_for_detail}에 대한 상세 정보가 없습니다.")
+# 진단 정보: 메모리 사용량
+if DIAGNOSTICS:
+    with st.sidebar.expander("메모리 사용량"):
+        report = memory.memory_report([cube, tables, sketches, apartment_info], active_sessions())
+        st.write(f"공유 데이터: {memory.format_bytes(report['shared_bytes'])}")
+        if report["rss_bytes"] is not None:
+            st.write(f"프로세스 RSS: {memory.format_bytes(report['rss_bytes'])}")
+        if report["per_session_bytes"] is not None:
+            st.write(f"활성 세션: {report['sessions']}개")
+            st.write(f"세션당 오버헤드 (상한 추정): {memory.format_bytes(report['per_session_bytes'])}")
 
-# 시장 분석 페이지
-elif menu == "시장 분석":
-    st.title("시장 분석 및 전망")
-    
-    # 가격 상승률 분석
-    st.subheader("가격 상승률 분석")
-    
-    # 첫 데이터와 마지막 데이터 비교하여 변동률 계산
-    first_date = filtered_data["날짜"].min()
-    latest_date = filtered_data["날짜"].max()
-    
-    changes = []
+# fragment만 다시 실행된 페이지 구간 기록 (전체 실행과 같은 지연 시간 분포/로그에 구간 이름과 함께)
+def record_fragment(fragment_profiler, name):
+    if not PROFILE:
+        return
     
-    for apt in filtered_data["아파트"].unique():
-        for size in filtered_data["평형대"].unique():
-            apt_first = filtered_data[
-                (filtered_data["아파트"] == apt) &
-                (filtered_data["평형대"] == size) &
-                (filtered_data["날짜"] == first_date)
-            ]
-            
-            apt_last = filtered_data[
-                (filtered_data["아파트"] == apt) &
-                (filtered_data["평형대"] == size) &
-                (filtered_data["날짜"] == latest_date)
-            ]
-            
-            if not apt_first.empty and not apt_last.empty:
-                first_avg = (apt_first["최저가(억)"].iloc[0] + apt_first["최고가(억)"].iloc[0]) / 2
-                last_avg = (apt_last["최저가(억)"].iloc[0] + apt_last["최고가(억)"].iloc[0]) / 2
-                
-                change_pct = ((last_avg - first_avg) / first_avg) * 100
-                
-                changes.append({
-                    "아파트": apt,
-                    "평형대": size,
-                    "변동률(%)": change_pct,
-                    "첫 평균가(억)": first_avg,
-                    "최신 평균가(억)": last_avg
-                })
+    record = fragment_profiler.record(menu=menu, fragment=name)
+    rerun_latencies().append(record["total_seconds"])
     
-    changes_df = pd.DataFrame(changes).sort_values("변동률(%)", ascending=False)
-    
-    if not changes_df.empty:
-        # Plotly로 차트 생성
-        fig = px.bar(
-            changes_df,
-            x="아파트",
-            y="변동률(%)",
-            color="평형대",
-            barmode="group",
-            title="아파트별 가격 상승률 (평형대별)",
-            labels={"변동률(%)": "가격 변동률 (%)", "아파트": "아파트명"},
-            color_discrete_sequence=px.colors.qualitative.Set1
-        )
-        
-        fig.update_layout(
-            legend_title="평형대",
-            xaxis_title="아파트명",
-            yaxis_title="가격 변동률 (%)",
-            height=500
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 평형대별 평균 상승률
-        st.subheader("평형대별 평균 상승률")
-        
-        size_avg_changes = changes_df.groupby("평형대")["변동률(%)"].mean().reset_index()
-        
-        # Plotly로 차트 생성
-        fig = px.bar(
-            size_avg_changes,
-            x="평형대",
-            y="변동률(%)",
-            title="평형대별 평균 가격 상승률",
-            labels={"변동률(%)": "평균 가격 변동률 (%)", "평형대": "평형대"},
-            color="평형대",
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
-        
-        fig.update_layout(
-            xaxis_title="평형대",
-            yaxis_title="평균 가격 변동률 (%)",
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # 시장 전망
-    st.subheader("시장 전망")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("### 단기 전망 (3개월)")
-        st.write("""
-        해운대구 우동 지역 아파트 시장은 현재 안정적인 상승세를 유지하고 있으며, 
-        특히 70평대 이상 대형 평형에서 강세를 보이고 있습니다. 
-        단기적으로는 현재의 상승 추세가 유지될 것으로 예상됩니다.
-        """)
-        
-        st.markdown("### 중기 전망 (6개월~1년)")
-        st.write("""
-        금리 정책과 부동산 규제 변화에 따라 변동성이 있을 수 있으나, 
-        해운대 지역의 프리미엄 아파트는 상대적으로 안정적인 가격대를 유지할 것으로 전망됩니다. 
-        특히 두산위브더제니스와 해운대아이파크는 희소성으로 인해 가격 하락 압력에 상대적으로 강한 모습을 보일 것으로 예상됩니다.
-        """)
-    
-    with col2:
-        st.markdown("### 장기 전망 (1년 이상)")
-        st.write("""
-        부산 지역 개발 계획과 교통 인프라 확충에 따라 해운대구 우동 지역의 부동산 가치는 
-        장기적으로 상승할 가능성이 높습니다. 다만, 경기 변동과 정책 변화에 따른 리스크 요인을 고려해야 합니다.
-        """)
-        
-        st.warning("""
-        본 분석은 현재 시점의 데이터를 기반으로 한 예측이며, 실제 시장 상황은 다양한 요인에 의해 변동될 수 있습니다.
-        """)
-    
-    # 주요 시장 지표
-    st.subheader("주요 시장 지표")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="평균 매매가 상승률",
-            value="5.2%",
-            delta="0.8%",
-            help="최근 6개월 기준"
-        )
-    
-    with col2:
-        st.metric(
-            label="평균 전세가율",
-            value="48.3%",
-            delta="-1.2%",
-            delta_color="inverse",
-            help="매매가 대비 전세가 비율"
-        )
-    
-    with col3:
-        st.metric(
-            label="매물 회전율",
-            value="3.8%",
-            delta="0.5%",
-            help="월별 거래량 / 총 세대수"
-        )
-    
-    with col4:
-        st.metric(
-            label="평당 가격 상승률",
-            value="4.1%",
-            delta="0.6%",
-            help="최근 6개월 기준"
-        )
+    try:
+        profiling.append_jsonl(PROFILE_LOG, record)
+    except OSError as e:
+        logger.warning("프로파일 로그 기록 실패: %s", e)
+    logger.debug("fragment 재실행 (%s / %s): %.0fms", menu, name, record["total_seconds"] * 1000)
+
+# 선택된 페이지 렌더링 (페이지 모듈은 처음 선택될 때 import, 페이지 구간의 위젯은 그 구간만 다시 실행)
+render_start = time.perf_counter()
+views.render(menu, SimpleNamespace(
+    cube=cube,
+    tables=tables,
+    data=data,
+    filtered_data=filtered_data,
+    period_start=period_start,
+    period_end=period_end,
+    period_exact=period_exact,
+    selected_apartments=selected_apartments,
+    selected_sizes=selected_sizes,
+    apartment_info=apartment_info,
+    apartment_table=load_apartment_table(),
+    sketches=sketches,
+    quarantine=quarantine,
+    kpis=kpis,
+    jeonse_ratios=jeonse_ratios,
+    unit_prices=unit_prices,
+    forecast_params=forecast_params,
+    forecasts=forecasts,
+    similar_index=similar_index,
+    comovement=comovement_sums,
+    geo_index=geo_index,
+    profiler=profiler,
+    record_fragment=record_fragment
+))
+profiler.finish()
+render_seconds = time.perf_counter() - render_start
 
 # 푸터
 st.markdown("---")
@@ -851,3 +520,40 @@ st.markdown("""
 <p>데이터 출처: 네이버 부동산, 공공데이터 포털</p>
 </div>
 """, unsafe_allow_html=True)
+
+# 실행 시간 기록
+timings = {
+    "import": IMPORT_DONE - APP_START,
+    "데이터 로드": load_seconds,
+    "페이지 렌더링": render_seconds,
+    "전체": time.perf_counter() - APP_START
+}
+stats = startup_stats()
+if "cold_start" not in stats:
+    stats["cold_start"] = timings
+    logger.info("콜드 스타트 (%s): %s", menu, ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in timings.items()))
+else:
+    logger.debug("재실행 (%s): %s", menu, ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in timings.items()))
+
+# 프로파일링: 구간별 실행 시간, 재실행 지연 시간 분포, JSON lines 로그
+if PROFILE:
+    record = profiler.record(menu=menu, data_rows=len(data), filtered_rows=len(filtered_data))
+    latencies = rerun_latencies()
+    latencies.append(record["total_seconds"])
+    
+    try:
+        profiling.append_jsonl(PROFILE_LOG, record)
+    except OSError as e:
+        logger.warning("프로파일 로그 기록 실패: %s", e)
+    
+    with st.sidebar.expander("프로파일링"):
+        st.write(f"이번 실행: {record['total_seconds'] * 1000:,.0f}ms")
+        st.dataframe(
+            pd.DataFrame(record["sections"]).assign(ms=lambda df: df["seconds"] * 1000).drop(columns="seconds"),
+            hide_index=True,
+            use_container_width=True
+        )
+        
+        labels, counts = profiling.latency_histogram(latencies)
+        st.write(f"재실행 지연 시간 분포 (최근 {len(latencies)}회, p50 {np.percentile(latencies, 50) * 1000:,.0f}ms / p95 {np.percentile(latencies, 95) * 1000:,.0f}ms)")
+        st.bar_chart(pd.DataFrame({"구간": pd.Categorical(labels, categories=labels, ordered=True), "횟수": counts}), x="구간", y="횟수")
@@ -0,0 +1,18 @@
+import importlib
+
+# 메뉴 이름 → 페이지 모듈 (선택된 페이지 모듈만 처음 열릴 때 import)
+PAGES = {
+    "개요": "views.overview",
+    "가격 추이": "views.trend",
+    "평수별 비교": "views.size_compare",
+    "아파트 상세": "views.detail",
+    "시장 분석": "views.market",
+}
+
+
+# 선택된 페이지 렌더링 (페이지 import/나머지 구간은 context.profiler에 기록)
+def render(menu, context):
+    page = importlib.import_module(PAGES[menu])
+    context.profiler.lap(f"{menu} import")
+    page.render(context)
+    context.profiler.lap(f"{menu} 기타")
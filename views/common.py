@@ -0,0 +1,67 @@
+import functools
+from types import SimpleNamespace
+
+import streamlit as st
+
+from realestate import charts, profiling, storage
+
+# 페이지 공통 표시 형식
+
+# 퍼센트 값 표시 (값이 없으면 "-")
+def percent(value):
+    return "-" if value is None else f"{value:.1f}%"
+
+
+# 지표 변화량 표시 (변화량이 없으면 None → st.metric에서 표시하지 않음)
+def delta(value, unit="%p"):
+    return None if value is None else f"{value:+.1f}{unit}"
+
+
+# 비교 기간 표시 (전체 기간이면 "전체 기간", 두 월 비교이면 "시작 월 대비 기준 월")
+def period_label(context):
+    if context.period_end is None:
+        return "전체 기간"
+    start = storage.month_key_to_label(context.period_start)
+    end = storage.month_key_to_label(context.period_end)
+    if context.period_exact:
+        return f"{start} 대비 {end}"
+    return f"{start} ~ {end}"
+
+
+# 비교 기간 변동률을 시계열별 구간 안 첫/마지막 거래월로 계산하는지 여부 (직접 선택)
+# - 전체 기간과 두 월 비교(전년 동월/전분기 대비)는 모든 시계열을 같은 두 월로 비교
+def per_series(context):
+    return context.period_end is not None and not context.period_exact
+
+
+# Plotly 차트 표시 (프로파일링 중이면 전송 구간에 figure JSON 크기 기록)
+# - 크기 측정(직렬화) 시간은 별도 구간으로 분리하여 전송 시간에 섞이지 않게 함
+def plotly_chart(fig, profiler, name):
+    nbytes = None
+    if profiler.enabled:
+        nbytes = charts.payload_bytes(fig)
+        profiler.lap(f"{name} 크기 측정")
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    profiler.lap(f"{name} 전송", nbytes=nbytes)
+
+
+# 페이지 구간을 fragment로 실행 (구간 안의 위젯을 바꾸면 스크립트 전체가 아니라 그 구간만 다시 실행)
+# - 구간 함수는 context와 구간 입력을 인자로 받음 (다시 실행될 때는 마지막 전체 실행 때의 인자 그대로)
+# - 전체 실행 중에는 페이지 프로파일러에 그대로 기록
+# - 구간만 다시 실행될 때는 새 프로파일러로 측정하여 context.record_fragment(profiler, name)로 따로 기록
+def fragment(name):
+    def decorator(func):
+        @st.fragment
+        @functools.wraps(func)
+        def wrapper(context, *args, **kwargs):
+            if not context.profiler.finished:
+                return func(context, *args, **kwargs)
+            
+            profiler = profiling.Profiler(context.profiler.enabled)
+            func(SimpleNamespace(**{**vars(context), "profiler": profiler}), *args, **kwargs)
+            profiler.finish()
+            context.record_fragment(profiler, name)
+        return wrapper
+    return decorator
@@ -0,0 +1,140 @@
+import streamlit as st
+import numpy as np
+
+from realestate import analytics, charts, similar
+from views.common import fragment, plotly_chart
+
+
+# 아파트 상세 페이지
+def render(context):
+    st.title("아파트 상세 정보")
+    
+    _apartment_section(context)
+
+
+# 아파트 구간 (아파트를 바꾸면 이 구간만 다시 실행)
+@fragment("아파트 구간")
+def _apartment_section(context):
+    cube = context.cube
+    tables = context.tables
+    filtered_data = context.filtered_data
+    selected_sizes = context.selected_sizes
+    apartment_info = context.apartment_info
+    similar_index = context.similar_index
+    profiler = context.profiler
+    
+    # 아파트 선택
+    apt_for_detail = st.selectbox(
+        "아파트 선택",
+        options=filtered_data["아파트"].unique().tolist()
+    )
+    
+    # 선택된 아파트 정보
+    apt_info = apartment_info.get(apt_for_detail, {})
+    
+    if apt_info:
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            st.image(apt_info.get("이미지", "https://via.placeholder.com/400x300?text=No+Image"), caption=apt_for_detail)
+            
+            st.subheader("기본 정보")
+            
+            info_table = {
+                "세대수": apt_info.get("세대수", "정보 없음"),
+                "동수": apt_info.get("동수", "정보 없음"),
+                "사용승인일": apt_info.get("사용승인일", "정보 없음"),
+                "면적": apt_info.get("면적", "정보 없음"),
+                "매매가": apt_info.get("매매가", "정보 없음"),
+                "전세가": apt_info.get("전세가", "정보 없음")
+            }
+            
+            for key, value in info_table.items():
+                st.markdown(f"**{key}:** {value}")
+            
+            # 주변 단지 (아파트 정보의 좌표 기준, 격자 인덱스로 반경 검색)
+            st.subheader("주변 단지")
+            
+            _nearby_section(context, apt_for_detail)
+        
+        with col2:
+            st.subheader("아파트 설명")
+            st.write(apt_info.get("설명", "상세 설명이 없습니다."))
+            
+            # 선택된 아파트의 평형대별 최신 시세 (미리 계산된 최신 시세 테이블)
+            latest_apt_data = analytics.latest_prices(tables, apt_for_detail, selected_sizes)
+            
+            st.subheader("평형별 시세")
+            
+            # 평형별 시세 표시
+            for size, low, high in zip(latest_apt_data["평형대"], latest_apt_data["최저가(억)"], latest_apt_data["최고가(억)"]):
+                st.markdown(f"**{size}:** {low:.1f}억 ~ {high:.1f}억")
+            
+            # 가격 추이 차트
+            st.subheader("가격 추이")
+            
+            # 선택된 아파트의 평형대별 시계열 (긴 형식)
+            apt_data = cube.select([apt_for_detail], selected_sizes)
+            
+            # Plotly로 차트 생성 (긴 형식 데이터에서 한 번에, 긴 시계열은 줄여서 전송)
+            fig = charts.line_figure(
+                apt_data,
+                y="평균가(억)",
+                color="평형대",
+                hovertemplate='%{y:.1f}억원',
+                title=f"{apt_for_detail} 평형별 평균 가격 추이",
+                xaxis_title="날짜",
+                yaxis_title="평균 가격 (억원)",
+                hovermode="x unified",
+                height=400
+            )
+            
+            profiler.lap("추이 차트 생성", rows=len(apt_data))
+            
+            plotly_chart(fig, profiler, "추이 차트")
+            
+            # 비교 단지 (가격 수준, 평당 가격, 평형 구성, 연식, 세대수, 최근 변동률 기준 미리 계산된 이웃)
+            st.subheader("비슷한 단지")
+            
+            comparables = similar_index.similar(apt_for_detail, k=5)
+            profiler.lap("비교 단지 조회", rows=len(comparables))
+            
+            if comparables.empty:
+                st.info("비교할 수 있는 단지가 없습니다.")
+            else:
+                st.dataframe(
+                    comparables[["아파트", "거리", "평당 가격", "연식", "최근 변동률"]].rename(columns={
+                        "평당 가격": "평당 가격(만원)",
+                        "연식": "연식(년)",
+                        "최근 변동률": "12개월 변동률(%)"
+                    }),
+                    hide_index=True,
+                    column_config={
+                        "거리": st.column_config.NumberColumn(format="%.2f"),
+                        "평당 가격(만원)": st.column_config.NumberColumn(format="%.0f"),
+                        "연식(년)": st.column_config.NumberColumn(format="%.1f"),
+                        "12개월 변동률(%)": st.column_config.NumberColumn(format="%.1f")
+                    }
+                )
+                st.caption(f"특성 {len(similar.FEATURE_COLUMNS)}개를 표준화한 거리 기준 (작을수록 비슷함)")
+    else:
+        st.error(f"{apt_for_detail}에 대한 상세 정보가 없습니다.")
+
+
+# 주변 단지 구간 (반경을 바꾸면 이 목록만 다시 실행)
+@fragment("주변 단지 구간")
+def _nearby_section(context, apt_for_detail):
+    if not context.geo_index.has_location(apt_for_detail):
+        st.info("위치 정보(위도/경도)가 없어 주변 단지를 찾을 수 없습니다.")
+        return
+    
+    radius_km = st.select_slider("반경 (km)", options=[0.5, 1.0, 2.0, 3.0], value=1.0)
+    nearby = analytics.nearby_prices(context.geo_index, context.unit_prices, apt_for_detail, radius_km)
+    context.profiler.lap("주변 단지 검색", rows=len(nearby))
+    
+    if nearby.empty:
+        st.info("반경 안에 위치 정보가 있는 다른 단지가 없습니다.")
+    else:
+        for name, distance, per_pyeong in zip(nearby["아파트"], nearby["거리(km)"], nearby["평당 가격(만원)"]):
+            price = "" if np.isnan(per_pyeong) else f", 평당 {per_pyeong:,.0f}만원"
+            st.markdown(f"**{name}:** {distance:.2f}km{price}")
@@ -0,0 +1,296 @@
+import streamlit as st
+import numpy as np
+import plotly.express as px
+
+from realestate import aggregates, analytics, charts, comovement, forecast, kpi, rentals
+from realestate.changes import price_changes
+from views.common import delta, fragment, per_series, percent, period_label, plotly_chart
+
+
+# 시장 분석 페이지
+def render(context):
+    cube = context.cube
+    selected_apartments = context.selected_apartments
+    selected_sizes = context.selected_sizes
+    profiler = context.profiler
+    kpis = context.kpis
+    period = kpis["period_months"]
+    
+    st.title("시장 분석 및 전망")
+    
+    # 가격 상승률 분석
+    st.subheader(f"가격 상승률 분석 ({period_label(context)})")
+    
+    # 비교 기간의 처음과 끝 비교하여 변동률 계산 (전체 시계열 일괄 계산, 직접 선택 시 시계열별 구간 안 첫/마지막 거래월)
+    changes_df = price_changes(
+        cube,
+        selected_apartments,
+        selected_sizes,
+        start=context.period_start,
+        end=context.period_end,
+        per_series=per_series(context)
+    )
+    profiler.lap("변동률 계산", rows=len(changes_df))
+    
+    if not changes_df.empty:
+        # Plotly로 차트 생성
+        fig = px.bar(
+            changes_df,
+            x="아파트",
+            y="변동률(%)",
+            color="평형대",
+            barmode="group",
+            title="아파트별 가격 상승률 (평형대별)",
+            labels={"변동률(%)": "가격 변동률 (%)", "아파트": "아파트명"},
+            color_discrete_sequence=px.colors.qualitative.Set1
+        )
+        
+        fig.update_layout(
+            legend_title="평형대",
+            xaxis_title="아파트명",
+            yaxis_title="가격 변동률 (%)",
+            height=500
+        )
+        
+        profiler.lap("변동률 차트 생성", rows=len(changes_df))
+        
+        plotly_chart(fig, profiler, "변동률 차트")
+        
+        # 평형대별 평균 상승률
+        st.subheader("평형대별 평균 상승률")
+        
+        size_avg_changes = changes_df.groupby("평형대", observed=True)["변동률(%)"].mean().reset_index()
+        
+        # Plotly로 차트 생성
+        fig = px.bar(
+            size_avg_changes,
+            x="평형대",
+            y="변동률(%)",
+            title="평형대별 평균 가격 상승률",
+            labels={"변동률(%)": "평균 가격 변동률 (%)", "평형대": "평형대"},
+            color="평형대",
+            color_discrete_sequence=px.colors.qualitative.Set2
+        )
+        
+        fig.update_layout(
+            xaxis_title="평형대",
+            yaxis_title="평균 가격 변동률 (%)",
+            height=400
+        )
+        
+        profiler.lap("평형대별 차트 생성", rows=len(size_avg_changes))
+        
+        plotly_chart(fig, profiler, "평형대별 차트")
+    
+    # 기간 요약 (누적 배열에서 시계열당 상수 번 조회, 기간을 바꿔도 거래 데이터를 다시 읽지 않음)
+    summary = analytics.range_summary(cube, selected_apartments, selected_sizes, context.period_start, context.period_end, context.period_exact)
+    profiler.lap("기간 요약 계산", rows=len(summary))
+    
+    if not summary.empty:
+        with st.expander(f"기간 요약 ({period_label(context)})"):
+            st.dataframe(
+                summary,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "기간 평균가(억)": st.column_config.NumberColumn(format="%.2f", help="거래가 있는 달의 평균가 평균"),
+                    "변동률(%)": st.column_config.NumberColumn(format="%+.1f%%", help="기간 안 첫 거래월 대비 마지막 거래월"),
+                }
+            )
+    
+    # 단지 간 동조화 (월간 수익률 상관계수/베타, 데이터 버전별 누적 합에서 계산, 비슷하게 움직이는 시계열끼리 모아서 표시)
+    sums = context.comovement
+    positions = comovement.select(sums, selected_apartments, selected_sizes)
+    if len(positions) >= 2:
+        st.subheader("단지 간 동조화")
+        
+        _comovement_section(context, positions)
+    
+    # 시장 전망
+    st.subheader("시장 전망")
+    
+    col1, col2 = st.columns(2)
+    
+    # 선택된 시계열의 기간별 예상 변동률 (데이터 버전별로 미리 적합된 예측 모델 기준)
+    outlook = forecast.outlook(context.forecast_params, context.forecasts, selected_apartments, selected_sizes)
+    profiler.lap("전망 계산", rows=int(outlook["시계열 수"].fillna(0).max()))
+    
+    with col1:
+        for title, horizons in (("단기 전망 (3개월)", [3]), ("중기 전망 (6개월~1년)", [6, 12])):
+            st.markdown(f"### {title}")
+            
+            rows = outlook[outlook["개월"].isin(horizons)].dropna(subset=["예상 변동률(%)"])
+            if rows.empty:
+                st.write("예측에 필요한 최근 거래 데이터가 부족합니다.")
+                continue
+            
+            metric_cols = st.columns(len(rows))
+            for metric_col, row in zip(metric_cols, rows.to_dict("records")):
+                with metric_col:
+                    st.metric(
+                        label=f"{row['개월']}개월 후 예상 변동률",
+                        value=f"{row['예상 변동률(%)']:+.1f}%",
+                        help=f"{forecast.INTERVAL:.0%} 예측 구간 {row['하한(%)']:+.1f}% ~ {row['상한(%)']:+.1f}% (시계열 {int(row['시계열 수'])}개 평균)"
+                    )
+            
+            change = rows["예상 변동률(%)"].iloc[-1]
+            direction = "상승" if change > 0.5 else "하락" if change < -0.5 else "보합"
+            st.write(
+                f"최근 가격 추세를 감쇠 추세 모델로 연장하면 선택된 아파트의 평균가는 "
+                f"{int(rows['개월'].iloc[-1])}개월 후 {change:+.1f}% 변동({direction})할 것으로 예상됩니다."
+            )
+    
+    with col2:
+        st.markdown("### 장기 전망 (1년 이상)")
+        st.write("""
+        부산 지역 개발 계획과 교통 인프라 확충에 따라 해운대구 우동 지역의 부동산 가치는 
+        장기적으로 상승할 가능성이 높습니다. 다만, 경기 변동과 정책 변화에 따른 리스크 요인을 고려해야 합니다.
+        """)
+        
+        st.warning("""
+        본 분석은 현재 시점의 데이터를 기반으로 한 예측이며, 실제 시장 상황은 다양한 요인에 의해 변동될 수 있습니다.
+        """)
+    
+    # 주요 시장 지표 (데이터 버전별로 미리 계산, 변화량은 직전 기간 대비)
+    st.subheader("주요 시장 지표")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="평균 매매가 상승률",
+            value=percent(kpis.get("avg_change")),
+            delta=delta(kpi.delta(kpis, "avg_change")),
+            help=f"최근 {period}개월 기준 (직전 {period}개월 대비)"
+        )
+    
+    with col2:
+        st.metric(
+            label="평균 전세가율",
+            value=percent(kpis.get("jeonse_ratio")),
+            delta=delta(kpi.delta(kpis, "jeonse_ratio")),
+            delta_color="inverse",
+            help=(
+                f"매매 평균가 대비 전세 보증금 비율 (전월세 실거래 기준, 최근 {period}개월 평균)"
+                if kpis.get("jeonse_ratio_source") == "rentals"
+                else "매매가 대비 전세가 비율 (아파트 정보의 가격 범위 중간값 기준)"
+            )
+        )
+    
+    with col3:
+        st.metric(
+            label="매물 회전율",
+            value=percent(kpis.get("turnover")),
+            delta=delta(kpi.delta(kpis, "turnover")),
+            help="월별 거래 건수 / 총 세대수 (세대수를 아는 아파트 기준, 직전 월 대비)"
+        )
+    
+    with col4:
+        st.metric(
+            label="평당 가격 상승률",
+            value=percent(kpis.get("pyeong_change")),
+            delta=delta(kpi.delta(kpis, "pyeong_change")),
+            help=f"최근 {period}개월 기준 (직전 {period}개월 대비)"
+        )
+    
+    # 매물 회전율 추이 (월마다 직전 12개월 거래 건수 / 세대수, 누적 거래 건수에서 시계열당 뺄셈 한 번)
+    if cube.has_volume:
+        window = analytics.TURNOVER_WINDOW
+        trend = analytics.turnover_trend(cube, context.apartment_table, window, selected_apartments, selected_sizes)
+        profiler.lap("회전율 계산", rows=len(trend))
+        
+        if trend["회전율(%)"].notna().any():
+            st.subheader("매물 회전율 추이")
+            
+            fig = charts.line_figure(
+                trend.assign(구분=f"{window}개월 회전율"),
+                y="회전율(%)",
+                color="구분",
+                hovertemplate='%{y:.1f}%',
+                title=f"직전 {window}개월 거래 건수 / 세대수",
+                xaxis_title="날짜",
+                yaxis_title="회전율 (%)",
+                showlegend=False,
+                height=400
+            )
+            
+            profiler.lap("회전율 차트 생성", rows=len(trend))
+            
+            plotly_chart(fig, profiler, "회전율 차트")
+            
+            rates = analytics.turnover(cube, context.apartment_table, window, apartments=selected_apartments, sizes=selected_sizes)
+            with st.expander(f"아파트별 최근 {window}개월 회전율"):
+                st.dataframe(
+                    rates,
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "세대수": st.column_config.NumberColumn(format="%d"),
+                        "회전율(%)": st.column_config.NumberColumn(format="%.1f%%", help=f"최근 {window}개월 거래 건수 / 세대수"),
+                    }
+                )
+            st.caption(f"세대수를 아는 아파트 기준, 데이터 시작 후 첫 {window}개월은 있는 달만 합산")
+    
+    # 전세가율 추이 (매매 월별 평균가와 가장 최근 전세 거래월의 as-of 조인)
+    ratios = aggregates.select(context.jeonse_ratios, selected_apartments, selected_sizes)
+    if not ratios.empty:
+        st.subheader("전세가율 추이")
+        
+        trend = rentals.ratio_trend(ratios, ["평형대"])
+        fig = charts.line_figure(
+            trend,
+            y=rentals.RATIO_COLUMN,
+            color="평형대",
+            hovertemplate='%{y:.1f}%',
+            title="평형대별 평균 전세가율 추이",
+            xaxis_title="날짜",
+            yaxis_title="전세가율 (%)",
+            hovermode="x unified",
+            height=400
+        )
+        
+        profiler.lap("전세가율 차트 생성", rows=len(ratios))
+        
+        plotly_chart(fig, profiler, "전세가율 차트")
+        st.caption(f"전세 거래가 없는 달은 {rentals.TOLERANCE_MONTHS}개월 이내의 가장 최근 전세 거래월 기준")
+
+
+# 동조화 구간 (지표를 바꾸면 히트맵만 다시 실행, positions: 표시할 추적 시계열 위치)
+@fragment("동조화 구간")
+def _comovement_section(context, positions):
+    sums = context.comovement
+    profiler = context.profiler
+    
+    measure = st.radio("지표", ["상관계수", "베타"], horizontal=True, key="comovement_measure")
+    corr, beta = comovement.matrices(sums, positions)
+    order = comovement.cluster_order(corr)
+    labels = [f"{apt} {size}" for apt, size in sums.series[positions[order]]]
+    
+    if measure == "상관계수":
+        fig = charts.heatmap_figure(
+            corr[np.ix_(order, order)],
+            labels,
+            zmin=-1,
+            zmax=1,
+            hovertemplate='%{y} ~ %{x}<br>상관계수 %{z:.2f}<extra></extra>',
+            title="월간 수익률 상관계수",
+            height=max(400, 20 * len(labels) + 200)
+        )
+    else:
+        fig = charts.heatmap_figure(
+            beta[np.ix_(order, order)],
+            labels,
+            zmin=-2,
+            zmax=2,
+            hovertemplate='%{y}의 %{x} 대비 베타 %{z:.2f}<extra></extra>',
+            title="월간 수익률 베타 (행 시계열 / 열 시계열)",
+            height=max(400, 20 * len(labels) + 200)
+        )
+    
+    profiler.lap("동조화 행렬 계산", rows=len(positions))
+    
+    plotly_chart(fig, profiler, "동조화 차트")
+    st.caption(
+        f"두 시계열 모두 거래가 있는 달이 {comovement.MIN_OVERLAP}개월 이상인 쌍만 표시, "
+        f"수익률 월 수가 많은 {comovement.HEATMAP_SERIES}개 시계열까지"
+    )
@@ -0,0 +1,160 @@
+import streamlit as st
+import plotly.express as px
+
+from realestate import aggregates, anomaly, kpi, storage
+from views.common import delta, percent, plotly_chart
+
+
+# 개요 페이지
+def render(context):
+    tables = context.tables
+    selected_apartments = context.selected_apartments
+    selected_sizes = context.selected_sizes
+    profiler = context.profiler
+    kpis = context.kpis
+    period = kpis["period_months"]
+    
+    st.title("부산 해운대구 우동 아파트 실거래가 분석")
+    
+    st.markdown("""
+    <div style="background-color:#f8f9fa; padding:20px; border-radius:10px;">
+    <h3>해운대구 우동 아파트 시장 개요</h3>
+    <p>부산 해운대구 우동 지역의 주요 프리미엄 아파트 실거래가 정보와 시장 분석 데이터를 제공합니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # 주요 지표 (데이터 버전별로 미리 계산, 변화량은 직전 기간 대비)
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="조사 대상 아파트",
+            value=f"{len(kpis['apartments'])}개",
+            help=", ".join(kpis["apartments"])
+        )
+    
+    with col2:
+        st.metric(
+            label="평균 상승률",
+            value=percent(kpis.get("avg_change")),
+            delta=delta(kpi.delta(kpis, "avg_change")),
+            help=f"최근 {period}개월 기준 평균 가격 상승률 (직전 {period}개월 대비)"
+        )
+    
+    with col3:
+        max_price = kpis.get("max_price")
+        st.metric(
+            label="최고가 거래",
+            value="-" if max_price is None else f"{max_price:,.1f}억",
+            delta=delta(kpi.delta(kpis, "max_price"), "억"),
+            help=None if max_price is None else f"{kpis['max_price_apartment']} {kpis['max_price_size']} 최고가 (최근 {period}개월)"
+        )
+    
+    with col4:
+        st.metric(
+            label="총 세대수",
+            value=f"{kpis.get('households', 0):,}" + ("" if kpis.get("households_complete", True) else "+"),
+            help="조사 대상 아파트 합계" + ("" if kpis.get("households_complete", True) else " (일부 정보 제한적)")
+        )
+    
+    # 최근 시장 동향
+    st.subheader("최근 시장 동향")
+    
+    avg_change = kpis.get("avg_change")
+    top_change = kpis.get("top_change")
+    if avg_change is not None:
+        st.info(
+            f"해운대구 우동 지역 아파트 실거래가는 지난 {period}개월간 평균 {abs(avg_change):.1f}% "
+            f"{'상승' if avg_change >= 0 else '하락'}했으며, "
+            f"{top_change['아파트']}의 {top_change['평형대']} 평형이 가장 높은 상승률({top_change['변동률(%)']:.1f}%)을 보였습니다."
+        )
+    else:
+        st.info(f"최근 {period}개월간 비교 가능한 거래 데이터가 없습니다.")
+    
+    # 아파트별 평균 가격 차트
+    st.subheader("아파트별 평균 가격")
+    
+    # 평균 가격 (미리 계산된 아파트×평형대 요약 테이블)
+    avg_prices = aggregates.select(tables["summary"], selected_apartments, selected_sizes)
+    
+    # Plotly로 차트 생성
+    fig = px.bar(
+        avg_prices,
+        x="아파트",
+        y="평균가(억)",
+        color="평형대",
+        barmode="group",
+        title="아파트별 평균 가격 (평형대별)",
+        labels={"평균가(억)": "평균 가격 (억원)", "아파트": "아파트명"},
+        color_discrete_sequence=px.colors.qualitative.Set1
+    )
+    
+    fig.update_layout(
+        legend_title="평형대",
+        xaxis_title="아파트명",
+        yaxis_title="평균 가격 (억원)",
+        height=500
+    )
+    
+    profiler.lap("평균 가격 차트 생성", rows=len(avg_prices))
+    
+    plotly_chart(fig, profiler, "평균 가격 차트")
+    
+    # 이상 거래 검토 (가져오기 중 그룹 통계에서 크게 벗어나 집계에서 제외된 거래)
+    quarantine = aggregates.select(context.quarantine, selected_apartments, selected_sizes)
+    if not quarantine.empty:
+        with st.expander(f"이상 거래 검토 대기 {len(quarantine):,}건"):
+            st.caption(
+                f"같은 아파트·평형대의 ㎡당 가격 분포에서 {anomaly.Z_THRESHOLD:.0f} 표준편차 이상 벗어난 거래로, "
+                "차트와 지표 집계에서 제외되었습니다."
+            )
+            st.dataframe(
+                quarantine.drop(columns=[storage.DATE_COLUMN]),
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "계약일": st.column_config.DateColumn(format="YYYY-MM-DD"),
+                    "전용면적(㎡)": st.column_config.NumberColumn(format="%.1f"),
+                    "거래금액(억)": st.column_config.NumberColumn(format="%.2f"),
+                    anomaly.EXPECTED_COLUMN: st.column_config.NumberColumn(format="%.2f", help="그룹의 ㎡당 가격 기준값 × 전용면적"),
+                    anomaly.SCORE_COLUMN: st.column_config.NumberColumn(format="%+.1f", help="(로그 ㎡당 가격 - 기준값) / 표준편차"),
+                }
+            )
+        profiler.lap("이상 거래 표시", rows=len(quarantine))
+    
+    # 관련 뉴스
+    st.subheader("관련 뉴스")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        **부산 해운대구 아파트 가격 상승세 지속**  
+        *2025년 3월 30일*  
+        부산 해운대구 아파트 가격이 지난달 대비 0.8% 상승하며 상승세를 이어가고 있습니다.
+        """)
+        
+        st.markdown("""
+        **해운대 초고층 아파트, 희소성 높아 프리미엄 유지**  
+        *2025년 3월 15일*  
+        해운대 마린시티 일대 초고층 아파트는 희소성으로 인해 가격 하락 압력에도 프리미엄을 유지하고 있습니다.
+        """)
+    
+    with col2:
+        st.markdown("""
+        **부산 부동산 시장, 대형 평형 중심으로 회복세**  
+        *2025년 2월 28일*  
+        부산 지역 부동산 시장이 대형 평형을 중심으로 회복세를 보이고 있으며, 특히 해운대구와 수영구에서 거래가 활발합니다.
+        """)
+        
+        # 전세가율 요약 (주요 지표의 최근 기간 평균과 직전 기간 대비 변화)
+        ratio = kpis.get("jeonse_ratio")
+        if ratio is not None:
+            change = kpi.delta(kpis, "jeonse_ratio")
+            trend = "보합세" if change is None or abs(change) < 0.5 else "상승세" if change > 0 else "하락세"
+            since = "" if change is None else f" (직전 {period}개월 대비 {change:+.1f}%p)"
+            st.markdown(f"""
+            **해운대구 우동 아파트, 전세가율 {trend}**  
+            *{storage.month_key_to_label(kpis["end"])} 기준*  
+            해운대구 우동 지역 아파트의 전세가율이 평균 {ratio:.1f}%{since}입니다.
+            """)
@@ -0,0 +1,115 @@
+import streamlit as st
+import plotly.express as px
+
+from realestate import analytics, charts
+from views.common import fragment, plotly_chart
+
+
+# 평수별 비교 페이지
+def render(context):
+    st.title("평수별 가격 비교 분석")
+    
+    _apartment_section(context)
+
+
+# 아파트 구간 (아파트를 바꾸면 이 구간만 다시 실행)
+@fragment("아파트 구간")
+def _apartment_section(context):
+    cube = context.cube
+    tables = context.tables
+    filtered_data = context.filtered_data
+    selected_sizes = context.selected_sizes
+    profiler = context.profiler
+    
+    # 아파트 선택
+    apt_for_comparison = st.selectbox(
+        "아파트 선택",
+        options=filtered_data["아파트"].unique().tolist()
+    )
+    
+    # 선택된 아파트의 평형대별 최신 시세 (미리 계산된 최신 시세 테이블)
+    latest_apt_data = analytics.latest_prices(tables, apt_for_comparison, selected_sizes)
+    
+    # 평수별 가격 비교 차트
+    st.subheader(f"{apt_for_comparison} 평수별 가격 비교")
+    
+    # Plotly로 차트 생성 (평형대 수와 관계없이 막대 trace 하나)
+    fig = charts.range_figure(
+        latest_apt_data["평형대"],
+        latest_apt_data["최저가(억)"],
+        latest_apt_data["최고가(억)"],
+        title=f"{apt_for_comparison} 평수별 가격 범위 (최신 데이터 기준)",
+        xaxis_title="평형대",
+        yaxis_title="가격 (억원)",
+        height=500
+    )
+    
+    profiler.lap("가격 범위 차트 생성", rows=len(latest_apt_data))
+    
+    plotly_chart(fig, profiler, "가격 범위 차트")
+    
+    # 평수별 가격 추이
+    st.subheader("평수별 가격 추이")
+    
+    # 선택된 아파트의 평형대별 시계열 (긴 형식)
+    apt_data = cube.select([apt_for_comparison], selected_sizes)
+    
+    # Plotly로 차트 생성 (긴 형식 데이터에서 한 번에, 긴 시계열은 줄여서 전송)
+    fig = charts.line_figure(
+        apt_data,
+        y="평균가(억)",
+        color="평형대",
+        hovertemplate='%{y:.1f}억원',
+        title=f"{apt_for_comparison} 평수별 평균 가격 추이",
+        xaxis_title="날짜",
+        yaxis_title="평균 가격 (억원)",
+        hovermode="x unified",
+        height=500
+    )
+    
+    profiler.lap("추이 차트 생성", rows=len(apt_data))
+    
+    plotly_chart(fig, profiler, "추이 차트")
+    
+    # 평당 가격 분석
+    st.subheader("평당 가격 분석")
+    
+    # 평형대별 평당 가격 (단지 면적 범위 기준 대표 평수, 데이터 버전별로 미리 계산됨)
+    price_per_pyeong_df = analytics.price_per_pyeong(context.unit_prices, apt_for_comparison, selected_sizes)
+    
+    if not price_per_pyeong_df.empty:
+        # Plotly로 차트 생성
+        fig = px.bar(
+            price_per_pyeong_df,
+            x="평형대",
+            y="평당 가격(만원)",
+            title=f"{apt_for_comparison} 평당 가격 (최신 데이터 기준)",
+            labels={"평당 가격(만원)": "평당 가격 (만원)", "평형대": "평형대"},
+            color="평형대",
+            hover_data={"대표 평수": ":.1f", "㎡당 가격(만원)": ":,.0f"},
+            color_discrete_sequence=px.colors.qualitative.Set2
+        )
+        
+        fig.update_layout(
+            xaxis_title="평형대",
+            yaxis_title="평당 가격 (만원)",
+            height=500
+        )
+        
+        profiler.lap("평당 가격 차트 생성", rows=len(price_per_pyeong_df))
+        
+        plotly_chart(fig, profiler, "평당 가격 차트")
+        
+        # 인사이트
+        max_price_per_pyeong = price_per_pyeong_df.loc[price_per_pyeong_df["평당 가격(만원)"].idxmax()]
+        min_price_per_pyeong = price_per_pyeong_df.loc[price_per_pyeong_df["평당 가격(만원)"].idxmin()]
+        
+        st.info(f"{apt_for_comparison}의 경우 {max_price_per_pyeong['평형대']}가 평당 {max_price_per_pyeong['평당 가격(만원)']:.0f}만원(㎡당 {max_price_per_pyeong['㎡당 가격(만원)']:.0f}만원)으로 가장 높고, {min_price_per_pyeong['평형대']}가 평당 {min_price_per_pyeong['평당 가격(만원)']:.0f}만원(㎡당 {min_price_per_pyeong['㎡당 가격(만원)']:.0f}만원)으로 가장 낮습니다.")
+        
+        if len(price_per_pyeong_df) > 1:
+            if price_per_pyeong_df["평당 가격(만원)"].is_monotonic_increasing:
+                st.success("평형이 클수록 평당 가격이 상승하는 추세를 보입니다.")
+            elif price_per_pyeong_df["평당 가격(만원)"].is_monotonic_decreasing:
+                st.success("평형이 클수록 평당 가격이 하락하는 추세를 보입니다.")
+            else:
+                st.success("평형별 평당 가격은 일정한 패턴을 보이지 않습니다.")
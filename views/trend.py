@@ -0,0 +1,228 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from realestate import analytics, charts, forecast, rolling, sketch
+from realestate.changes import price_changes
+from views.common import fragment, per_series, period_label, plotly_chart
+
+
+# 가격 추이 페이지
+def render(context):
+    st.title("아파트별 실거래가 추이")
+    
+    _size_section(context)
+
+
+# 평형대 구간 (평형대를 바꾸면 이 구간만 다시 실행)
+@fragment("평형대 구간")
+def _size_section(context):
+    cube = context.cube
+    data = context.data
+    filtered_data = context.filtered_data
+    selected_apartments = context.selected_apartments
+    selected_sizes = context.selected_sizes
+    sketches = context.sketches
+    profiler = context.profiler
+    
+    # 평형대 선택
+    size_for_trend = st.selectbox(
+        "평형대 선택",
+        options=data["평형대"].unique().tolist()
+    )
+    
+    # 선택된 평형대의 데이터 필터링
+    size_data = cube.select(selected_apartments, [size_for_trend] if size_for_trend in selected_sizes else [])
+    
+    # 차트에 표시되는 아파트 목록
+    apartments = size_data["아파트"].unique()
+    profiler.lap("평형대 데이터 조회", rows=len(size_data))
+    
+    _trend_chart(context, size_for_trend, size_data, apartments)
+    
+    # 위험 지표 (최신 거래월 기준, 집계 시 미리 계산됨)
+    risk = analytics.risk_metrics(context.tables, apartments, [size_for_trend])
+    if not risk.empty:
+        st.subheader("변동성 및 낙폭")
+        
+        st.dataframe(
+            risk.drop(columns="평형대").assign(날짜=charts.month_labels(risk["날짜"])).rename(columns={"날짜": "최신 거래월"}),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                rolling.VOLATILITY_COLUMN: st.column_config.NumberColumn(format="%.1f%%", help=f"최근 {rolling.VOLATILITY_MONTHS}개월 월간 수익률 표준편차 (연율화)"),
+                rolling.DRAWDOWN_COLUMN: st.column_config.NumberColumn(format="%.1f%%", help="최고 평균가 대비 현재 하락률"),
+                rolling.MAX_DRAWDOWN_COLUMN: st.column_config.NumberColumn(format="%.1f%%", help="전체 기간 중 가장 큰 고점 대비 하락률"),
+            }
+        )
+        profiler.lap("위험 지표 표시", rows=len(risk))
+    
+    # 가격 범위 차트
+    st.subheader("가격 범위 (최저가-최고가)")
+    
+    # 최신 데이터만 조회 (비교 기간을 선택했으면 기간의 마지막 월)
+    latest_date = filtered_data["날짜"].max() if context.period_end is None else context.period_end
+    
+    # 최신 월의 아파트별 (최저가, 최고가)를 큐브에서 한 번에 조회
+    latest_cells = cube.cross_section(apartments, [size_for_trend], latest_date)
+    
+    # Plotly로 차트 생성 (아파트 수와 관계없이 막대 trace 하나)
+    fig = charts.range_figure(
+        latest_cells["아파트"],
+        latest_cells["최저가(억)"],
+        latest_cells["최고가(억)"],
+        title=f"{size_for_trend} 아파트별 가격 범위 (최신 데이터 기준)",
+        xaxis_title="아파트명",
+        yaxis_title="가격 (억원)",
+        height=500
+    )
+    
+    profiler.lap("가격 범위 차트 생성", rows=len(latest_cells))
+    
+    plotly_chart(fig, profiler, "가격 범위 차트")
+    
+    # 거래가 분위수 (개별 거래 스케치가 있는 경우, 이상 거래 영향 없이 가격대 표시)
+    latest_sketches = sketches[sketches["날짜"] == latest_date]
+    quantiles = sketch.sketch_quantiles(latest_sketches[latest_sketches["평형대"] == size_for_trend])
+    quantiles = quantiles[quantiles["아파트"].isin(apartments)]
+    
+    if not quantiles.empty:
+        st.subheader("거래가 분위수 (p10-p50-p90)")
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Bar(
+            x=quantiles["아파트"],
+            y=quantiles["p90"] - quantiles["p10"],
+            base=quantiles["p10"],
+            name="p10 ~ p90",
+            customdata=quantiles[["p10", "p90", "거래 건수"]],
+            hovertemplate='%{customdata[0]:.1f}억 ~ %{customdata[1]:.1f}억 (%{customdata[2]}건)'
+        ))
+        
+        fig.add_trace(go.Scatter(
+            x=quantiles["아파트"],
+            y=quantiles["p50"],
+            mode='markers',
+            name="중앙값 (p50)",
+            marker=dict(symbol="line-ew-open", size=30, line=dict(width=3)),
+            hovertemplate='중앙값 %{y:.1f}억원'
+        ))
+        
+        fig.update_layout(
+            title=f"{size_for_trend} 아파트별 거래가 분위수 (최신 데이터 기준)",
+            xaxis_title="아파트명",
+            yaxis_title="가격 (억원)",
+            height=500
+        )
+        
+        profiler.lap("분위수 차트 생성", rows=len(quantiles))
+        
+        plotly_chart(fig, profiler, "분위수 차트")
+    
+    # 주요 변동 사항
+    st.subheader(f"주요 변동 사항 ({period_label(context)})")
+    
+    # 비교 기간의 처음과 끝 비교하여 변동률 계산 (전체 시계열 일괄 계산, 직접 선택 시 시계열별 구간 안 첫/마지막 거래월)
+    changes_df = price_changes(
+        cube,
+        selected_apartments,
+        [size_for_trend] if size_for_trend in selected_sizes else [],
+        start=context.period_start,
+        end=context.period_end,
+        per_series=per_series(context)
+    )
+    profiler.lap("변동률 계산", rows=len(changes_df))
+    
+    # 변동률 표시
+    for i, row in enumerate(changes_df.to_dict("records")):
+        col1, col2 = st.columns([1, 3])
+        change_pct = row["변동률(%)"]
+        
+        with col1:
+            st.markdown(f"**{row['아파트']}**")
+        
+        with col2:
+            if change_pct > 0:
+                st.markdown(f"<span style='color:green'>▲ {change_pct:.1f}% 상승</span> ({row['첫 평균가(억)']:.1f}억 → {row['최신 평균가(억)']:.1f}억)", unsafe_allow_html=True)
+            elif change_pct < 0:
+                st.markdown(f"<span style='color:red'>▼ {abs(change_pct):.1f}% 하락</span> ({row['첫 평균가(억)']:.1f}억 → {row['최신 평균가(억)']:.1f}억)", unsafe_allow_html=True)
+            else:
+                st.markdown(f"변동 없음 ({row['첫 평균가(억)']:.1f}억)")
+        
+        if i < len(changes_df) - 1:
+            st.markdown("---")
+    profiler.lap("변동 사항 표시")
+    
+    # 인사이트
+    if not changes_df.empty:
+        max_change = changes_df.iloc[0]
+        
+        if max_change["변동률(%)"] > 0:
+            st.info(f"{size_for_trend}에서 {max_change['아파트']}가 {period_label(context)} 동안 가장 높은 상승률({max_change['변동률(%)']:.1f}%)을 보였습니다.")
+        else:
+            st.warning(f"{size_for_trend}에서 모든 아파트가 하락세를 보이고 있습니다.")
+
+
+# 추이 차트 구간 (이동평균/예측 표시를 바꾸면 차트만 다시 실행)
+@fragment("추이 차트 구간")
+def _trend_chart(context, size_for_trend, size_data, apartments):
+    cube = context.cube
+    profiler = context.profiler
+    
+    # 이동평균 겹쳐 보기 (집계 시 미리 계산된 컬럼)
+    ma_months = st.multiselect(
+        "이동평균 표시",
+        options=list(rolling.MA_MONTHS),
+        format_func=lambda months: f"{months}개월"
+    )
+    
+    # 가격 예측 겹쳐 보기 (데이터 버전별로 미리 적합된 감쇠 추세 모델)
+    forecast_months = st.select_slider(
+        "가격 예측 표시",
+        options=[0] + list(forecast.HORIZONS),
+        value=0,
+        format_func=lambda months: "표시 안 함" if months == 0 else f"{months}개월",
+        help=f"감쇠 추세 모델 예측값(점선)과 {forecast.INTERVAL:.0%} 예측 구간(음영)"
+    )
+    
+    # 아파트별 가격 추이 차트
+    st.subheader(f"{size_for_trend} 실거래가 추이")
+    
+    # Plotly로 차트 생성 (긴 형식 데이터에서 한 번에, 긴 시계열은 줄여서 전송)
+    fig = charts.line_figure(
+        size_data,
+        y="평균가(억)",
+        color="아파트",
+        overlays=[(rolling.ma_column(months), f"{months}개월 이동평균") for months in ma_months],
+        hovertemplate='%{y:.1f}억원',
+        title=f"{size_for_trend} 아파트별 평균 가격 추이",
+        xaxis_title="날짜",
+        yaxis_title="평균 가격 (억원)",
+        hovermode="x unified",
+        height=500
+    )
+    
+    # 비교 기간을 선택했으면 그 구간만 보이도록 x축 범위 지정 (데이터는 전체 전송, 확대/축소 가능)
+    if context.period_end is not None:
+        fig.update_xaxes(range=list(charts.month_labels([context.period_start, context.period_end])))
+    
+    if forecast_months:
+        forecasts = context.forecasts
+        predicted = forecasts[(forecasts["평형대"] == size_for_trend) & (forecasts["개월"] <= forecast_months)]
+        charts.add_forecast(
+            fig,
+            predicted,
+            color="아파트",
+            y=forecast.FORECAST_COLUMN,
+            lower=forecast.LOWER_COLUMN,
+            upper=forecast.UPPER_COLUMN
+        )
+    
+    # 월별 거래 건수 막대 (누적 거래 건수에서 월별 차이로 계산, 건수를 아는 데이터만)
+    if cube.has_volume:
+        volume = cube.rolling_volume(1, apartments, [size_for_trend]).sum(axis=(0, 1))
+        charts.add_volume(fig, cube.months, volume)
+    
+    profiler.lap("추이 차트 생성", rows=len(size_data))
+    
+    plotly_chart(fig, profiler, "추이 차트")